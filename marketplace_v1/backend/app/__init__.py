@@ -1,6 +1,7 @@
 from flask import Flask
 from flask_cors import CORS
 
+from .commands import register_commands
 from .config import Config
 from .extensions import db, jwt, migrate
 
@@ -15,6 +16,7 @@ def create_app(config_class: type[Config] = Config) -> Flask:
     migrate.init_app(app, db)
 
     register_blueprints(app)
+    register_commands(app)
 
     @app.get("/health")
     def health_check() -> tuple[dict[str, str], int]:
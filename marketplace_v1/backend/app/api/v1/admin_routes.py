@@ -1,29 +1,30 @@
 from __future__ import annotations
 
-import os
-import uuid
-from datetime import datetime, timedelta, timezone
+import csv
+from datetime import datetime, timezone
 from decimal import Decimal, InvalidOperation
 
-from flask import Blueprint, current_app, request, send_from_directory
+from flask import Blueprint, Response, request, send_from_directory, stream_with_context
 from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
-from sqlalchemy import and_, or_
-from werkzeug.utils import secure_filename
+from sqlalchemy import or_, select
 
 from app.extensions import db
 from app.models import (
     AmbassadorBuyerAssignment,
     FreshProduceInventoryItem,
     InventoryItem,
+    InventoryMovement,
     ProcurementOrder,
     ProcurementOrderReview,
     ProcurementOrderReviewImage,
+    ProcurementReviewImageBlob,
     Product,
     ProductType,
     Region,
     RegionDefault,
     Supplier,
     SupplierProduct,
+    SupplierRatingStats,
     User,
 )
 from app.security.decorators import require_permissions
@@ -33,11 +34,48 @@ from app.services.auth_service import (
     find_role_by_name,
     find_user_by_id,
     list_buyers_for_ambassador,
-    list_users,
+    list_users_page,
     remove_buyer_from_ambassador,
     update_seller_assigned_admin,
     update_seller_status,
 )
+from app.services.export_service import (
+    EXPORT_MEDIA_TYPES,
+    INVENTORY_EXPORT_FIELDS,
+    PROCUREMENT_EXPORT_FIELDS,
+    export_batch_size,
+    iter_inventory_rows,
+    iter_procurement_rows,
+    parse_inventory_after,
+    render_csv,
+    render_ndjson,
+)
+from app.services.inventory_import_service import (
+    IMPORT_FORMATS,
+    SellerScope,
+    import_inventory,
+    iter_import_records,
+)
+from app.services.inventory_ledger_service import LotFilters, movement_totals, stock_as_of
+from app.services.inventory_service import (
+    ConcurrentInventoryUpdateError,
+    InventoryFilters,
+    LotUpdate,
+    apply_lot_updates,
+    backfill_inventory_expiry,
+    list_inventory_page,
+    load_lots,
+)
+from app.services.review_image_service import (
+    derivative_path,
+    is_blob_path,
+    is_legacy_review_path,
+    review_images_root,
+    store_review_image,
+)
+from app.services.search_service import text_search
+from app.services.supplier_rating_service import record_rating_change
+from app.utils.pagination import DEFAULT_TOTAL_CAP, InvalidCursorError, Page, paginate
 
 admin_bp = Blueprint("admin", __name__)
 
@@ -45,19 +83,23 @@ admin_bp = Blueprint("admin", __name__)
 @admin_bp.get("/users")
 @require_permissions("user.read")
 def get_users() -> tuple[dict[str, list[dict[str, object]]], int]:
-    role_filter = request.args.get("role")
+    role_filter = request.args.get("role") or ""
+    roles = [name.strip().lower() for name in role_filter.split(",") if name.strip()]
+    search = (request.args.get("q") or "").strip()
     page = _int_query_arg("page", 1, minimum=1)
     page_size = _int_query_arg("page_size", 20, minimum=1, maximum=100)
+    cursor = (request.args.get("cursor") or "").strip() or None
 
-    users = list_users()
-    if role_filter:
-        normalized_role = role_filter.strip().lower()
-        users = [u for u in users if any(r.name == normalized_role for r in u.roles)]
-
-    total = len(users)
-    start = (page - 1) * page_size
-    end = start + page_size
-    page_users = users[start:end]
+    try:
+        result = list_users_page(
+            roles=roles or None,
+            search=search or None,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+        )
+    except InvalidCursorError:
+        return {"message": "invalid cursor"}, 400
 
     return {
         "items": [
@@ -74,14 +116,9 @@ def get_users() -> tuple[dict[str, list[dict[str, object]]], int]:
                 "seller_status": user.seller_status,
                 "assigned_admin_user_id": user.assigned_admin_user_id,
             }
-            for user in page_users
+            for user in result.items
         ],
-        "pagination": {
-            "page": page,
-            "page_size": page_size,
-            "total": total,
-            "total_pages": (total + page_size - 1) // page_size,
-        },
+        "pagination": result.pagination(page=page, page_size=page_size),
     }, 200
 
 
@@ -133,70 +170,208 @@ def list_inventory() -> tuple[dict[str, list[dict[str, object]]], int]:
 
     page = _int_query_arg("page", 1, minimum=1)
     page_size = _int_query_arg("page_size", 20, minimum=1, maximum=100)
-    seller_id = _optional_int_query_arg("seller_id")
-    product_id = _optional_int_query_arg("product_id")
-    product_type = (request.args.get("product_type") or "").strip()
-    status = request.args.get("status")
-
-    def _filtered_query(model_cls: type[InventoryItem] | type[FreshProduceInventoryItem]):
-        query = db.session.query(model_cls)
-        if "seller" in roles and "admin" not in roles and "super_admin" not in roles:
-            query = query.filter(model_cls.seller_id == current_user_id)
-        if seller_id is not None:
-            query = query.filter(model_cls.seller_id == seller_id)
-        if product_id is not None:
-            query = query.filter(model_cls.product_id == product_id)
-        if product_type:
-            query = query.join(Product, model_cls.product_id == Product.id).filter(Product.product_type == product_type)
-        if status:
-            query = query.outerjoin(User, model_cls.seller_id == User.id).outerjoin(
-                Supplier, model_cls.supplier_id == Supplier.supplier_id
-            )
-            if status in {"active", "inactive"}:
-                query = query.filter(
-                    and_(
-                        model_cls.origin_type == "procurement",
-                        Supplier.is_active.is_(status == "active"),
-                    )
-                )
-            else:
-                query = query.filter(
-                    and_(
-                        model_cls.origin_type == "seller_direct",
-                        User.seller_status == status,
-                    )
-                )
-        return query
-
-    regular_items = _filtered_query(InventoryItem).all()
-    fresh_items = _filtered_query(FreshProduceInventoryItem).all()
-
-    combined_items: list[tuple[str, InventoryItem | FreshProduceInventoryItem]] = [
-        ("regular", item) for item in regular_items
-    ] + [("fresh_produce", item) for item in fresh_items]
-    combined_items.sort(
-        key=lambda row: (
-            row[1].entry_date or datetime.min.replace(tzinfo=timezone.utc),
-            row[1].id,
-        ),
-        reverse=True,
+    cursor = (request.args.get("cursor") or "").strip() or None
+    try:
+        seller_id = _optional_int_query_arg("seller_id")
+        product_id = _optional_int_query_arg("product_id")
+    except ValueError as exc:
+        return {"message": str(exc)}, 400
+    expired_filter = (request.args.get("expired") or "").strip().lower()
+    if "seller" in roles and "admin" not in roles and "super_admin" not in roles:
+        if seller_id is not None and seller_id != current_user_id:
+            empty = Page(items=[], next_cursor=None, total=0)
+            return {"items": [], "pagination": empty.pagination(page=page, page_size=page_size)}, 200
+        seller_id = current_user_id
+    filters = InventoryFilters(
+        seller_id=seller_id,
+        product_id=product_id,
+        product_type=(request.args.get("product_type") or "").strip(),
+        status=request.args.get("status") or "",
+        expired={"true": True, "false": False}.get(expired_filter),
     )
 
-    total = len(combined_items)
-    start = (page - 1) * page_size
-    end = start + page_size
-    page_items = combined_items[start:end]
+    try:
+        result = list_inventory_page(filters, page=page, page_size=page_size, cursor=cursor)
+    except InvalidCursorError:
+        return {"message": "invalid cursor"}, 400
+
     return {
         "items": [
             _build_inventory_item_response(item, inventory_kind=kind)
-            for kind, item in page_items
+            for kind, item in result.items
+        ],
+        "pagination": result.pagination(page=page, page_size=page_size),
+    }, 200
+
+
+@admin_bp.get("/inventory/export")
+@jwt_required()
+def export_inventory() -> Response | tuple[dict[str, object], int]:
+    """Stream matching lots of both inventory tables as NDJSON or CSV. Resume
+    with ``after=<inventory_kind>:<id>`` of the last lot received."""
+    current_user_id = _current_user_id_from_token()
+    if current_user_id is None:
+        return {"message": "invalid token identity"}, 401
+
+    roles = _roles_set()
+    if "super_admin" not in roles and "admin" not in roles and "seller" not in roles:
+        return {"message": "Forbidden"}, 403
+
+    export_format = (request.args.get("format") or "ndjson").strip().lower()
+    if export_format not in EXPORT_MEDIA_TYPES:
+        return {"message": "format must be ndjson or csv"}, 400
+    after_raw = (request.args.get("after") or "").strip()
+    try:
+        after = parse_inventory_after(after_raw) if after_raw else None
+    except ValueError:
+        return {"message": "after must be <inventory_kind>:<id>"}, 400
+
+    try:
+        seller_id = _optional_int_query_arg("seller_id")
+        product_id = _optional_int_query_arg("product_id")
+    except ValueError as exc:
+        return {"message": str(exc)}, 400
+    if "seller" in roles and "admin" not in roles and "super_admin" not in roles:
+        if seller_id is not None and seller_id != current_user_id:
+            return {"message": "Forbidden"}, 403
+        seller_id = current_user_id
+    expired_filter = (request.args.get("expired") or "").strip().lower()
+    filters = InventoryFilters(
+        seller_id=seller_id,
+        product_id=product_id,
+        product_type=(request.args.get("product_type") or "").strip(),
+        status=request.args.get("status") or "",
+        expired={"true": True, "false": False}.get(expired_filter),
+    )
+
+    rows = iter_inventory_rows(filters, after=after, batch_size=export_batch_size())
+    body = render_csv(rows, INVENTORY_EXPORT_FIELDS) if export_format == "csv" else render_ndjson(rows)
+    return Response(
+        stream_with_context(body),
+        mimetype=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f"attachment; filename=inventory.{export_format}"},
+    )
+
+
+@admin_bp.get("/inventory/movements")
+@require_permissions("inventory.read")
+def list_inventory_movements() -> tuple[dict[str, object], int]:
+    if not _is_admin_like():
+        return {"message": "Forbidden"}, 403
+    page_size = _int_query_arg("page_size", 100, minimum=1, maximum=500)
+    cursor = (request.args.get("cursor") or "").strip() or None
+    try:
+        start = _datetime_query_arg("from")
+        end = _datetime_query_arg("to")
+    except ValueError as exc:
+        return {"message": f"{exc} must be an ISO 8601 datetime"}, 400
+
+    stmt = select(InventoryMovement)
+    if start is not None:
+        stmt = stmt.where(InventoryMovement.occurred_at > start)
+    if end is not None:
+        stmt = stmt.where(InventoryMovement.occurred_at <= end)
+    try:
+        filters = _lot_filters()
+    except ValueError as exc:
+        return {"message": str(exc)}, 400
+    if filters.product_id is not None:
+        stmt = stmt.where(InventoryMovement.product_id == filters.product_id)
+    if filters.inventory_kind is not None:
+        stmt = stmt.where(InventoryMovement.inventory_kind == filters.inventory_kind)
+    if filters.inventory_item_id is not None:
+        stmt = stmt.where(InventoryMovement.inventory_item_id == filters.inventory_item_id)
+
+    try:
+        result = paginate(
+            stmt,
+            scope="admin.inventory_movements",
+            sort=[InventoryMovement.occurred_at, InventoryMovement.id],
+            page_size=page_size,
+            cursor=cursor,
+        )
+    except InvalidCursorError:
+        return {"message": "invalid cursor"}, 400
+    return {
+        "items": [
+            {
+                "id": row.id,
+                "inventory_kind": row.inventory_kind,
+                "inventory_item_id": row.inventory_item_id,
+                "product_id": row.product_id,
+                "movement_type": row.movement_type,
+                "quantity_delta": row.quantity_delta,
+                "reserved_delta": row.reserved_delta,
+                "occurred_at": row.occurred_at.isoformat(),
+            }
+            for row in result.items
+        ],
+        "pagination": result.pagination(page_size=page_size),
+    }, 200
+
+
+@admin_bp.get("/inventory/movement-totals")
+@require_permissions("inventory.read")
+def inventory_movement_totals() -> tuple[dict[str, object], int]:
+    if not _is_admin_like():
+        return {"message": "Forbidden"}, 403
+    try:
+        start = _datetime_query_arg("from")
+        end = _datetime_query_arg("to")
+    except ValueError as exc:
+        return {"message": f"{exc} must be an ISO 8601 datetime"}, 400
+    if start is None or end is None:
+        return {"message": "from and to are required"}, 400
+    try:
+        filters = _lot_filters()
+    except ValueError as exc:
+        return {"message": str(exc)}, 400
+
+    rows = movement_totals(start, end, filters)
+    return {
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "items": [
+            {
+                "movement_type": row.movement_type,
+                "movements": row.movements,
+                "quantity_delta": int(row.quantity_delta),
+                "reserved_delta": int(row.reserved_delta),
+            }
+            for row in rows
+        ],
+    }, 200
+
+
+@admin_bp.get("/inventory/stock-as-of")
+@require_permissions("inventory.read")
+def inventory_stock_as_of() -> tuple[dict[str, object], int]:
+    if not _is_admin_like():
+        return {"message": "Forbidden"}, 403
+    try:
+        at = _datetime_query_arg("at")
+    except ValueError as exc:
+        return {"message": f"{exc} must be an ISO 8601 datetime"}, 400
+    if at is None:
+        return {"message": "at is required"}, 400
+    try:
+        filters = _lot_filters()
+    except ValueError as exc:
+        return {"message": str(exc)}, 400
+
+    rows = stock_as_of(at, filters)
+    return {
+        "at": at.isoformat(),
+        "items": [
+            {
+                "inventory_kind": row.inventory_kind,
+                "inventory_item_id": row.inventory_item_id,
+                "product_id": row.product_id,
+                "quantity": int(row.quantity),
+                "reserved_quantity": int(row.reserved_quantity),
+            }
+            for row in rows
         ],
-        "pagination": {
-            "page": page,
-            "page_size": page_size,
-            "total": total,
-            "total_pages": (total + page_size - 1) // page_size,
-        },
     }, 200
 
 
@@ -283,6 +458,62 @@ def create_inventory_item() -> tuple[dict[str, object], int]:
     }, 201
 
 
+@admin_bp.post("/inventory/import")
+@jwt_required()
+def import_inventory_items() -> tuple[dict[str, object], int]:
+    """Create lots in bulk from a CSV or NDJSON upload (``file`` form field or
+    the raw request body). Columns: product_id, seller_id (admins only),
+    quantity, price_per_unit. Valid rows are imported in one transaction and
+    rejected rows are listed in the report; ``dry_run=true`` only validates."""
+    current_user_id = _current_user_id_from_token()
+    if current_user_id is None:
+        return {"message": "invalid token identity"}, 401
+
+    roles = _roles_set()
+    if "admin" not in roles and "super_admin" not in roles and "seller" not in roles:
+        return {"message": "Forbidden"}, 403
+
+    upload = request.files.get("file")
+    filename = (upload.filename or "") if upload is not None else ""
+    import_format = (request.args.get("format") or "").strip().lower()
+    if not import_format:
+        mimetype = upload.mimetype if upload is not None else request.mimetype
+        if filename.lower().endswith(".csv") or mimetype == "text/csv":
+            import_format = "csv"
+        elif filename.lower().endswith((".ndjson", ".jsonl")) or mimetype == "application/x-ndjson":
+            import_format = "ndjson"
+    if import_format not in IMPORT_FORMATS:
+        return {"message": "format must be csv or ndjson"}, 400
+    dry_run = request.args.get("dry_run", "false").strip().lower() == "true"
+
+    if "seller" in roles and "admin" not in roles and "super_admin" not in roles:
+        scope = SellerScope(own_seller_id=current_user_id)
+    elif "super_admin" in roles:
+        scope = SellerScope(any_region=True)
+    else:
+        scope = SellerScope(region_ids=frozenset(_source_region_ids_for_admin(current_user_id)))
+
+    stream = upload.stream if upload is not None else request.stream
+    try:
+        report = import_inventory(
+            iter_import_records(stream, import_format),
+            actor_user_id=current_user_id,
+            scope=scope,
+            dry_run=dry_run,
+        )
+    except UnicodeDecodeError:
+        db.session.rollback()
+        return {"message": "upload must be UTF-8 encoded"}, 400
+    except csv.Error as exc:
+        db.session.rollback()
+        return {"message": f"malformed CSV: {exc}"}, 400
+    if dry_run:
+        db.session.rollback()
+    else:
+        db.session.commit()
+    return {**report.as_dict(), "dry_run": dry_run}, 200
+
+
 @admin_bp.put("/inventory/<int:item_id>")
 @jwt_required()
 def update_inventory_item(item_id: int) -> tuple[dict[str, object], int]:
@@ -329,6 +560,83 @@ def update_inventory_item(item_id: int) -> tuple[dict[str, object], int]:
     }, 200
 
 
+MAX_INVENTORY_BATCH_SIZE = 1000
+
+
+@admin_bp.patch("/inventory:batch")
+@jwt_required()
+def update_inventory_items() -> tuple[dict[str, object], int]:
+    """Set quantity and/or price of many lots at once.
+
+    Body: ``{"items": [{"inventory_kind", "id", "quantity"?, "price_per_unit"?}]}``.
+    All lots are checked with one query and updated with one statement per
+    table; if any lot is missing, not editable, or changes concurrently,
+    nothing is updated.
+    """
+    current_user_id = _current_user_id_from_token()
+    if current_user_id is None:
+        return {"message": "invalid token identity"}, 401
+
+    roles = _roles_set()
+    if "admin" not in roles and "super_admin" not in roles and "seller" not in roles:
+        return {"message": "Forbidden"}, 403
+
+    payload = request.get_json(silent=True) or {}
+    raw_items = payload.get("items")
+    if not isinstance(raw_items, list) or not raw_items:
+        return {"message": "items must be a non-empty list"}, 400
+    if len(raw_items) > MAX_INVENTORY_BATCH_SIZE:
+        return {"message": f"at most {MAX_INVENTORY_BATCH_SIZE} items per request"}, 400
+
+    updates: list[LotUpdate] = []
+    seen: set[tuple[str, int]] = set()
+    for index, raw in enumerate(raw_items):
+        if not isinstance(raw, dict):
+            return {"message": f"items[{index}] must be an object"}, 400
+        inventory_kind = str(raw.get("inventory_kind", "regular")).strip().lower()
+        if inventory_kind not in {"regular", "fresh_produce"}:
+            return {"message": f"items[{index}].inventory_kind must be regular or fresh_produce"}, 400
+        lot_id = raw.get("id")
+        if not isinstance(lot_id, int) or isinstance(lot_id, bool):
+            return {"message": f"items[{index}].id must be integer"}, 400
+        if (inventory_kind, lot_id) in seen:
+            return {"message": f"items[{index}] repeats {inventory_kind} lot {lot_id}"}, 400
+        seen.add((inventory_kind, lot_id))
+        quantity = raw.get("quantity")
+        if quantity is not None and (not isinstance(quantity, int) or isinstance(quantity, bool) or quantity < 0):
+            return {"message": f"items[{index}].quantity must be a non-negative integer"}, 400
+        price_per_unit = None
+        if raw.get("price_per_unit") is not None:
+            price_per_unit = _parse_non_negative_money(raw.get("price_per_unit"))
+            if price_per_unit is None:
+                return {"message": f"items[{index}].price_per_unit must be a non-negative number"}, 400
+        if quantity is None and price_per_unit is None:
+            return {"message": f"items[{index}] must set quantity or price_per_unit"}, 400
+        updates.append(LotUpdate(inventory_kind, lot_id, quantity, price_per_unit))
+
+    lots = load_lots(seen)
+    missing = [{"inventory_kind": kind, "id": lot_id} for kind, lot_id in seen - lots.keys()]
+    if missing:
+        return {"message": "inventory item not found", "items": missing}, 404
+    seller_only = "seller" in roles and "admin" not in roles and "super_admin" not in roles
+    forbidden = [
+        {"inventory_kind": lot.inventory_kind, "id": lot.id}
+        for lot in lots.values()
+        if (seller_only and (lot.seller_id != current_user_id or lot.origin_type != "seller_direct"))
+        or (not seller_only and "super_admin" not in roles and lot.created_by_admin_user_id != current_user_id)
+    ]
+    if forbidden:
+        return {"message": "you can only edit your own inventory entries", "items": forbidden}, 403
+
+    try:
+        apply_lot_updates(updates, lots)
+    except ConcurrentInventoryUpdateError:
+        db.session.rollback()
+        return {"message": "inventory changed concurrently, retry"}, 409
+    db.session.commit()
+    return {"updated": len(updates)}, 200
+
+
 @admin_bp.delete("/inventory/<int:item_id>")
 @jwt_required()
 def delete_inventory_item(item_id: int) -> tuple[dict[str, str], int]:
@@ -741,7 +1049,12 @@ def regroup_local_regions_to_minor() -> tuple[dict[str, object], int]:
 @admin_bp.get("/products")
 @require_permissions("product.read")
 def list_products() -> tuple[dict[str, list[dict[str, object]]], int]:
-    products = db.session.query(Product).order_by(Product.product_name.asc()).all()
+    search = (request.args.get("q") or "").strip()
+    query = db.session.query(Product)
+    if search:
+        match, relevance = text_search("products", search)
+        query = query.filter(match).order_by(relevance.desc())
+    products = query.order_by(Product.product_name.asc()).all()
     return {
         "items": [
             {
@@ -884,11 +1197,16 @@ def update_product(product_id: int) -> tuple[dict[str, object], int]:
     if canonical_type is None:
         return {"message": "invalid product_type; choose one from product_types"}, 400
 
+    validity_changed = product.validity_days != validity_days
     product.product_name = product_name
     product.product_type = canonical_type
     product.product_unit = product_unit
     product.validity_days = validity_days
     db.session.commit()
+    if validity_changed:
+        # After the commit and in batches, so the product update never holds
+        # the locks of all its lots.
+        backfill_inventory_expiry(product_id=product.id)
     db.session.refresh(product)
     return {
         "id": product.id,
@@ -911,27 +1229,30 @@ def delete_product(product_id: int) -> tuple[dict[str, str], int]:
     return {"message": "deleted"}, 200
 
 
+SUPPLIER_REVIEW_PAGE_SIZE = 20
+
+
 @admin_bp.get("/suppliers")
 @require_permissions("supplier.read")
 def list_suppliers() -> tuple[dict[str, list[dict[str, object]]], int]:
-    suppliers = db.session.query(Supplier).order_by(Supplier.supplier_name.asc()).all()
+    search = (request.args.get("q") or "").strip()
+    query = db.session.query(Supplier)
+    if search:
+        match, relevance = text_search("suppliers", search)
+        query = query.filter(match).order_by(relevance.desc())
+    suppliers = query.order_by(Supplier.supplier_name.asc()).all()
     supplier_links = db.session.query(SupplierProduct).order_by(SupplierProduct.id.asc()).all()
     links_by_supplier: dict[int, list[SupplierProduct]] = {}
     for link in supplier_links:
         links_by_supplier.setdefault(link.supplier_id, []).append(link)
 
-    avg_rating_rows = (
-        db.session.query(
-            ProcurementOrderReview.supplier_id,
-            db.func.avg(ProcurementOrderReview.rating),
-            db.func.count(ProcurementOrderReview.review_id),
-        )
-        .group_by(ProcurementOrderReview.supplier_id)
-        .all()
-    )
-    avg_rating_by_supplier = {
-        row[0]: {"overall_rating": round(float(row[1]), 2), "rating_count": int(row[2])}
-        for row in avg_rating_rows
+    stats_by_supplier = {
+        stats.supplier_id: stats
+        for stats in db.session.execute(
+            select(SupplierRatingStats).where(
+                SupplierRatingStats.supplier_id.in_([s.supplier_id for s in suppliers])
+            )
+        ).scalars()
     }
 
     return {
@@ -952,8 +1273,7 @@ def list_suppliers() -> tuple[dict[str, list[dict[str, object]]], int]:
                     }
                     for link in links_by_supplier.get(s.supplier_id, [])
                 ],
-                "overall_rating": avg_rating_by_supplier.get(s.supplier_id, {}).get("overall_rating"),
-                "rating_count": avg_rating_by_supplier.get(s.supplier_id, {}).get("rating_count", 0),
+                **_supplier_rating_summary(stats_by_supplier.get(s.supplier_id)),
             }
             for s in suppliers
         ]
@@ -973,36 +1293,8 @@ def get_supplier_detail(supplier_id: int) -> tuple[dict[str, object], int]:
         .order_by(SupplierProduct.id.asc())
         .all()
     )
-    rating_breakdown_rows = (
-        db.session.query(ProcurementOrderReview.rating, db.func.count(ProcurementOrderReview.review_id))
-        .filter(ProcurementOrderReview.supplier_id == supplier_id)
-        .group_by(ProcurementOrderReview.rating)
-        .order_by(ProcurementOrderReview.rating.desc())
-        .all()
-    )
-    rating_breakdown = [{"rating": int(row[0]), "orders": int(row[1])} for row in rating_breakdown_rows]
-    review_rows = (
-        db.session.query(ProcurementOrderReview)
-        .filter(ProcurementOrderReview.supplier_id == supplier_id)
-        .order_by(ProcurementOrderReview.rating.desc(), ProcurementOrderReview.created_at.desc())
-        .all()
-    )
-    procurement_ids = {row.procurement_id for row in review_rows}
-    if procurement_ids:
-        orders = (
-            db.session.query(ProcurementOrder)
-            .filter(ProcurementOrder.procurement_id.in_(procurement_ids))
-            .all()
-        )
-    else:
-        orders = []
-    orders_by_id = {order.procurement_id: order for order in orders}
-    average = (
-        db.session.query(db.func.avg(ProcurementOrderReview.rating))
-        .filter(ProcurementOrderReview.supplier_id == supplier_id)
-        .scalar()
-    )
-    overall_rating = round(float(average), 2) if average is not None else None
+    stats = db.session.get(SupplierRatingStats, supplier_id)
+    reviews = _supplier_review_page(supplier_id, page_size=SUPPLIER_REVIEW_PAGE_SIZE)
 
     return {
         "supplier_id": supplier.supplier_id,
@@ -1014,20 +1306,42 @@ def get_supplier_detail(supplier_id: int) -> tuple[dict[str, object], int]:
         "phone_number": supplier.phone_number,
         "is_active": supplier.is_active,
         "product_links": [{"product_id": link.product_id, "supplier_type": link.supplier_type} for link in links],
-        "overall_rating": overall_rating,
-        "rating_count": sum(item["orders"] for item in rating_breakdown),
-        "rating_breakdown": rating_breakdown,
-        "reviews": [
-            {
-                "review_id": row.review_id,
-                "procurement_id": row.procurement_id,
-                "procurement_status": orders_by_id[row.procurement_id].status if row.procurement_id in orders_by_id else None,
-                "rating": row.rating,
-                "review_text": row.review_text,
-                "created_at": row.created_at.isoformat() if row.created_at else None,
-            }
-            for row in review_rows
-        ],
+        **_supplier_rating_summary(stats),
+        "rating_breakdown": stats.breakdown() if stats else [],
+        "reviews": _build_supplier_review_responses(reviews.items),
+        "reviews_pagination": reviews.pagination(page_size=SUPPLIER_REVIEW_PAGE_SIZE),
+    }, 200
+
+
+@admin_bp.get("/suppliers/<int:supplier_id>/reviews")
+@require_permissions("supplier.read")
+def list_supplier_reviews(supplier_id: int) -> tuple[dict[str, object], int]:
+    """Reviews of a supplier, best rated then newest first, with
+    ``product_id``, ``min_rating`` and ``max_rating`` filters."""
+    if db.session.get(Supplier, supplier_id) is None:
+        return {"message": "supplier not found"}, 404
+    page_size = _int_query_arg("page_size", SUPPLIER_REVIEW_PAGE_SIZE, minimum=1, maximum=100)
+    try:
+        product_id = _optional_int_query_arg("product_id")
+        min_rating = _optional_int_query_arg("min_rating")
+        max_rating = _optional_int_query_arg("max_rating")
+    except ValueError as exc:
+        return {"message": str(exc)}, 400
+    cursor = (request.args.get("cursor") or "").strip() or None
+    try:
+        result = _supplier_review_page(
+            supplier_id,
+            page_size=page_size,
+            product_id=product_id,
+            min_rating=min_rating,
+            max_rating=max_rating,
+            cursor=cursor,
+        )
+    except InvalidCursorError:
+        return {"message": "invalid cursor"}, 400
+    return {
+        "items": _build_supplier_review_responses(result.items),
+        "pagination": result.pagination(page_size=page_size),
     }, 200
 
 
@@ -1226,46 +1540,96 @@ def delete_supplier(supplier_id: int) -> tuple[dict[str, str], int]:
 def list_procurement_orders() -> tuple[dict[str, object], int]:
     page = _int_query_arg("page", 1, minimum=1)
     page_size = _int_query_arg("page_size", 20, minimum=1, maximum=100)
-    supplier_id = _optional_int_query_arg("supplier_id")
-    product_id = _optional_int_query_arg("product_id")
+    try:
+        supplier_id = _optional_int_query_arg("supplier_id")
+        product_id = _optional_int_query_arg("product_id")
+    except ValueError as exc:
+        return {"message": str(exc)}, 400
     status = request.args.get("status")
+    cursor = (request.args.get("cursor") or "").strip() or None
 
-    query = db.session.query(ProcurementOrder)
+    stmt = select(ProcurementOrder)
     if supplier_id is not None:
-        query = query.filter(ProcurementOrder.supplier_id == supplier_id)
+        stmt = stmt.where(ProcurementOrder.supplier_id == supplier_id)
     if product_id is not None:
-        query = query.filter(ProcurementOrder.product_id == product_id)
+        stmt = stmt.where(ProcurementOrder.product_id == product_id)
     if status:
-        query = query.filter(ProcurementOrder.status == status)
+        stmt = stmt.where(ProcurementOrder.status == status)
 
-    total = query.count()
-    rows = (
-        query.order_by(ProcurementOrder.procurement_id.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
-    )
+    try:
+        result = paginate(
+            stmt,
+            scope="admin.procurement_orders",
+            sort=[ProcurementOrder.procurement_id],
+            page_size=page_size,
+            page=page,
+            cursor=cursor,
+            total_cap=DEFAULT_TOTAL_CAP,
+        )
+    except InvalidCursorError:
+        return {"message": "invalid cursor"}, 400
 
     return {
-        "items": [_build_procurement_order_response(row) for row in rows],
-        "pagination": {
-            "page": page,
-            "page_size": page_size,
-            "total": total,
-            "total_pages": (total + page_size - 1) // page_size,
-        },
+        "items": _build_procurement_order_responses(result.items),
+        "pagination": result.pagination(page=page, page_size=page_size),
     }, 200
 
 
+@admin_bp.get("/procurement-orders/export")
+@require_permissions("procurement.read")
+def export_procurement_orders() -> Response | tuple[dict[str, object], int]:
+    """Stream matching procurement orders as NDJSON or CSV. Resume with
+    ``after=<procurement_id>`` of the last order received."""
+    export_format = (request.args.get("format") or "ndjson").strip().lower()
+    if export_format not in EXPORT_MEDIA_TYPES:
+        return {"message": "format must be ndjson or csv"}, 400
+    after = (request.args.get("after") or "").strip()
+    if after and not after.isdigit():
+        return {"message": "after must be a procurement id"}, 400
+    try:
+        supplier_id = _optional_int_query_arg("supplier_id")
+        product_id = _optional_int_query_arg("product_id")
+    except ValueError as exc:
+        return {"message": str(exc)}, 400
+
+    rows = iter_procurement_rows(
+        supplier_id=supplier_id,
+        product_id=product_id,
+        status=request.args.get("status") or None,
+        after_id=int(after) if after else None,
+        batch_size=export_batch_size(),
+    )
+    body = render_csv(rows, PROCUREMENT_EXPORT_FIELDS) if export_format == "csv" else render_ndjson(rows)
+    return Response(
+        stream_with_context(body),
+        mimetype=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f"attachment; filename=procurement-orders.{export_format}"},
+    )
+
+
 @admin_bp.get("/procurement-orders/options")
 @require_permissions("procurement.read")
 def procurement_order_options() -> tuple[dict[str, object], int]:
     include_draft = request.args.get("include_draft", "false").strip().lower() == "true"
-    query = db.session.query(ProcurementOrder)
+    page_size = _int_query_arg("page_size", 500, minimum=1, maximum=500)
+    cursor = (request.args.get("cursor") or "").strip() or None
+    stmt = select(ProcurementOrder)
     if not include_draft:
-        query = query.filter(ProcurementOrder.status != "draft")
-    rows = query.order_by(ProcurementOrder.procurement_id.desc()).limit(500).all()
-    return {"items": [_build_procurement_order_response(row) for row in rows]}, 200
+        stmt = stmt.where(ProcurementOrder.status != "draft")
+    try:
+        result = paginate(
+            stmt,
+            scope="admin.procurement_order_options",
+            sort=[ProcurementOrder.procurement_id],
+            page_size=page_size,
+            cursor=cursor,
+        )
+    except InvalidCursorError:
+        return {"message": "invalid cursor"}, 400
+    return {
+        "items": _build_procurement_order_responses(result.items),
+        "pagination": result.pagination(page_size=page_size),
+    }, 200
 
 
 @admin_bp.post("/procurement-orders")
@@ -1439,13 +1803,22 @@ def list_procurement_reviews(procurement_id: int) -> tuple[dict[str, object], in
     order = db.session.get(ProcurementOrder, procurement_id)
     if order is None:
         return {"message": "procurement order not found"}, 404
-    rows = (
-        db.session.query(ProcurementOrderReview)
-        .filter(ProcurementOrderReview.procurement_id == procurement_id)
-        .order_by(ProcurementOrderReview.review_id.desc())
-        .all()
-    )
-    return {"items": [_build_procurement_review_response(row, order_status=order.status) for row in rows]}, 200
+    page_size = _int_query_arg("page_size", 100, minimum=1, maximum=100)
+    cursor = (request.args.get("cursor") or "").strip() or None
+    try:
+        result = paginate(
+            select(ProcurementOrderReview).where(ProcurementOrderReview.procurement_id == procurement_id),
+            scope=f"admin.procurement_reviews.{procurement_id}",
+            sort=[ProcurementOrderReview.review_id],
+            page_size=page_size,
+            cursor=cursor,
+        )
+    except InvalidCursorError:
+        return {"message": "invalid cursor"}, 400
+    return {
+        "items": _build_procurement_review_responses(result.items, order_status=order.status),
+        "pagination": result.pagination(page_size=page_size),
+    }, 200
 
 
 @admin_bp.post("/procurement-orders/<int:procurement_id>/reviews")
@@ -1480,12 +1853,16 @@ def create_procurement_review(procurement_id: int) -> tuple[dict[str, object], i
     if rating < 1 or rating > 10:
         return {"message": "rating must be between 1 and 10"}, 400
 
+    # Locked: the old rating is subtracted from the supplier's stats, so two
+    # concurrent edits must not both read the same one.
     existing = (
         db.session.query(ProcurementOrderReview)
         .filter(ProcurementOrderReview.procurement_id == procurement_id)
+        .with_for_update()
         .one_or_none()
     )
     is_update = existing is not None
+    previous_rating = existing.rating if existing is not None else None
     if existing is None:
         row = ProcurementOrderReview(
             procurement_id=procurement_id,
@@ -1507,16 +1884,19 @@ def create_procurement_review(procurement_id: int) -> tuple[dict[str, object], i
                 row.review_text = f"{row.review_text}\n\n[{timestamp}] {review_text}"
             else:
                 row.review_text = f"[{timestamp}] {review_text}"
+    record_rating_change(row.supplier_id, old_rating=previous_rating, new_rating=rating)
 
     image_rows: list[ProcurementOrderReviewImage] = []
     for file in files:
         if not file or not file.filename:
             continue
-        stored_relative_path, error = _save_procurement_review_image(file, row.review_id)
+        stored, error = store_review_image(file)
         if error:
             db.session.rollback()
             return {"message": error}, 400
-        image_row = ProcurementOrderReviewImage(review_id=row.review_id, file_path=stored_relative_path)
+        image_row = ProcurementOrderReviewImage(
+            review_id=row.review_id, file_path=stored.file_path, content_sha256=stored.sha256
+        )
         db.session.add(image_row)
         image_rows.append(image_row)
 
@@ -1528,11 +1908,19 @@ def create_procurement_review(procurement_id: int) -> tuple[dict[str, object], i
     return response, status_code
 
 
+REVIEW_IMAGE_BLOB_MAX_AGE = 365 * 24 * 60 * 60
+
+
 @admin_bp.get("/procurement-review-images/<path:filename>")
 @require_permissions("supplier.rating.read")
 def get_procurement_review_image(filename: str):
-    images_root = os.path.join(current_app.instance_path, "uploads", "procurement_reviews")
-    return send_from_directory(images_root, filename)
+    if is_blob_path(filename):
+        # Content-addressed: the bytes behind a blob path never change.
+        return send_from_directory(review_images_root(), filename, max_age=REVIEW_IMAGE_BLOB_MAX_AGE)
+    if is_legacy_review_path(filename):
+        return send_from_directory(review_images_root(), filename)
+    # Anything else under the root (in-flight temp files) is not an image.
+    return {"message": "image not found"}, 404
 
 
 @admin_bp.post("/super-admin/users/<int:user_id>/admin")
@@ -1765,6 +2153,9 @@ def remove_buyer_group(ambassador_user_id: int, buyer_user_id: int) -> tuple[dic
     return {"message": "removed"}, 200
 
 
+BUYER_GROUP_OPTIONS_PAGE_SIZE = 20
+
+
 @admin_bp.get("/buyer-groups/options")
 @require_permissions("buyer.group.read")
 def buyer_group_options() -> tuple[dict[str, object], int]:
@@ -1773,12 +2164,28 @@ def buyer_group_options() -> tuple[dict[str, object], int]:
         return {"message": "invalid token identity"}, 401
 
     if _is_admin_like():
-        users = list_users()
+        # Not region scoped, so never the whole user base: one page of each
+        # role, narrowed with ``ambassador_q`` / ``buyer_q`` (prefix search)
+        # and continued with ``ambassador_cursor`` / ``buyer_cursor``.
+        page_size = _int_query_arg("page_size", BUYER_GROUP_OPTIONS_PAGE_SIZE, minimum=1, maximum=100)
+        pages = {}
+        try:
+            for role in ("ambassador", "buyer"):
+                pages[role] = list_users_page(
+                    roles=[role],
+                    search=(request.args.get(f"{role}_q") or "").strip() or None,
+                    page_size=page_size,
+                    cursor=(request.args.get(f"{role}_cursor") or "").strip() or None,
+                )
+        except InvalidCursorError:
+            return {"message": "invalid cursor"}, 400
         return {
             "owned_regions": [],
             "selected_region_id": None,
-            "ambassadors": [_build_user_row(u) for u in users if any(r.name == "ambassador" for r in u.roles)],
-            "buyers": [_build_user_row(u) for u in users if any(r.name == "buyer" for r in u.roles)],
+            "ambassadors": [_build_user_row(u) for u in pages["ambassador"].items],
+            "buyers": [_build_user_row(u) for u in pages["buyer"].items],
+            "ambassadors_pagination": pages["ambassador"].pagination(page_size=page_size),
+            "buyers_pagination": pages["buyer"].pagination(page_size=page_size),
         }, 200
 
     if "ambassador" not in _roles_set():
@@ -1789,7 +2196,10 @@ def buyer_group_options() -> tuple[dict[str, object], int]:
         return {"owned_regions": [], "selected_region_id": None, "ambassadors": [], "buyers": []}, 200
 
     owned_region_ids = {region.region_id for region in owned_regions}
-    requested_region_id = _optional_int_query_arg("region_id")
+    try:
+        requested_region_id = _optional_int_query_arg("region_id")
+    except ValueError as exc:
+        return {"message": str(exc)}, 400
     selected_region_id = requested_region_id or owned_regions[0].region_id
     if selected_region_id not in owned_region_ids:
         return {"message": "region_id is outside ambassador managed regions"}, 403
@@ -1923,56 +2333,162 @@ def _can_ambassador_manage_buyer(ambassador_user_id: int, buyer: User) -> bool:
     return assignment is not None
 
 
+def _rows_by_key(column, keys: set[int]) -> dict[int, object]:
+    """Load the rows whose ``column`` is in ``keys`` with one IN query."""
+    keys.discard(None)
+    if not keys:
+        return {}
+    model_cls = column.class_
+    rows = db.session.execute(select(model_cls).where(column.in_(keys))).scalars()
+    return {getattr(row, column.key): row for row in rows}
+
+
+def _build_procurement_order_responses(orders: list[ProcurementOrder]) -> list[dict[str, object]]:
+    suppliers = _rows_by_key(Supplier.supplier_id, {order.supplier_id for order in orders})
+    products = _rows_by_key(Product.id, {order.product_id for order in orders})
+    responses = []
+    for order in orders:
+        supplier = suppliers.get(order.supplier_id)
+        product = products.get(order.product_id)
+        responses.append(
+            {
+                "procurement_id": order.procurement_id,
+                "supplier_id": order.supplier_id,
+                "supplier_name": supplier.supplier_name if supplier else None,
+                "product_id": order.product_id,
+                "product_name": product.product_name if product else None,
+                "quantity": order.quantity,
+                "price_per_unit": str(order.price_per_unit),
+                "total_value": str(order.price_per_unit * order.quantity),
+                "procurement_date": order.procurement_date.isoformat() if order.procurement_date else None,
+                "status": order.status,
+                "pushed_to_inventory": order.pushed_to_inventory,
+                "created_by_admin_user_id": order.created_by_admin_user_id,
+            }
+        )
+    return responses
+
+
 def _build_procurement_order_response(order: ProcurementOrder) -> dict[str, object]:
-    supplier = db.session.get(Supplier, order.supplier_id)
-    product = db.session.get(Product, order.product_id)
-    return {
-        "procurement_id": order.procurement_id,
-        "supplier_id": order.supplier_id,
-        "supplier_name": supplier.supplier_name if supplier else None,
-        "product_id": order.product_id,
-        "product_name": product.product_name if product else None,
-        "quantity": order.quantity,
-        "price_per_unit": str(order.price_per_unit),
-        "total_value": str(order.price_per_unit * order.quantity),
-        "procurement_date": order.procurement_date.isoformat() if order.procurement_date else None,
-        "status": order.status,
-        "pushed_to_inventory": order.pushed_to_inventory,
-        "created_by_admin_user_id": order.created_by_admin_user_id,
-    }
+    return _build_procurement_order_responses([order])[0]
+
+
+def _build_procurement_review_responses(
+    rows: list[ProcurementOrderReview], *, order_status: str | None = None
+) -> list[dict[str, object]]:
+    """Serialize reviews with one query per related table, however many rows.
+
+    ``order_status`` skips the procurement order lookup when every review
+    belongs to the same, already loaded order.
+    """
+    suppliers = _rows_by_key(Supplier.supplier_id, {row.supplier_id for row in rows})
+    products = _rows_by_key(Product.id, {row.product_id for row in rows})
+    reviewers = _rows_by_key(User.id, {row.reviewed_by_user_id for row in rows})
+    order_statuses: dict[int, str] = {}
+    if order_status is None:
+        order_statuses = {
+            procurement_id: status
+            for procurement_id, status in db.session.execute(
+                select(ProcurementOrder.procurement_id, ProcurementOrder.status).where(
+                    ProcurementOrder.procurement_id.in_({row.procurement_id for row in rows})
+                )
+            )
+        }
+    images_by_review: dict[int, list[ProcurementOrderReviewImage]] = {row.review_id: [] for row in rows}
+    if rows:
+        image_rows = db.session.execute(
+            select(ProcurementOrderReviewImage)
+            .where(ProcurementOrderReviewImage.review_id.in_(images_by_review.keys()))
+            .order_by(ProcurementOrderReviewImage.image_id.asc())
+        ).scalars()
+        for image in image_rows:
+            images_by_review[image.review_id].append(image)
+    blobs = _rows_by_key(
+        ProcurementReviewImageBlob.sha256,
+        {image.content_sha256 for images in images_by_review.values() for image in images},
+    )
+
+    responses = []
+    for row in rows:
+        supplier = suppliers.get(row.supplier_id)
+        product = products.get(row.product_id)
+        rated_by = reviewers.get(row.reviewed_by_user_id)
+        image_rows = images_by_review[row.review_id]
+        procurement_status = order_status if order_status is not None else order_statuses.get(row.procurement_id)
+        responses.append(
+            {
+                "review_id": row.review_id,
+                "procurement_id": row.procurement_id,
+                "procurement_status": procurement_status,
+                "supplier_id": row.supplier_id,
+                "supplier_name": supplier.supplier_name if supplier else None,
+                "product_id": row.product_id,
+                "product_name": product.product_name if product else None,
+                "rating": row.rating,
+                "review_text": row.review_text,
+                "reviewed_by_user_id": row.reviewed_by_user_id,
+                "rated_by_email": rated_by.email if rated_by else None,
+                "image_urls": [_build_review_image_url(img.file_path) for img in image_rows],
+                "thumbnail_urls": [_build_review_image_variant_url(img, blobs, "thumb") for img in image_rows],
+                "display_urls": [_build_review_image_variant_url(img, blobs, "display") for img in image_rows],
+                "image_paths": [img.file_path for img in image_rows],
+                "created_at": row.created_at.isoformat() if row.created_at else None,
+            }
+        )
+    return responses
 
 
 def _build_procurement_review_response(
     row: ProcurementOrderReview, *, order_status: str | None = None
 ) -> dict[str, object]:
-    supplier = db.session.get(Supplier, row.supplier_id)
-    product = db.session.get(Product, row.product_id)
-    rated_by = db.session.get(User, row.reviewed_by_user_id)
-    if order_status is None:
-        order = db.session.get(ProcurementOrder, row.procurement_id)
-        order_status = order.status if order else None
-    image_rows = (
-        db.session.query(ProcurementOrderReviewImage)
-        .filter(ProcurementOrderReviewImage.review_id == row.review_id)
-        .order_by(ProcurementOrderReviewImage.image_id.asc())
-        .all()
+    return _build_procurement_review_responses([row], order_status=order_status)[0]
+
+
+def _supplier_review_page(
+    supplier_id: int,
+    *,
+    page_size: int,
+    product_id: int | None = None,
+    min_rating: int | None = None,
+    max_rating: int | None = None,
+    cursor: str | None = None,
+) -> Page[ProcurementOrderReview]:
+    stmt = select(ProcurementOrderReview).where(ProcurementOrderReview.supplier_id == supplier_id)
+    if product_id is not None:
+        stmt = stmt.where(ProcurementOrderReview.product_id == product_id)
+    if min_rating is not None:
+        stmt = stmt.where(ProcurementOrderReview.rating >= min_rating)
+    if max_rating is not None:
+        stmt = stmt.where(ProcurementOrderReview.rating <= max_rating)
+    return paginate(
+        stmt,
+        scope=f"admin.supplier_reviews.{supplier_id}",
+        sort=[ProcurementOrderReview.rating, ProcurementOrderReview.created_at, ProcurementOrderReview.review_id],
+        page_size=page_size,
+        cursor=cursor,
     )
-    return {
-        "review_id": row.review_id,
-        "procurement_id": row.procurement_id,
-        "procurement_status": order_status,
-        "supplier_id": row.supplier_id,
-        "supplier_name": supplier.supplier_name if supplier else None,
-        "product_id": row.product_id,
-        "product_name": product.product_name if product else None,
-        "rating": row.rating,
-        "review_text": row.review_text,
-        "reviewed_by_user_id": row.reviewed_by_user_id,
-        "rated_by_email": rated_by.email if rated_by else None,
-        "image_urls": [_build_review_image_url(img.file_path) for img in image_rows],
-        "image_paths": [img.file_path for img in image_rows],
-        "created_at": row.created_at.isoformat() if row.created_at else None,
-    }
+
+
+def _build_supplier_review_responses(rows: list[ProcurementOrderReview]) -> list[dict[str, object]]:
+    statuses = _rows_by_key(ProcurementOrder.procurement_id, {row.procurement_id for row in rows})
+    return [
+        {
+            "review_id": row.review_id,
+            "procurement_id": row.procurement_id,
+            "procurement_status": statuses[row.procurement_id].status if row.procurement_id in statuses else None,
+            "product_id": row.product_id,
+            "rating": row.rating,
+            "review_text": row.review_text,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+        }
+        for row in rows
+    ]
+
+
+def _supplier_rating_summary(stats: SupplierRatingStats | None) -> dict[str, object]:
+    if stats is None:
+        return {"overall_rating": None, "rating_count": 0}
+    return {"overall_rating": stats.overall_rating, "rating_count": stats.rating_count}
 
 
 def _build_review_image_url(relative_path: str) -> str:
@@ -1980,6 +2496,17 @@ def _build_review_image_url(relative_path: str) -> str:
     return f"/api/v1/admin/procurement-review-images/{normalized}"
 
 
+def _build_review_image_variant_url(
+    image: ProcurementOrderReviewImage, blobs: dict[str, ProcurementReviewImageBlob], variant: str
+) -> str:
+    """URL of a WebP derivative of ``image``, or of the original until the
+    derivatives are rendered."""
+    blob = blobs.get(image.content_sha256)
+    if blob is None or blob.derivatives_status != "ready":
+        return _build_review_image_url(image.file_path)
+    return _build_review_image_url(derivative_path(blob.file_path, variant))
+
+
 def _optional_trimmed_str(value: object) -> str | None:
     if value is None:
         return None
@@ -2041,25 +2568,6 @@ def _normalize_supplier_product_links(product_links: list[dict[str, object]]) ->
     ]
 
 
-def _save_procurement_review_image(file_storage, review_id: int) -> tuple[str | None, str | None]:
-    filename = secure_filename(file_storage.filename or "")
-    if not filename:
-        return None, "invalid image filename"
-    ext = os.path.splitext(filename)[1].lower()
-    if ext not in {".jpg", ".jpeg", ".png", ".webp", ".gif"}:
-        return None, "only .jpg, .jpeg, .png, .webp, .gif images are allowed"
-
-    images_root = os.path.join(current_app.instance_path, "uploads", "procurement_reviews")
-    review_dir = os.path.join(images_root, str(review_id))
-    os.makedirs(review_dir, exist_ok=True)
-
-    stored_name = f"{uuid.uuid4().hex}{ext}"
-    abs_path = os.path.join(review_dir, stored_name)
-    file_storage.save(abs_path)
-    relative_path = f"{review_id}/{stored_name}"
-    return relative_path, None
-
-
 def _build_user_row(user: User) -> dict[str, object]:
     return {
         "id": user.id,
@@ -2306,21 +2814,19 @@ def _build_inventory_item_response(
         "stored_quantity": stored_quantity,
         "reserved_quantity": reserved_quantity,
         "is_expired": is_expired,
+        "expires_at": item.expires_at.isoformat() if item.expires_at else None,
         "updated_at": item.updated_at.isoformat() if item.updated_at else None,
         "created_by_admin_user_id": item.created_by_admin_user_id,
     }
 
 
 def _is_inventory_item_expired(item: InventoryItem | FreshProduceInventoryItem) -> bool:
-    if item.product is None or item.product.validity_days is None:
-        return False
-    updated_at = item.updated_at
-    if updated_at is None:
+    expires_at = item.expires_at
+    if expires_at is None:
         return False
-    if updated_at.tzinfo is None:
-        updated_at = updated_at.replace(tzinfo=timezone.utc)
-    expiry_at = updated_at + timedelta(days=item.product.validity_days)
-    return datetime.now(timezone.utc) >= expiry_at
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc) >= expires_at
 
 
 def _parse_non_negative_money(value: object) -> Decimal | None:
@@ -2410,11 +2916,35 @@ def _int_query_arg(
     return value
 
 
+def _datetime_query_arg(name: str) -> datetime | None:
+    raw = (request.args.get(name) or "").strip()
+    if not raw:
+        return None
+    try:
+        value = datetime.fromisoformat(raw)
+    except ValueError:
+        raise ValueError(name) from None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _lot_filters() -> LotFilters:
+    inventory_kind = (request.args.get("inventory_kind") or "").strip().lower()
+    return LotFilters(
+        product_id=_optional_int_query_arg("product_id"),
+        inventory_kind=inventory_kind or None,
+        inventory_item_id=_optional_int_query_arg("inventory_item_id"),
+    )
+
+
 def _optional_int_query_arg(name: str) -> int | None:
+    """The integer value of ``name``, ``None`` if absent; a malformed value
+    raises ``ValueError`` rather than silently dropping the filter."""
     raw = request.args.get(name)
     if raw is None or raw == "":
         return None
     try:
         return int(raw)
     except (TypeError, ValueError):
-        return None
+        raise ValueError(f"{name} must be integer") from None
@@ -1,18 +1,54 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from decimal import Decimal, InvalidOperation
 
-from flask import Blueprint, request
+from flask import Blueprint, Response, request, stream_with_context
 from flask_jwt_extended import get_jwt, get_jwt_identity
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
 from app.extensions import db
-from app.models import FreshProduceInventoryItem, InventoryItem, Order, OrderGroup, OrderItem, Product, Supplier, User
+from app.models import FreshProduceInventoryItem, InventoryItem, Order, OrderGroup, OrderItem, Supplier, User
 from app.security.decorators import require_permissions
 from app.services.auth_service import list_buyers_for_ambassador
+from app.services.catalog_service import search_catalog
+from app.services.export_service import (
+    EXPORT_MEDIA_TYPES,
+    ORDER_EXPORT_FIELDS,
+    ORDER_ITEM_EXPORT_FIELDS,
+    export_batch_size,
+    group_order_rows,
+    iter_order_item_rows,
+    render_csv,
+    render_ndjson,
+)
+from app.services.id_service import next_group_number, next_order_number
+from app.services.idempotency_service import (
+    IDEMPOTENCY_HEADER,
+    MAX_KEY_LENGTH,
+    IdempotencyKeyReusedError,
+    find_replay,
+    record_response,
+    request_fingerprint,
+)
+from app.services.load_plans import ORDER_GROUP_RESPONSE
+from app.services.order_search_service import OrderSearchFilters, search_orders
+from app.services.order_service import (
+    InsufficientStockError,
+    load_checkout_sources,
+    release_inventory,
+    reservation_deadline,
+    reserve_inventory,
+    settle_inventory,
+)
+from app.utils.pagination import InvalidCursorError, paginate
 
 order_bp = Blueprint("orders", __name__)
 
+ORDER_STATUSES = {"created", "confirmed", "packed", "shipped", "delivered", "cancelled"}
+MAX_STATUS_BATCH_SIZE = 500
+
 
 @order_bp.get("/ping")
 def ping_orders() -> tuple[dict[str, str], int]:
@@ -29,46 +65,63 @@ def list_orders() -> tuple[dict[str, list[dict[str, object]]], int]:
     claims = get_jwt()
     roles = set(claims.get("roles", []))
 
-    query = db.session.query(Order)
-    if not roles.intersection({"admin", "super_admin", "support_ops"}):
-        query = query.filter((Order.buyer_id == current_user_id) | (Order.seller_id == current_user_id))
+    page_size = _int_query_arg("page_size", 200, minimum=1, maximum=200)
+    cursor = (request.args.get("cursor") or "").strip() or None
+    try:
+        filters = _order_search_filters()
+    except ValueError as exc:
+        return {"message": str(exc)}, 400
+    participant_id = None if roles.intersection({"admin", "super_admin", "support_ops"}) else current_user_id
 
-    orders = query.order_by(Order.created_at.desc()).limit(200).all()
+    try:
+        result = search_orders(filters, participant_id=participant_id, page_size=page_size, cursor=cursor)
+    except InvalidCursorError:
+        return {"message": "invalid cursor"}, 400
     return {
-        "items": [
-            {
-                "id": order.id,
-                "order_number": order.order_number,
-                "order_group_id": order.order_group_id,
-                "group_number": order.order_group.group_number if order.order_group else None,
-                "buyer_id": order.buyer_id,
-                "seller_id": order.seller_id,
-                "supplier_id": order.supplier_id,
-                "seller_name": _user_display_name(order.seller),
-                "supplier_name": order.supplier.supplier_name if order.supplier else None,
-                "source_label": _order_source_label(order),
-                "status": order.status,
-                "total_amount": str(order.total_amount),
-                "currency": order.currency,
-                "items": [
-                    {
-                        "id": item.id,
-                        "sku": item.sku,
-                        "name": item.name,
-                        "product_id": item.product_id,
-                        "inventory_kind": item.inventory_kind,
-                        "source_inventory_item_id": item.source_inventory_item_id,
-                        "qty": item.qty,
-                        "unit_price": str(item.unit_price),
-                    }
-                    for item in order.items
-                ],
-            }
-            for order in orders
-        ]
+        "items": [_build_order_response(order) for order in result.items],
+        "pagination": result.pagination(page_size=page_size),
     }, 200
 
 
+@order_bp.get("/export")
+@require_permissions("order.read")
+def export_orders() -> Response | tuple[dict[str, object], int]:
+    """Stream every matching order as NDJSON (one order with its items per
+    line) or CSV (one row per order item). Resume with ``after=<order id>`` of
+    the last complete order received."""
+    current_user_id = _current_user_id_from_token()
+    if current_user_id is None:
+        return {"message": "invalid token identity"}, 401
+
+    roles = set(get_jwt().get("roles", []))
+    export_format = (request.args.get("format") or "ndjson").strip().lower()
+    if export_format not in EXPORT_MEDIA_TYPES:
+        return {"message": "format must be ndjson or csv"}, 400
+    try:
+        filters = _order_search_filters()
+    except ValueError as exc:
+        return {"message": str(exc)}, 400
+    after = (request.args.get("after") or "").strip()
+    if after and not after.isdigit():
+        return {"message": "after must be an order id"}, 400
+
+    rows = iter_order_item_rows(
+        filters,
+        participant_id=None if roles.intersection({"admin", "super_admin", "support_ops"}) else current_user_id,
+        after_id=int(after) if after else None,
+        batch_size=export_batch_size(),
+    )
+    if export_format == "csv":
+        body = render_csv(rows, ORDER_EXPORT_FIELDS + ORDER_ITEM_EXPORT_FIELDS)
+    else:
+        body = render_ndjson(group_order_rows(rows))
+    return Response(
+        stream_with_context(body),
+        mimetype=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f"attachment; filename=orders.{export_format}"},
+    )
+
+
 @order_bp.get("/groups")
 @require_permissions("order.read")
 def list_order_groups() -> tuple[dict[str, list[dict[str, object]]], int]:
@@ -79,12 +132,27 @@ def list_order_groups() -> tuple[dict[str, list[dict[str, object]]], int]:
     claims = get_jwt()
     roles = set(claims.get("roles", []))
 
-    query = db.session.query(OrderGroup)
+    page_size = _int_query_arg("page_size", 200, minimum=1, maximum=200)
+    cursor = (request.args.get("cursor") or "").strip() or None
+
+    stmt = select(OrderGroup).options(*ORDER_GROUP_RESPONSE)
     if not roles.intersection({"admin", "super_admin", "support_ops"}):
-        query = query.filter(OrderGroup.buyer_id == current_user_id)
+        stmt = stmt.where(OrderGroup.buyer_id == current_user_id)
 
-    groups = query.order_by(OrderGroup.created_at.desc(), OrderGroup.id.desc()).limit(200).all()
-    return {"items": [_build_order_group_response(group) for group in groups]}, 200
+    try:
+        result = paginate(
+            stmt,
+            scope="order_groups",
+            sort=[OrderGroup.created_at, OrderGroup.id],
+            page_size=page_size,
+            cursor=cursor,
+        )
+    except InvalidCursorError:
+        return {"message": "invalid cursor"}, 400
+    return {
+        "items": [_build_order_group_response(group) for group in result.items],
+        "pagination": result.pagination(page_size=page_size),
+    }, 200
 
 
 @order_bp.get("/groups/<int:order_group_id>")
@@ -97,7 +165,7 @@ def get_order_group(order_group_id: int) -> tuple[dict[str, object], int]:
     claims = get_jwt()
     roles = set(claims.get("roles", []))
 
-    group = db.session.get(OrderGroup, order_group_id)
+    group = db.session.get(OrderGroup, order_group_id, options=ORDER_GROUP_RESPONSE)
     if group is None:
         return {"message": "order group not found"}, 404
 
@@ -114,81 +182,79 @@ def list_ambassador_buyer_order_groups() -> tuple[dict[str, list[dict[str, objec
     if current_user_id is None:
         return {"message": "invalid token identity"}, 401
 
+    page_size = _int_query_arg("page_size", 300, minimum=1, maximum=300)
+    cursor = (request.args.get("cursor") or "").strip() or None
+
     buyer_ids = [buyer.id for buyer in list_buyers_for_ambassador(current_user_id)]
     if not buyer_ids:
-        return {"items": []}, 200
-
-    groups = (
-        db.session.query(OrderGroup)
-        .filter(OrderGroup.buyer_id.in_(buyer_ids))
-        .order_by(OrderGroup.created_at.desc(), OrderGroup.id.desc())
-        .limit(300)
-        .all()
-    )
-    return {"items": [_build_order_group_response(group) for group in groups]}, 200
+        return {"items": [], "pagination": {"page_size": page_size, "next_cursor": None}}, 200
+
+    stmt = select(OrderGroup).options(*ORDER_GROUP_RESPONSE).where(OrderGroup.buyer_id.in_(buyer_ids))
+    try:
+        result = paginate(
+            stmt,
+            scope="ambassador_order_groups",
+            sort=[OrderGroup.created_at, OrderGroup.id],
+            page_size=page_size,
+            cursor=cursor,
+        )
+    except InvalidCursorError:
+        return {"message": "invalid cursor"}, 400
+    return {
+        "items": [_build_order_group_response(group) for group in result.items],
+        "pagination": result.pagination(page_size=page_size),
+    }, 200
 
 
 @order_bp.get("/catalog")
 @require_permissions("order.create")
-def search_order_catalog() -> tuple[dict[str, list[dict[str, object]]], int]:
+def search_order_catalog() -> tuple[dict[str, object], int]:
     product_type = str(request.args.get("product_type", "")).strip()
     product_name = str(request.args.get("product_name", "")).strip()
     seller_name = str(request.args.get("seller_name", "")).strip()
     supplier_name = str(request.args.get("supplier_name", "")).strip()
-
-    def _base_rows(model_cls: type[InventoryItem] | type[FreshProduceInventoryItem], inventory_kind: str):
-        query = (
-            db.session.query(model_cls, Product, User, Supplier)
-            .join(Product, model_cls.product_id == Product.id)
-            .outerjoin(User, model_cls.seller_id == User.id)
-            .outerjoin(Supplier, model_cls.supplier_id == Supplier.supplier_id)
+    limit = _int_query_arg("limit", 500, minimum=1, maximum=500)
+    offset = _int_query_arg("offset", 0, minimum=0)
+
+    rows = search_catalog(
+        product_type=product_type,
+        product_name=product_name,
+        seller_name=seller_name,
+        supplier_name=supplier_name,
+        limit=limit + 1,
+        offset=offset,
+    )
+    has_more = len(rows) > limit
+    items: list[dict[str, object]] = []
+    for row in rows[:limit]:
+        seller_name_display = _display_name(row.seller_first_name, row.seller_last_name, row.seller_email)
+        items.append(
+            {
+                "inventory_kind": row.inventory_kind,
+                "inventory_item_id": row.inventory_item_id,
+                "product_id": row.product_id,
+                "product_name": row.product_name,
+                "product_type": row.product_type,
+                "product_unit": row.product_unit,
+                "seller_id": row.seller_id,
+                "seller_name": seller_name_display,
+                "supplier_id": row.supplier_id,
+                "supplier_name": row.supplier_name,
+                "available_quantity": int(row.available_quantity),
+                "source_label": _catalog_source_label(
+                    seller_id=row.seller_id,
+                    seller_name=seller_name_display,
+                    supplier_id=row.supplier_id,
+                    supplier_name=row.supplier_name,
+                ),
+                "suggested_unit_price": str(row.price_per_unit) if row.price_per_unit is not None else None,
+                "can_order": bool(row.can_order),
+            }
         )
-        if product_type:
-            query = query.filter(Product.product_type.ilike(f"%{product_type}%"))
-        if product_name:
-            query = query.filter(Product.product_name.ilike(f"%{product_name}%"))
-        if seller_name:
-            query = query.filter(
-                (User.email.ilike(f"%{seller_name}%"))
-                | (User.first_name.ilike(f"%{seller_name}%"))
-                | (User.last_name.ilike(f"%{seller_name}%"))
-            )
-        if supplier_name:
-            query = query.filter(Supplier.supplier_name.ilike(f"%{supplier_name}%"))
-
-        rows = query.limit(500).all()
-        result: list[dict[str, object]] = []
-        for item, product, seller, supplier in rows:
-            available_quantity = _available_inventory_quantity(item, product, inventory_kind=inventory_kind)
-            if available_quantity <= 0:
-                continue
-            can_order = bool(
-                (seller and seller.seller_status == "valid" and any(role.name == "seller" for role in seller.roles))
-                or (supplier and supplier.is_active)
-            )
-            result.append(
-                {
-                    "inventory_kind": inventory_kind,
-                    "inventory_item_id": item.id,
-                    "product_id": product.id,
-                    "product_name": product.product_name,
-                    "product_type": product.product_type,
-                    "product_unit": product.product_unit,
-                    "seller_id": seller.id if seller else None,
-                    "seller_name": _user_display_name(seller),
-                    "supplier_id": supplier.supplier_id if supplier else None,
-                    "supplier_name": supplier.supplier_name if supplier else None,
-                    "available_quantity": available_quantity,
-                    "source_label": _catalog_source_label(seller=seller, supplier=supplier),
-                    "suggested_unit_price": str(item.price_per_unit) if item.price_per_unit is not None else None,
-                    "can_order": can_order,
-                }
-            )
-        return result
-
-    rows = _base_rows(InventoryItem, "regular") + _base_rows(FreshProduceInventoryItem, "fresh_produce")
-    rows.sort(key=lambda row: (str(row.get("product_name", "")).lower(), -int(row.get("available_quantity", 0))))
-    return {"items": rows[:500]}, 200
+    return {
+        "items": items,
+        "pagination": {"limit": limit, "offset": offset, "has_more": has_more},
+    }, 200
 
 
 @order_bp.post("")
@@ -199,6 +265,19 @@ def create_order() -> tuple[dict[str, object], int]:
         return {"message": "invalid token identity"}, 401
 
     payload = request.get_json(silent=True) or {}
+    idempotency_key = (request.headers.get(IDEMPOTENCY_HEADER) or "").strip()
+    fingerprint = ""
+    if idempotency_key:
+        if len(idempotency_key) > MAX_KEY_LENGTH:
+            return {"message": f"{IDEMPOTENCY_HEADER} exceeds max length {MAX_KEY_LENGTH}"}, 400
+        fingerprint = request_fingerprint(request.method, request.path, payload)
+        try:
+            replay = find_replay(current_user_id, idempotency_key, fingerprint)
+        except IdempotencyKeyReusedError:
+            return {"message": f"{IDEMPOTENCY_HEADER} was already used with a different request"}, 422
+        if replay is not None:
+            return replay
+
     seller_id = payload.get("seller_id")
     supplier_id = payload.get("supplier_id")
     currency = str(payload.get("currency", "USD")).upper()
@@ -207,8 +286,7 @@ def create_order() -> tuple[dict[str, object], int]:
     if not isinstance(items_payload, list) or not items_payload:
         return {"message": "items must be a non-empty list"}, 400
 
-    source_groups: dict[tuple[str, int], dict[str, object]] = {}
-    total = Decimal("0")
+    cart_lines: list[dict[str, object]] = []
     for idx, item in enumerate(items_payload):
         if not isinstance(item, dict):
             return {"message": f"item at index {idx} must be an object"}, 400
@@ -247,10 +325,37 @@ def create_order() -> tuple[dict[str, object], int]:
         if not isinstance(item_seller_id, int) and not isinstance(item_supplier_id, int):
             return {"message": f"item at index {idx} requires seller_id or supplier_id"}, 400
 
+        cart_lines.append(
+            {
+                "seller_id": item_seller_id if isinstance(item_seller_id, int) else None,
+                "supplier_id": item_supplier_id if isinstance(item_supplier_id, int) else None,
+                "sku": sku,
+                "name": name,
+                "product_id": product_id,
+                "inventory_kind": inventory_kind,
+                "source_inventory_item_id": source_inventory_item_id,
+                "qty": qty_raw,
+                "unit_price": unit_price,
+            }
+        )
+
+    sellers_by_id, suppliers_by_id, inventory_by_source = load_checkout_sources(cart_lines)
+
+    source_groups: dict[tuple[str, int], dict[str, object]] = {}
+    reservation_lines: list[tuple[str, int, int]] = []
+    line_index_by_source: dict[tuple[str, int], int] = {}
+    total = Decimal("0")
+    for idx, line in enumerate(cart_lines):
+        product_id = line["product_id"]
+        inventory_kind = line["inventory_kind"]
+        source_inventory_item_id = line["source_inventory_item_id"]
+        qty_raw = line["qty"]
+        unit_price = line["unit_price"]
+
         seller = None
         supplier = None
-        if isinstance(item_seller_id, int):
-            seller = db.session.get(User, item_seller_id)
+        if line["seller_id"] is not None:
+            seller = sellers_by_id.get(line["seller_id"])
             if seller is None:
                 return {"message": f"item at index {idx} seller not found"}, 404
             seller_roles = {role.name for role in seller.roles}
@@ -260,25 +365,26 @@ def create_order() -> tuple[dict[str, object], int]:
                 return {"message": f"item at index {idx} selected seller is not validated yet"}, 400
             source_key = ("seller", seller.id)
         else:
-            supplier = db.session.get(Supplier, item_supplier_id)
+            supplier = suppliers_by_id.get(line["supplier_id"])
             if supplier is None:
                 return {"message": f"item at index {idx} supplier not found"}, 404
             if not supplier.is_active:
                 return {"message": f"item at index {idx} selected supplier is inactive"}, 400
             source_key = ("supplier", supplier.supplier_id)
 
-        inventory_model = InventoryItem if inventory_kind == "regular" else FreshProduceInventoryItem
-        inventory_item = db.session.get(inventory_model, source_inventory_item_id)
+        inventory_item = inventory_by_source.get((inventory_kind, source_inventory_item_id))
         if inventory_item is None:
             return {"message": f"item at index {idx} inventory source not found"}, 404
         if inventory_item.product_id != product_id:
             return {"message": f"item at index {idx} product does not match inventory source"}, 400
-        if _inventory_is_expired(inventory_item, inventory_item.product):
+        if _inventory_is_expired(inventory_item):
             return {"message": f"item at index {idx} inventory is expired"}, 400
 
-        available_quantity = _available_inventory_quantity(inventory_item, inventory_item.product, inventory_kind=inventory_kind)
+        # Cheap early answer; reserve_inventory below re-checks atomically and
+        # answers the same way when it loses a race.
+        available_quantity = _available_inventory_quantity(inventory_item, inventory_kind=inventory_kind)
         if qty_raw > available_quantity:
-            return {"message": f"item at index {idx} quantity exceeds available inventory"}, 400
+            return {"message": f"item at index {idx} quantity exceeds available inventory"}, 409
 
         if seller is not None and inventory_item.seller_id != seller.id:
             return {"message": f"item at index {idx} inventory does not belong to selected seller"}, 400
@@ -296,8 +402,8 @@ def create_order() -> tuple[dict[str, object], int]:
         )
         grouped["items"].append(
             OrderItem(
-                sku=sku,
-                name=name,
+                sku=line["sku"],
+                name=line["name"],
                 product_id=product_id,
                 inventory_kind=inventory_kind,
                 source_inventory_item_id=source_inventory_item_id,
@@ -306,47 +412,71 @@ def create_order() -> tuple[dict[str, object], int]:
             )
         )
         grouped["total"] += unit_price * qty_raw
-        inventory_item.reserved_quantity += qty_raw
+        reservation_lines.append((inventory_kind, source_inventory_item_id, qty_raw))
+        line_index_by_source.setdefault((inventory_kind, source_inventory_item_id), idx)
         total += unit_price * qty_raw
 
-    group_number = f"GRP-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S%f')}"
+    try:
+        reserve_inventory(reservation_lines)
+    except InsufficientStockError as exc:
+        db.session.rollback()
+        idx = line_index_by_source[(exc.inventory_kind, exc.inventory_item_id)]
+        return {"message": f"item at index {idx} quantity exceeds available inventory"}, 409
+
     order_group = OrderGroup(
-        group_number=group_number,
+        group_number=next_group_number(),
         buyer_id=current_user_id,
         total_amount=total.quantize(Decimal("0.01")),
         currency=currency,
     )
     db.session.add(order_group)
 
+    reservation_expires_at = reservation_deadline()
     created_orders: list[Order] = []
-    for index, grouped in enumerate(source_groups.values(), start=1):
-        order_number = f"ORD-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S%f')}-{index}"
+    for grouped in source_groups.values():
         order = Order(
-            order_number=order_number,
+            order_number=next_order_number(),
             order_group=order_group,
             buyer_id=current_user_id,
-            seller_id=grouped["seller"].id if grouped["seller"] else None,
-            supplier_id=grouped["supplier"].supplier_id if grouped["supplier"] else None,
+            seller=grouped["seller"],
+            supplier=grouped["supplier"],
             status="created",
             total_amount=grouped["total"].quantize(Decimal("0.01")),
             currency=currency,
+            reservation_expires_at=reservation_expires_at,
         )
         order.items = grouped["items"]
-        db.session.add(order)
         created_orders.append(order)
+    db.session.add_all(created_orders)
 
-    db.session.commit()
-    db.session.refresh(order_group)
-    for order in created_orders:
-        db.session.refresh(order)
-
-    return {
+    # One flush sends the group, orders and order items as batched
+    # multi-row INSERTs; the response is built from the flushed objects
+    # instead of re-selecting every row after commit.
+    db.session.flush()
+    response = {
         "order_group_id": order_group.id,
         "group_number": order_group.group_number,
         "total_amount": str(order_group.total_amount),
         "currency": order_group.currency,
         "orders": [_build_order_response(order) for order in created_orders],
-    }, 201
+    }
+    if idempotency_key:
+        record_response(current_user_id, idempotency_key, fingerprint, response, 201)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        if not idempotency_key:
+            raise
+        # A concurrent retry with the same key committed first; replay its result.
+        try:
+            replay = find_replay(current_user_id, idempotency_key, fingerprint)
+        except IdempotencyKeyReusedError:
+            return {"message": f"{IDEMPOTENCY_HEADER} was already used with a different request"}, 422
+        if replay is None:
+            raise
+        return replay
+    return response, 201
 
 
 @order_bp.patch("/<int:order_id>/status")
@@ -354,12 +484,12 @@ def create_order() -> tuple[dict[str, object], int]:
 def update_order_status(order_id: int) -> tuple[dict[str, object], int]:
     payload = request.get_json(silent=True) or {}
     new_status = str(payload.get("status", "")).strip().lower()
-    allowed_statuses = {"created", "confirmed", "packed", "shipped", "delivered", "cancelled"}
-
-    if new_status not in allowed_statuses:
+    if new_status not in ORDER_STATUSES:
         return {"message": "invalid status"}, 400
 
-    order = db.session.get(Order, order_id)
+    # Locked so the reservation sweeper cannot cancel the order (and release
+    # its stock) between this read and the write below.
+    order = db.session.execute(select(Order).where(Order.id == order_id).with_for_update()).scalar_one_or_none()
     if order is None:
         return {"message": "order not found"}, 404
 
@@ -368,19 +498,7 @@ def update_order_status(order_id: int) -> tuple[dict[str, object], int]:
         return {"message": "cannot change status once order is delivered or cancelled"}, 409
 
     if old_status != new_status and new_status in {"delivered", "cancelled"}:
-        for item in order.items:
-            inventory_model = InventoryItem if item.inventory_kind == "regular" else FreshProduceInventoryItem
-            if item.source_inventory_item_id is None:
-                continue
-            inventory_item = db.session.get(inventory_model, item.source_inventory_item_id)
-            if inventory_item is None:
-                continue
-            inventory_item.reserved_quantity = max(0, inventory_item.reserved_quantity - item.qty)
-            if new_status == "delivered":
-                if item.inventory_kind == "regular":
-                    inventory_item.quantity = max(0, inventory_item.quantity - item.qty)
-                else:
-                    inventory_item.estimated_quantity = max(0, inventory_item.estimated_quantity - item.qty)
+        release_inventory(order.items, consume=new_status == "delivered")
 
     order.status = new_status
     db.session.commit()
@@ -392,6 +510,63 @@ def update_order_status(order_id: int) -> tuple[dict[str, object], int]:
     }, 200
 
 
+@order_bp.patch("/status:batch")
+@require_permissions("order.status.update")
+def update_order_statuses() -> tuple[dict[str, object], int]:
+    """Move up to ``MAX_STATUS_BATCH_SIZE`` orders to one status.
+
+    All transitions are validated before anything is written, and the batch
+    commits as a single transaction; inventory for delivered and cancelled
+    orders is settled with one UPDATE per inventory table.
+    """
+    payload = request.get_json(silent=True) or {}
+    new_status = str(payload.get("status", "")).strip().lower()
+    if new_status not in ORDER_STATUSES:
+        return {"message": "invalid status"}, 400
+    order_ids = payload.get("order_ids")
+    if (
+        not isinstance(order_ids, list)
+        or not order_ids
+        or not all(isinstance(order_id, int) and not isinstance(order_id, bool) for order_id in order_ids)
+    ):
+        return {"message": "order_ids must be a non-empty list of integers"}, 400
+    order_ids = list(dict.fromkeys(order_ids))
+    if len(order_ids) > MAX_STATUS_BATCH_SIZE:
+        return {"message": f"at most {MAX_STATUS_BATCH_SIZE} orders per batch"}, 400
+
+    orders = db.session.execute(
+        select(Order).where(Order.id.in_(order_ids)).order_by(Order.id).with_for_update()
+    ).scalars().all()
+    found_ids = {order.id for order in orders}
+    missing_ids = [order_id for order_id in order_ids if order_id not in found_ids]
+    if missing_ids:
+        return {"message": "order not found", "order_ids": missing_ids}, 404
+
+    locked_ids = [
+        order.id for order in orders if order.status in {"delivered", "cancelled"} and order.status != new_status
+    ]
+    if locked_ids:
+        return {
+            "message": "cannot change status once order is delivered or cancelled",
+            "order_ids": locked_ids,
+        }, 409
+
+    changed = [order for order in orders if order.status != new_status]
+    if new_status == "delivered":
+        settle_inventory(delivered=[item for order in changed for item in order.items])
+    elif new_status == "cancelled":
+        settle_inventory(cancelled=[item for order in changed for item in order.items])
+    for order in changed:
+        order.status = new_status
+    db.session.commit()
+
+    return {
+        "items": [
+            {"id": order.id, "order_number": order.order_number, "status": order.status} for order in orders
+        ]
+    }, 200
+
+
 def _current_user_id_from_token() -> int | None:
     raw_identity = get_jwt_identity()
     try:
@@ -415,6 +590,9 @@ def _build_order_response(order: Order) -> dict[str, object]:
         "status": order.status,
         "total_amount": str(order.total_amount),
         "currency": order.currency,
+        "reservation_expires_at": (
+            order.reservation_expires_at.isoformat() if order.reservation_expires_at else None
+        ),
         "items": [
             {
                 "id": item.id,
@@ -446,24 +624,21 @@ def _build_order_group_response(group: OrderGroup) -> dict[str, object]:
     }
 
 
-def _inventory_is_expired(item: InventoryItem | FreshProduceInventoryItem, product: Product) -> bool:
-    if product.validity_days is None:
-        return False
-    updated_at = item.updated_at
-    if updated_at is None:
+def _inventory_is_expired(item: InventoryItem | FreshProduceInventoryItem) -> bool:
+    expires_at = item.expires_at
+    if expires_at is None:
         return False
-    if updated_at.tzinfo is None:
-        updated_at = updated_at.replace(tzinfo=timezone.utc)
-    return datetime.now(timezone.utc) >= (updated_at + timedelta(days=product.validity_days))
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc) >= expires_at
 
 
 def _available_inventory_quantity(
     item: InventoryItem | FreshProduceInventoryItem,
-    product: Product | None,
     *,
     inventory_kind: str,
 ) -> int:
-    if product is not None and _inventory_is_expired(item, product):
+    if _inventory_is_expired(item):
         return 0
     base = item.quantity if inventory_kind == "regular" else item.estimated_quantity
     return max(0, base - getattr(item, "reserved_quantity", 0))
@@ -472,17 +647,97 @@ def _available_inventory_quantity(
 def _user_display_name(user: User | None) -> str | None:
     if user is None:
         return None
-    full = " ".join([part for part in [user.first_name, user.last_name] if part]).strip()
+    return _display_name(user.first_name, user.last_name, user.email)
+
+
+def _display_name(first_name: str | None, last_name: str | None, email: str | None) -> str | None:
+    full = " ".join([part for part in [first_name, last_name] if part]).strip()
     if full:
         return full
-    return user.email
+    return email
+
+
+def _int_query_arg(
+    name: str,
+    default: int,
+    *,
+    minimum: int | None = None,
+    maximum: int | None = None,
+) -> int:
+    raw = request.args.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return default
+    if minimum is not None and value < minimum:
+        return minimum
+    if maximum is not None and value > maximum:
+        return maximum
+    return value
+
+
+def _optional_int_query_arg(name: str) -> int | None:
+    """The integer value of ``name``, ``None`` if absent; a malformed value
+    raises ``ValueError`` rather than silently dropping the filter."""
+    raw = request.args.get(name)
+    if raw is None or raw == "":
+        return None
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be integer") from None
+
+
+def _datetime_query_arg(name: str) -> datetime | None:
+    raw = (request.args.get(name) or "").strip()
+    if not raw:
+        return None
+    try:
+        value = datetime.fromisoformat(raw)
+    except ValueError:
+        raise ValueError(name) from None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
 
 
-def _catalog_source_label(*, seller: User | None, supplier: Supplier | None) -> str:
-    if seller is not None:
-        return f"Seller: {_user_display_name(seller) or seller.id}"
-    if supplier is not None:
-        return f"Supplier: {supplier.supplier_name}"
+def _order_search_filters() -> OrderSearchFilters:
+    statuses = tuple(
+        value.strip().lower() for value in (request.args.get("status") or "").split(",") if value.strip()
+    )
+    if any(value not in ORDER_STATUSES for value in statuses):
+        raise ValueError("invalid status")
+    try:
+        created_from = _datetime_query_arg("created_from")
+        created_to = _datetime_query_arg("created_to")
+    except ValueError as exc:
+        raise ValueError(f"{exc} must be an ISO 8601 datetime") from None
+
+    return OrderSearchFilters(
+        statuses=statuses,
+        created_from=created_from,
+        created_to=created_to,
+        seller_id=_optional_int_query_arg("seller_id"),
+        supplier_id=_optional_int_query_arg("supplier_id"),
+        product_id=_optional_int_query_arg("product_id"),
+        sku=(request.args.get("sku") or "").strip() or None,
+        group_number=(request.args.get("group_number") or "").strip() or None,
+    )
+
+
+def _catalog_source_label(
+    *,
+    seller_id: int | None,
+    seller_name: str | None,
+    supplier_id: int | None,
+    supplier_name: str | None,
+) -> str:
+    if seller_id is not None:
+        return f"Seller: {seller_name or seller_id}"
+    if supplier_id is not None:
+        return f"Supplier: {supplier_name}"
     return "Unknown"
 
 
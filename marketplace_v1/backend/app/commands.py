@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+import click
+from flask import Flask
+from flask.cli import AppGroup
+
+maintenance_cli = AppGroup("maintenance", help="Periodic maintenance jobs.")
+
+
+@maintenance_cli.command("purge-idempotency-keys")
+@click.option("--batch-size", default=1000, show_default=True, type=click.IntRange(min=1))
+def purge_idempotency_keys_command(batch_size: int) -> None:
+    """Delete expired Idempotency-Key replay records."""
+    from app.services.idempotency_service import purge_expired_idempotency_keys
+
+    deleted = purge_expired_idempotency_keys(batch_size=batch_size)
+    click.echo(f"deleted {deleted} expired idempotency keys")
+
+
+@maintenance_cli.command("backfill-inventory-expiry")
+@click.option("--product-id", type=int, default=None, help="Only recompute lots of this product.")
+@click.option("--batch-size", default=1000, show_default=True, type=click.IntRange(min=1))
+def backfill_inventory_expiry_command(product_id: int | None, batch_size: int) -> None:
+    """Recompute the stored expires_at of inventory lots."""
+    from app.services.inventory_service import backfill_inventory_expiry
+
+    touched = backfill_inventory_expiry(product_id=product_id, batch_size=batch_size)
+    click.echo(f"recomputed expires_at for {touched} inventory lots")
+
+
+@maintenance_cli.command("expire-reservations")
+@click.option("--batch-size", default=500, show_default=True, type=click.IntRange(min=1))
+@click.option(
+    "--interval",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Keep running, sweeping every INTERVAL seconds.",
+)
+def expire_reservations_command(batch_size: int, interval: int | None) -> None:
+    """Cancel "created" orders whose inventory hold has lapsed."""
+    from app.services.order_service import expire_stale_orders
+
+    def sweep() -> None:
+        cancelled = expire_stale_orders(batch_size=batch_size)
+        click.echo(f"cancelled {cancelled} orders with lapsed reservations")
+
+    _run(sweep, interval)
+
+
+@maintenance_cli.command("sweep-expired-inventory")
+@click.option(
+    "--archive-after-days",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Archive lots expired longer ago than this (default: INVENTORY_ARCHIVE_AFTER_DAYS, else never).",
+)
+@click.option("--batch-size", default=500, show_default=True, type=click.IntRange(min=1))
+@click.option(
+    "--interval",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Keep running, sweeping every INTERVAL seconds.",
+)
+def sweep_expired_inventory_command(archive_after_days: int | None, batch_size: int, interval: int | None) -> None:
+    """Flag expired inventory lots, settle their reservations and archive old ones."""
+    from app.services.inventory_expiry_service import archive_after_days as configured_archive_after_days
+    from app.services.inventory_expiry_service import sweep_expired_inventory
+
+    if archive_after_days is None:
+        archive_after_days = configured_archive_after_days()
+
+    def sweep() -> None:
+        result = sweep_expired_inventory(archive_after=archive_after_days, batch_size=batch_size)
+        click.echo(
+            f"flagged {result.flagged} expired lots (cleared {result.unflagged}), "
+            f"cancelled {result.cancelled_orders} orders, archived {result.archived} lots"
+        )
+        if result.held_order_ids:
+            held = ", ".join(str(order_id) for order_id in result.held_order_ids)
+            click.echo(f"confirmed orders holding expired stock: {held}")
+
+    _run(sweep, interval)
+
+
+@maintenance_cli.command("reconcile-reservations")
+@click.option("--batch-size", default=1000, show_default=True, type=click.IntRange(min=1))
+@click.option("--dry-run", is_flag=True, help="Report drift without correcting it.")
+@click.option(
+    "--interval",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Keep running, reconciling every INTERVAL seconds.",
+)
+def reconcile_reservations_command(batch_size: int, dry_run: bool, interval: int | None) -> None:
+    """Recompute reserved_quantity of inventory lots from open orders."""
+    from app.services.order_service import reconcile_reserved_quantities
+
+    def reconcile() -> None:
+        drifts, corrected = reconcile_reserved_quantities(batch_size=batch_size, dry_run=dry_run)
+        for drift in drifts:
+            click.echo(
+                f"{drift.inventory_kind} inventory item {drift.inventory_item_id}: "
+                f"reserved {drift.stored}, open orders hold {drift.expected}"
+            )
+        click.echo(f"found {len(drifts)} drifted inventory lots, corrected {corrected}")
+
+    _run(reconcile, interval)
+
+
+@maintenance_cli.command("snapshot-inventory")
+@click.option("--keep", type=click.IntRange(min=1), default=None, help="Retain only the newest KEEP snapshots.")
+@click.option(
+    "--interval",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Keep running, snapshotting every INTERVAL seconds.",
+)
+def snapshot_inventory_command(keep: int | None, interval: int | None) -> None:
+    """Compact the inventory movement ledger into a new stock snapshot."""
+    from app.services.inventory_ledger_service import take_inventory_snapshot
+
+    def snapshot() -> None:
+        taken = take_inventory_snapshot(keep=keep)
+        if taken is None:
+            click.echo("latest snapshot is already current")
+        else:
+            click.echo(f"took inventory snapshot {taken.id} as of {taken.as_of.isoformat()}")
+
+    _run(snapshot, interval)
+
+
+@maintenance_cli.command("rebuild-supplier-rating-stats")
+def rebuild_supplier_rating_stats_command() -> None:
+    """Recompute supplier_rating_stats from the procurement reviews."""
+    from app.services.supplier_rating_service import rebuild_supplier_rating_stats
+
+    rated = rebuild_supplier_rating_stats()
+    click.echo(f"rebuilt rating stats for {rated} suppliers")
+
+
+@maintenance_cli.command("dedupe-review-images")
+@click.option("--batch-size", default=200, show_default=True, type=click.IntRange(min=1))
+def dedupe_review_images_command(batch_size: int) -> None:
+    """Move review images stored per review into the content-addressed blob store."""
+    from app.services.review_image_service import dedupe_legacy_review_images
+
+    migrated, deduplicated, missing = dedupe_legacy_review_images(batch_size=batch_size)
+    click.echo(f"moved {migrated} review images ({deduplicated} were duplicates), {missing} files missing")
+
+
+@maintenance_cli.command("prune-review-images")
+@click.option(
+    "--min-age",
+    default=3600,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Only delete stray files older than this many seconds.",
+)
+def prune_review_images_command(min_age: int) -> None:
+    """Recount review image blob references and delete unused blobs."""
+    from app.services.review_image_service import prune_review_image_blobs
+
+    deleted = prune_review_image_blobs(min_age_seconds=min_age)
+    click.echo(f"deleted {deleted} unused review image files")
+
+
+@maintenance_cli.command("generate-review-image-derivatives")
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Worker processes (default: REVIEW_IMAGE_DERIVATIVE_WORKERS, else one per CPU).",
+)
+@click.option("--batch-size", default=50, show_default=True, type=click.IntRange(min=1))
+@click.option(
+    "--interval",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Keep running, picking up new images every INTERVAL seconds.",
+)
+@click.option(
+    "--requeue-failed",
+    is_flag=True,
+    help="First put images whose derivatives failed back in the queue.",
+)
+def generate_review_image_derivatives_command(
+    workers: int | None, batch_size: int, interval: int | None, requeue_failed: bool
+) -> None:
+    """Render thumbnails and WebP variants of newly stored review images."""
+    from app.services.review_image_derivative_service import (
+        generate_review_image_derivatives,
+        requeue_failed_review_image_derivatives,
+    )
+
+    if requeue_failed:
+        click.echo(f"requeued {requeue_failed_review_image_derivatives()} failed review images")
+
+    def generate() -> None:
+        run = generate_review_image_derivatives(workers=workers, batch_size=batch_size)
+        for sha256 in run.failed:
+            click.echo(f"could not render derivatives of review image blob {sha256}")
+        click.echo(
+            f"rendered derivatives for {run.ready} review images, "
+            f"{run.deferred} deferred, {len(run.failed)} failed"
+        )
+
+    _run(generate, interval)
+
+
+def _run(job: Callable[[], None], interval: int | None) -> None:
+    """Run ``job`` once, or every ``interval`` seconds until interrupted."""
+    if interval is None:
+        job()
+        return
+    while True:
+        started = time.monotonic()
+        job()
+        time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+def register_commands(app: Flask) -> None:
+    app.cli.add_command(maintenance_cli)
@@ -8,3 +8,13 @@ class Config:
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "change-me-in-production")
+    PAGINATION_CURSOR_SECRET = os.getenv("PAGINATION_CURSOR_SECRET", JWT_SECRET_KEY)
+    ORDER_RESERVATION_TTL_SECONDS = int(os.getenv("ORDER_RESERVATION_TTL_SECONDS", str(24 * 60 * 60)))
+    INVENTORY_SNAPSHOT_SETTLE_SECONDS = int(os.getenv("INVENTORY_SNAPSHOT_SETTLE_SECONDS", "60"))
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    # Unset: the expiry sweeper only flags lots and never archives them.
+    INVENTORY_ARCHIVE_AFTER_DAYS = os.getenv("INVENTORY_ARCHIVE_AFTER_DAYS")
+    # Unset: one derivative worker process per CPU.
+    REVIEW_IMAGE_DERIVATIVE_WORKERS = os.getenv("REVIEW_IMAGE_DERIVATIVE_WORKERS")
+    IDEMPOTENCY_KEY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_KEY_TTL_SECONDS", str(24 * 60 * 60)))
+    IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "2048"))
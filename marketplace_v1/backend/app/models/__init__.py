@@ -1,24 +1,37 @@
 from .audit_log import AuditLog
 from .fresh_produce_inventory import FreshProduceInventoryItem
+from .id_worker_lease import IdWorkerLease
+from .idempotency_key import IdempotencyKey
 from .inventory import InventoryItem
+from .inventory_archive import FreshProduceInventoryArchive, InventoryItemArchive
+from .inventory_movement import InventoryMovement, InventorySnapshot, InventorySnapshotLot
 from .order import Order, OrderGroup, OrderItem
 from .permission import Permission
 from .product import Product
 from .product_type import ProductType
 from .procurement_order import ProcurementOrder
-from .procurement_review import ProcurementOrderReview, ProcurementOrderReviewImage
+from .procurement_review import ProcurementOrderReview, ProcurementOrderReviewImage, ProcurementReviewImageBlob
 from .region import Region
 from .region_default import RegionDefault
 from .role import Role, RolePermission, UserRole
 from .supplier import Supplier
 from .supplier_product import SupplierProduct
+from .supplier_rating_stats import SupplierRatingStats
 from .user import AmbassadorBuyerAssignment, User
+from . import inventory_expiry, inventory_ledger, search_index  # noqa: E402,F401  (need the models above registered)
 
 __all__ = [
     "AuditLog",
     "AmbassadorBuyerAssignment",
+    "FreshProduceInventoryArchive",
     "FreshProduceInventoryItem",
+    "IdWorkerLease",
+    "IdempotencyKey",
     "InventoryItem",
+    "InventoryItemArchive",
+    "InventoryMovement",
+    "InventorySnapshot",
+    "InventorySnapshotLot",
     "Order",
     "OrderGroup",
     "OrderItem",
@@ -28,12 +41,14 @@ __all__ = [
     "ProcurementOrder",
     "ProcurementOrderReview",
     "ProcurementOrderReviewImage",
+    "ProcurementReviewImageBlob",
     "Region",
     "RegionDefault",
     "Role",
     "RolePermission",
     "Supplier",
     "SupplierProduct",
+    "SupplierRatingStats",
     "User",
     "UserRole",
 ]
@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.extensions import db
+
+
+class IdWorkerLease(db.Model):
+    """A Snowflake worker id held by one live process until ``expires_at``.
+
+    Leased and renewed by ``app.services.id_service``; a lease that has
+    expired may be taken over by another process.
+    """
+
+    __tablename__ = "id_worker_leases"
+
+    worker_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    holder: Mapped[str] = mapped_column(String(64), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
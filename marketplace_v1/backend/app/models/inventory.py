@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 from decimal import Decimal
 
-from sqlalchemy import DateTime, ForeignKey, Numeric
+from sqlalchemy import DateTime, ForeignKey, Index, Numeric, false
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.extensions import db
@@ -9,6 +9,7 @@ from app.extensions import db
 
 class InventoryItem(db.Model):
     __tablename__ = "inventory_items"
+    __table_args__ = (Index("ix_inventory_items_entry_date_id", "entry_date", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     product_id: Mapped[int] = mapped_column(ForeignKey("products.id", ondelete="RESTRICT"), nullable=False)
@@ -27,8 +28,8 @@ class InventoryItem(db.Model):
         ForeignKey("users.id", ondelete="RESTRICT"),
         nullable=False,
     )
-    quantity: Mapped[int] = mapped_column(nullable=False, default=0)
-    reserved_quantity: Mapped[int] = mapped_column(nullable=False, default=0)
+    quantity: Mapped[int] = mapped_column(nullable=False, default=0, active_history=True)
+    reserved_quantity: Mapped[int] = mapped_column(nullable=False, default=0, active_history=True)
     price_per_unit: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False, default=Decimal("0.00"))
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -36,7 +37,11 @@ class InventoryItem(db.Model):
         onupdate=lambda: datetime.now(timezone.utc),
         nullable=False,
     )
+    # updated_at + product.validity_days, maintained by app.models.inventory_expiry.
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    # Set by the expiry sweeper (and on write) once expires_at has passed.
+    is_expired: Mapped[bool] = mapped_column(nullable=False, default=False, server_default=false())
 
     product = relationship("Product", foreign_keys=[product_id], lazy="joined")
-    seller = relationship("User", foreign_keys=[seller_id], lazy="joined")
+    seller = relationship("User", foreign_keys=[seller_id])
     supplier = relationship("Supplier", foreign_keys=[supplier_id], lazy="joined")
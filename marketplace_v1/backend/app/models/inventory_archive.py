@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy import DateTime, Index, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.extensions import db
+
+
+class _ArchivedLot:
+    """Columns of a lot moved out of its live table by the expiry sweeper.
+
+    Ids are kept, so order items and ledger rows still point at the lot. No
+    foreign keys: an archived lot must not block deleting its product or
+    seller.
+    """
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    product_id: Mapped[int] = mapped_column(nullable=False)
+    seller_id: Mapped[int | None] = mapped_column()
+    supplier_id: Mapped[int | None] = mapped_column()
+    origin_type: Mapped[str] = mapped_column(String(20), nullable=False)
+    origin: Mapped[str | None] = mapped_column(String(20))
+    entry_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    created_by_admin_user_id: Mapped[int] = mapped_column(nullable=False)
+    reserved_quantity: Mapped[int] = mapped_column(nullable=False)
+    price_per_unit: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False
+    )
+
+
+class InventoryItemArchive(_ArchivedLot, db.Model):
+    __tablename__ = "inventory_items_archive"
+    __table_args__ = (Index("ix_inventory_items_archive_product_id", "product_id"),)
+
+    quantity: Mapped[int] = mapped_column(nullable=False)
+
+
+class FreshProduceInventoryArchive(_ArchivedLot, db.Model):
+    __tablename__ = "fresh_produce_inventory_archive"
+    __table_args__ = (Index("ix_fresh_produce_inventory_archive_product_id", "product_id"),)
+
+    estimated_quantity: Mapped[int] = mapped_column(nullable=False)
@@ -0,0 +1,67 @@
+"""Keep ``expires_at`` on both inventory tables equal to ``updated_at + validity_days``.
+
+``is_expired`` is refreshed alongside; lots that expire later are flagged by
+the expiry sweeper (``app.services.inventory_expiry_service``).
+
+A product's ``validity_days`` change is not applied here: rewriting every
+lot of the product inside the flush would hold all their row locks until the
+caller commits. Whoever changes it runs
+``app.services.inventory_service.backfill_inventory_expiry(product_id=...)``
+after committing, which updates the lots in short batches.
+
+Expiry used to be derived per row in Python, which forced every listing to
+load the lot and its product before it could decide whether to show it.
+Storing it lets availability filters run as indexed comparisons.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapper, object_session
+from sqlalchemy.orm.base import NO_VALUE
+
+from app.models.fresh_produce_inventory import FreshProduceInventoryItem
+from app.models.inventory import InventoryItem
+from app.models.product import Product
+
+INVENTORY_MODELS = (InventoryItem, FreshProduceInventoryItem)
+
+
+def _validity_days(connection: Connection, target: InventoryItem | FreshProduceInventoryItem) -> int:
+    product = inspect(target).attrs.product.loaded_value
+    if product is not NO_VALUE and product is not None and product.id == target.product_id:
+        return product.validity_days
+    return connection.scalar(select(Product.validity_days).where(Product.id == target.product_id))
+
+
+def _set_expires_at(connection: Connection, target: InventoryItem | FreshProduceInventoryItem) -> None:
+    updated_at = target.updated_at
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    target.expires_at = updated_at + timedelta(days=_validity_days(connection, target))
+    target.is_expired = target.expires_at <= datetime.now(timezone.utc)
+
+
+def _before_insert(mapper: Mapper, connection: Connection, target) -> None:
+    if target.updated_at is None:
+        target.updated_at = datetime.now(timezone.utc)
+    _set_expires_at(connection, target)
+
+
+def _before_update(mapper: Mapper, connection: Connection, target) -> None:
+    session = object_session(target)
+    if session is None or not session.is_modified(target, include_collections=False):
+        return
+    # Stamp updated_at here rather than through the column's onupdate so the
+    # new value is known when expires_at is derived from it.
+    if not inspect(target).attrs.updated_at.history.has_changes():
+        target.updated_at = datetime.now(timezone.utc)
+    _set_expires_at(connection, target)
+
+
+for _model_cls in INVENTORY_MODELS:
+    event.listen(_model_cls, "before_insert", _before_insert)
+    event.listen(_model_cls, "before_update", _before_update)
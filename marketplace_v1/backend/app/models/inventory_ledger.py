@@ -0,0 +1,72 @@
+"""Write an ``inventory_movements`` row for every ORM change to a lot's stock.
+
+Lots created, edited or deleted through the ORM (admin edits, procurement
+pushes) are recorded here, on the flush's own connection, so the movement
+commits or rolls back with the change. Bulk UPDATEs that bypass the ORM
+(reservations, settlement, reconciliation) record their movements through
+``app.services.inventory_ledger_service.record_movements`` instead.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapper
+
+from app.models.fresh_produce_inventory import FreshProduceInventoryItem
+from app.models.inventory import InventoryItem
+from app.models.inventory_movement import InventoryMovement
+
+INVENTORY_KIND_BY_MODEL = {InventoryItem: "regular", FreshProduceInventoryItem: "fresh_produce"}
+STOCK_ATTRIBUTE_BY_MODEL = {InventoryItem: "quantity", FreshProduceInventoryItem: "estimated_quantity"}
+
+
+def _record(connection: Connection, target, movement_type: str, quantity_delta: int, reserved_delta: int) -> None:
+    if not quantity_delta and not reserved_delta:
+        return
+    connection.execute(
+        InventoryMovement.__table__.insert().values(
+            inventory_kind=INVENTORY_KIND_BY_MODEL[type(target)],
+            inventory_item_id=target.id,
+            product_id=target.product_id,
+            movement_type=movement_type,
+            quantity_delta=quantity_delta,
+            reserved_delta=reserved_delta,
+        )
+    )
+
+
+def _delta(target, attribute: str) -> int:
+    history = inspect(target).attrs[attribute].history
+    if not history.has_changes():
+        return 0
+    old = history.deleted[0] if history.deleted else 0
+    new = history.added[0] if history.added else 0
+    return (new or 0) - (old or 0)
+
+
+def _after_insert(mapper: Mapper, connection: Connection, target) -> None:
+    stock = getattr(target, STOCK_ATTRIBUTE_BY_MODEL[type(target)]) or 0
+    movement_type = "procurement" if target.origin_type == "procurement" else "receipt"
+    _record(connection, target, movement_type, stock, target.reserved_quantity or 0)
+
+
+def _after_update(mapper: Mapper, connection: Connection, target) -> None:
+    _record(
+        connection,
+        target,
+        "adjustment",
+        _delta(target, STOCK_ATTRIBUTE_BY_MODEL[type(target)]),
+        _delta(target, "reserved_quantity"),
+    )
+
+
+def _after_delete(mapper: Mapper, connection: Connection, target) -> None:
+    stock = getattr(target, STOCK_ATTRIBUTE_BY_MODEL[type(target)]) or 0
+    _record(connection, target, "removal", -stock, -(target.reserved_quantity or 0))
+
+
+for _model_cls in INVENTORY_KIND_BY_MODEL:
+    event.listen(_model_cls, "after_insert", _after_insert)
+    event.listen(_model_cls, "after_update", _after_update)
+    event.listen(_model_cls, "after_delete", _after_delete)
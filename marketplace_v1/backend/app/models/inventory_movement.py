@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.extensions import db
+
+
+class InventoryMovement(db.Model):
+    """One change to a lot's stock or reservation; rows are never updated."""
+
+    __tablename__ = "inventory_movements"
+    __table_args__ = (
+        Index("ix_inventory_movements_occurred_at_id", "occurred_at", "id"),
+        Index("ix_inventory_movements_lot_occurred_at", "inventory_kind", "inventory_item_id", "occurred_at"),
+        Index("ix_inventory_movements_product_id_occurred_at", "product_id", "occurred_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    # No foreign keys: the ledger outlives deleted lots and products.
+    inventory_kind: Mapped[str] = mapped_column(String(20), nullable=False)
+    inventory_item_id: Mapped[int] = mapped_column(nullable=False)
+    product_id: Mapped[int] = mapped_column(nullable=False)
+    movement_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    quantity_delta: Mapped[int] = mapped_column(nullable=False, default=0)
+    reserved_delta: Mapped[int] = mapped_column(nullable=False, default=0)
+    occurred_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False
+    )
+
+
+class InventorySnapshot(db.Model):
+    """Stock of every lot as of ``as_of``, compacted from the previous snapshot."""
+
+    __tablename__ = "inventory_snapshots"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    as_of: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, unique=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False
+    )
+
+
+class InventorySnapshotLot(db.Model):
+    __tablename__ = "inventory_snapshot_lots"
+    __table_args__ = (
+        Index("ix_inventory_snapshot_lots_snapshot_id_product_id", "snapshot_id", "product_id"),
+    )
+
+    snapshot_id: Mapped[int] = mapped_column(
+        ForeignKey("inventory_snapshots.id", ondelete="CASCADE"), primary_key=True
+    )
+    inventory_kind: Mapped[str] = mapped_column(String(20), primary_key=True)
+    inventory_item_id: Mapped[int] = mapped_column(primary_key=True)
+    product_id: Mapped[int] = mapped_column(nullable=False)
+    quantity: Mapped[int] = mapped_column(nullable=False)
+    reserved_quantity: Mapped[int] = mapped_column(nullable=False)
@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 from decimal import Decimal
 
-from sqlalchemy import DateTime, ForeignKey, Numeric, String
+from sqlalchemy import DateTime, ForeignKey, Index, Numeric, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.extensions import db
@@ -19,12 +19,27 @@ class OrderGroup(db.Model):
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False
     )
 
-    buyer: Mapped["User"] = relationship(foreign_keys=[buyer_id], lazy="joined")
+    buyer: Mapped["User"] = relationship(foreign_keys=[buyer_id])
     orders: Mapped[list["Order"]] = relationship(back_populates="order_group", lazy="selectin")
 
 
 class Order(db.Model):
     __tablename__ = "orders"
+    # Newest-first order search: one index per way a listing is scoped.
+    __table_args__ = (
+        Index("ix_orders_buyer_id_created_at_id", "buyer_id", "created_at", "id"),
+        Index("ix_orders_seller_id_created_at_id", "seller_id", "created_at", "id"),
+        Index("ix_orders_supplier_id_created_at_id", "supplier_id", "created_at", "id"),
+        Index("ix_orders_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_orders_created_at_id", "created_at", "id"),
+        # Reservation sweeper: only unconfirmed orders hold an expiring reservation.
+        Index(
+            "ix_orders_created_reservation_expires_at",
+            "reservation_expires_at",
+            postgresql_where=text("status = 'created'"),
+            sqlite_where=text("status = 'created'"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     order_number: Mapped[str] = mapped_column(String(64), unique=True, nullable=False, index=True)
@@ -51,6 +66,9 @@ class Order(db.Model):
         onupdate=lambda: datetime.now(timezone.utc),
         nullable=False,
     )
+    # While still "created", the order's inventory reservation lapses at this
+    # time and the order is cancelled by expire_stale_orders.
+    reservation_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     buyer: Mapped["User"] = relationship(foreign_keys=[buyer_id], back_populates="buyer_orders")
     order_group: Mapped["OrderGroup | None"] = relationship(back_populates="orders")
@@ -63,6 +81,11 @@ class Order(db.Model):
 
 class OrderItem(db.Model):
     __tablename__ = "order_items"
+    __table_args__ = (
+        Index("ix_order_items_order_id", "order_id"),
+        Index("ix_order_items_product_id_order_id", "product_id", "order_id"),
+        Index("ix_order_items_sku_order_id", "sku", "order_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     order_id: Mapped[int] = mapped_column(ForeignKey("orders.id", ondelete="CASCADE"), nullable=False)
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.extensions import db
@@ -10,6 +10,14 @@ class ProcurementOrderReview(db.Model):
     __tablename__ = "procurement_order_reviews"
     __table_args__ = (
         UniqueConstraint("procurement_id", name="uq_procurement_review_per_order"),
+        # Supplier review feed: best rated, then newest first.
+        Index(
+            "ix_procurement_order_reviews_supplier_rating_created_at",
+            "supplier_id",
+            "rating",
+            "created_at",
+            "review_id",
+        ),
     )
 
     review_id: Mapped[int] = mapped_column(primary_key=True)
@@ -47,6 +55,38 @@ class ProcurementOrderReviewImage(db.Model):
         nullable=False,
     )
     file_path: Mapped[str] = mapped_column(db.String(500), nullable=False)
+    # Null for uploads stored before content addressing, until
+    # ``flask maintenance dedupe-review-images`` moves them into the blob store.
+    content_sha256: Mapped[str | None] = mapped_column(
+        db.String(64),
+        ForeignKey("procurement_review_image_blobs.sha256", ondelete="RESTRICT"),
+        index=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+
+class ProcurementReviewImageBlob(db.Model):
+    """One stored image file, shared by every review image with its digest."""
+
+    __tablename__ = "procurement_review_image_blobs"
+
+    sha256: Mapped[str] = mapped_column(db.String(64), primary_key=True)
+    file_path: Mapped[str] = mapped_column(db.String(500), nullable=False)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    # Review images pointing at this blob; the file is deleted at zero.
+    ref_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    # Thumbnail/WebP derivatives: pending -> rendering -> ready | failed.
+    # Pending blobs are the work queue of ``flask maintenance
+    # generate-review-image-derivatives``, which claims them as rendering.
+    derivatives_status: Mapped[str] = mapped_column(
+        db.String(16), nullable=False, default="pending", server_default="pending", index=True
+    )
+    derivatives_claimed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    derivatives_attempts: Mapped[int] = mapped_column(nullable=False, default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
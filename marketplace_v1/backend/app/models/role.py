@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, String, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.extensions import db
@@ -6,7 +6,10 @@ from app.extensions import db
 
 class UserRole(db.Model):
     __tablename__ = "user_roles"
-    __table_args__ = (UniqueConstraint("user_id", "role_id", name="uq_user_roles_user_role"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "role_id", name="uq_user_roles_user_role"),
+        Index("ix_user_roles_role_id_user_id", "role_id", "user_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -30,8 +33,10 @@ class Role(db.Model):
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
 
+    # Every holder of the role; loading it eagerly pulled all buyers into
+    # memory whenever one user's roles were read.
     users: Mapped[list["User"]] = relationship(
-        secondary="user_roles", back_populates="roles", lazy="selectin"
+        secondary="user_roles", back_populates="roles", lazy="raise"
     )
     permissions: Mapped[list["Permission"]] = relationship(
         secondary="role_permissions", back_populates="roles", lazy="selectin"
@@ -0,0 +1,75 @@
+"""Name-search indexes for the tables behind catalog and admin lookups.
+
+PostgreSQL gets ``pg_trgm`` GIN indexes, which serve ``ILIKE '%term%'``
+without a sequential scan. SQLite (tests, local runs) gets external-content
+FTS5 tables with the trigram tokenizer, kept in sync by triggers.
+"""
+
+from sqlalchemy import DDL, event
+
+from app.extensions import db
+
+# table name -> (primary key column, searchable columns)
+SEARCH_INDEXED_COLUMNS: dict[str, tuple[str, tuple[str, ...]]] = {
+    "products": ("id", ("product_name",)),
+    "users": ("id", ("email", "first_name", "last_name")),
+    "suppliers": ("supplier_id", ("supplier_name",)),
+}
+
+
+def fts_table_name(table_name: str) -> str:
+    return f"{table_name}_fts"
+
+
+def trigram_index_name(table_name: str, column_name: str) -> str:
+    return f"ix_{table_name}_{column_name}_trgm"
+
+
+def postgresql_search_ddl(table_name: str) -> list[str]:
+    _, columns = SEARCH_INDEXED_COLUMNS[table_name]
+    return [
+        f"CREATE INDEX IF NOT EXISTS {trigram_index_name(table_name, column)} "
+        f"ON {table_name} USING gin ({column} gin_trgm_ops)"
+        for column in columns
+    ]
+
+
+def sqlite_search_ddl(table_name: str) -> list[str]:
+    pk, columns = SEARCH_INDEXED_COLUMNS[table_name]
+    fts = fts_table_name(table_name)
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{column_list}, content='{table_name}', content_rowid='{pk}', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table_name} BEGIN "
+        f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.{pk}, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table_name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.{pk}, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column_list} ON {table_name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.{pk}, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.{pk}, {new_values}); END",
+    ]
+
+
+def _register_create_all_hooks() -> None:
+    event.listen(
+        db.metadata,
+        "before_create",
+        DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+    )
+    for table_name in SEARCH_INDEXED_COLUMNS:
+        table = db.metadata.tables[table_name]
+        for statement in postgresql_search_ddl(table_name):
+            event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+        for statement in sqlite_search_ddl(table_name):
+            event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+        event.listen(
+            table,
+            "after_drop",
+            DDL(f"DROP TABLE IF EXISTS {fts_table_name(table_name)}").execute_if(dialect="sqlite"),
+        )
+
+
+_register_create_all_hooks()
@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.extensions import db
+
+RATING_VALUES = range(1, 11)
+
+
+class SupplierRatingStats(db.Model):
+    """Running totals of a supplier's procurement review ratings.
+
+    Maintained with each review write by
+    ``app.services.supplier_rating_service``, so supplier screens read one
+    row instead of aggregating every review.
+    """
+
+    __tablename__ = "supplier_rating_stats"
+
+    supplier_id: Mapped[int] = mapped_column(
+        ForeignKey("suppliers.supplier_id", ondelete="CASCADE"), primary_key=True
+    )
+    rating_sum: Mapped[int] = mapped_column(nullable=False, default=0)
+    rating_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    # Histogram: reviews per rating value.
+    rating_1_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    rating_2_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    rating_3_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    rating_4_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    rating_5_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    rating_6_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    rating_7_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    rating_8_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    rating_9_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    rating_10_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+    @property
+    def overall_rating(self) -> float | None:
+        return round(self.rating_sum / self.rating_count, 2) if self.rating_count else None
+
+    def breakdown(self) -> list[dict[str, int]]:
+        """Non-empty histogram buckets, highest rating first."""
+        counts = ((rating, getattr(self, f"rating_{rating}_count")) for rating in reversed(RATING_VALUES))
+        return [{"rating": rating, "orders": count} for rating, count in counts if count]
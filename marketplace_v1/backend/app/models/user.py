@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, UniqueConstraint
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.extensions import db
@@ -45,14 +45,30 @@ class User(db.Model):
         secondary="user_roles", back_populates="users", lazy="selectin"
     )
 
+    # Order history grows without bound; query Order directly instead.
     buyer_orders: Mapped[list["Order"]] = relationship(
-        foreign_keys="Order.buyer_id", back_populates="buyer", lazy="selectin"
+        foreign_keys="Order.buyer_id", back_populates="buyer", lazy="raise"
     )
     seller_orders: Mapped[list["Order"]] = relationship(
-        foreign_keys="Order.seller_id", back_populates="seller", lazy="selectin"
+        foreign_keys="Order.seller_id", back_populates="seller", lazy="raise"
     )
 
 
+# Prefix search on email and names (admin user list). varchar_pattern_ops lets
+# PostgreSQL serve LIKE 'term%' from a btree regardless of collation.
+Index("ix_users_email_prefix", User.email, postgresql_ops={"email": "varchar_pattern_ops"})
+Index(
+    "ix_users_first_name_prefix",
+    func.lower(User.first_name).label("first_name_lower"),
+    postgresql_ops={"first_name_lower": "varchar_pattern_ops"},
+)
+Index(
+    "ix_users_last_name_prefix",
+    func.lower(User.last_name).label("last_name_lower"),
+    postgresql_ops={"last_name_lower": "varchar_pattern_ops"},
+)
+
+
 from .order import Order  # noqa: E402
 from .role import Role  # noqa: E402
 
@@ -1,19 +1,20 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, exists, func, or_, select, text
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import selectinload
 
 from app.extensions import db
-from app.models import AmbassadorBuyerAssignment, Role, User
+from app.models import AmbassadorBuyerAssignment, Role, User, UserRole
 from app.security.password import hash_password, verify_password
+from app.services.load_plans import USER_WITH_PERMISSIONS, USER_WITH_ROLES
+from app.utils.pagination import DEFAULT_TOTAL_CAP, Page, capped_count, paginate
 
 
 def find_user_by_email(email: str) -> User | None:
     stmt = (
         select(User)
         .where(User.email == email.lower().strip())
-        .options(selectinload(User.roles).selectinload(Role.permissions))
+        .options(*USER_WITH_PERMISSIONS)
     )
     return db.session.execute(stmt).scalar_one_or_none()
 
@@ -22,7 +23,7 @@ def find_user_by_id(user_id: int) -> User | None:
     stmt = (
         select(User)
         .where(User.id == user_id)
-        .options(selectinload(User.roles).selectinload(Role.permissions))
+        .options(*USER_WITH_PERMISSIONS)
     )
     return db.session.execute(stmt).scalar_one_or_none()
 
@@ -97,11 +98,88 @@ def assign_roles_to_user(user: User, roles: list[Role]) -> User:
     return user
 
 
-def list_users() -> list[User]:
-    stmt = select(User).options(selectinload(User.roles))
+def _user_criteria(roles: list[str] | None, search: str | None) -> list[ColumnElement[bool]]:
+    criteria: list[ColumnElement[bool]] = []
+    if roles:
+        criteria.append(
+            exists().where(
+                UserRole.user_id == User.id,
+                UserRole.role_id == Role.id,
+                Role.name.in_(roles),
+            )
+        )
+    if search:
+        prefix = search.strip().lower()
+        criteria.append(
+            or_(
+                User.email.startswith(prefix, autoescape=True),
+                func.lower(User.first_name).startswith(prefix, autoescape=True),
+                func.lower(User.last_name).startswith(prefix, autoescape=True),
+            )
+        )
+    return criteria
+
+
+def list_users(*, roles: list[str] | None = None, search: str | None = None) -> list[User]:
+    stmt = (
+        select(User)
+        .where(*_user_criteria(roles, search))
+        .options(*USER_WITH_ROLES)
+        .order_by(User.id.asc())
+    )
     return list(db.session.execute(stmt).scalars().all())
 
 
+def list_users_page(
+    *,
+    roles: list[str] | None = None,
+    search: str | None = None,
+    page_size: int,
+    page: int = 1,
+    cursor: str | None = None,
+) -> Page[User]:
+    """Return one page of users in id order, with a capped total.
+
+    ``roles`` matches users holding any of the named roles (an EXISTS on
+    ``user_roles``); ``search`` is a case-insensitive prefix of the email,
+    first name or last name.
+    """
+    stmt = select(User).where(*_user_criteria(roles, search)).options(*USER_WITH_ROLES)
+    result = paginate(
+        stmt,
+        scope="admin.users",
+        sort=[User.id],
+        descending=False,
+        page_size=page_size,
+        page=page,
+        cursor=cursor,
+    )
+    result.total, result.total_is_exact = count_users(roles=roles, search=search)
+    return result
+
+
+def count_users(
+    *,
+    roles: list[str] | None = None,
+    search: str | None = None,
+    cap: int = DEFAULT_TOTAL_CAP,
+) -> tuple[int, bool]:
+    """Return ``(total, is_exact)`` without scanning the whole table.
+
+    Counts at most ``cap + 1`` matching ids. Past the cap an unfiltered
+    count on PostgreSQL falls back to the planner's row estimate; filtered
+    counts report ``cap`` as a lower bound.
+    """
+    criteria = _user_criteria(roles, search)
+    total, is_exact = capped_count(select(User.id).where(*criteria), cap)
+    if is_exact or criteria or db.session.get_bind().dialect.name != "postgresql":
+        return total, is_exact
+    estimate = db.session.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'users'::regclass")
+    ).scalar()
+    return max(int(estimate or 0), cap), False
+
+
 def update_user_profile(user: User, updates: dict[str, str | None]) -> User:
     for field, value in updates.items():
         setattr(user, field, value)
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import Row, and_, exists, func, literal, or_, select, union_all
+
+from app.extensions import db
+from app.models import FreshProduceInventoryItem, InventoryItem, Product, Role, Supplier, User, UserRole
+from app.services.search_service import text_search
+
+
+def _inventory_lots(model_cls: type[InventoryItem] | type[FreshProduceInventoryItem], inventory_kind: str):
+    stock = model_cls.quantity if model_cls is InventoryItem else model_cls.estimated_quantity
+    return select(
+        literal(inventory_kind).label("inventory_kind"),
+        model_cls.id.label("inventory_item_id"),
+        model_cls.product_id.label("product_id"),
+        model_cls.seller_id.label("seller_id"),
+        model_cls.supplier_id.label("supplier_id"),
+        (stock - model_cls.reserved_quantity).label("available_quantity"),
+        model_cls.price_per_unit.label("price_per_unit"),
+        model_cls.expires_at.label("expires_at"),
+    )
+
+
+def search_catalog(
+    *,
+    product_type: str = "",
+    product_name: str = "",
+    seller_name: str = "",
+    supplier_name: str = "",
+    limit: int,
+    offset: int = 0,
+) -> list[Row]:
+    """Return one page of orderable catalog rows from both inventory tables.
+
+    Both tables are combined with UNION ALL; availability, expiry, the
+    orderable-source flag, ordering and LIMIT/OFFSET all run in the database,
+    so a page is never underfilled by rows discarded afterwards. Name filters
+    go through the indexed text search and rank product-name matches first.
+    """
+    lots = union_all(
+        _inventory_lots(InventoryItem, "regular"),
+        _inventory_lots(FreshProduceInventoryItem, "fresh_produce"),
+    ).subquery("lots")
+
+    seller_has_role = exists().where(
+        UserRole.user_id == User.id,
+        UserRole.role_id == Role.id,
+        Role.name == "seller",
+    )
+    can_order = or_(
+        and_(User.seller_status == "valid", seller_has_role),
+        Supplier.is_active.is_(True),
+    )
+
+    stmt = (
+        select(
+            lots.c.inventory_kind,
+            lots.c.inventory_item_id,
+            lots.c.available_quantity,
+            lots.c.price_per_unit,
+            Product.id.label("product_id"),
+            Product.product_name,
+            Product.product_type,
+            Product.product_unit,
+            User.id.label("seller_id"),
+            User.email.label("seller_email"),
+            User.first_name.label("seller_first_name"),
+            User.last_name.label("seller_last_name"),
+            Supplier.supplier_id,
+            Supplier.supplier_name,
+            func.coalesce(can_order, False).label("can_order"),
+        )
+        .join(Product, Product.id == lots.c.product_id)
+        .outerjoin(User, User.id == lots.c.seller_id)
+        .outerjoin(Supplier, Supplier.supplier_id == lots.c.supplier_id)
+        .where(
+            lots.c.available_quantity > 0,
+            lots.c.expires_at > datetime.now(timezone.utc),
+        )
+    )
+    ordering = []
+    if product_type:
+        stmt = stmt.where(Product.product_type.ilike(f"%{product_type}%"))
+    if product_name:
+        product_match, product_relevance = text_search("products", product_name)
+        stmt = stmt.where(product_match)
+        ordering.append(product_relevance.desc())
+    if seller_name:
+        stmt = stmt.where(text_search("users", seller_name)[0])
+    if supplier_name:
+        stmt = stmt.where(text_search("suppliers", supplier_name)[0])
+
+    stmt = (
+        stmt.order_by(
+            *ordering,
+            func.lower(Product.product_name).asc(),
+            lots.c.available_quantity.desc(),
+            lots.c.inventory_kind.asc(),
+            lots.c.inventory_item_id.asc(),
+        )
+        .limit(limit)
+        .offset(offset)
+    )
+    return list(db.session.execute(stmt).all())
@@ -0,0 +1,224 @@
+"""Streaming exports of orders, inventory and procurement orders.
+
+Rows are read with ``yield_per`` (a server-side cursor on PostgreSQL), so
+only one batch is held in memory however large the export is, and are
+rendered one line at a time for a streamed response. Every export walks its
+tables in primary-key order; a client that loses the connection resumes with
+the key of the last complete record it received (``after``).
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any
+
+from flask import current_app
+from sqlalchemy import Select, or_, select
+from sqlalchemy.orm import aliased
+
+from app.extensions import db
+from app.models import InventoryItem, Order, OrderItem, ProcurementOrder
+from app.services.inventory_service import INVENTORY_KINDS, InventoryFilters, filtered_lots
+from app.services.order_search_service import OrderSearchFilters, order_criteria
+
+DEFAULT_BATCH_SIZE = 1000
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+ORDER_EXPORT_FIELDS = (
+    "id",
+    "order_number",
+    "order_group_id",
+    "buyer_id",
+    "seller_id",
+    "supplier_id",
+    "status",
+    "total_amount",
+    "currency",
+    "created_at",
+    "updated_at",
+)
+ORDER_ITEM_EXPORT_FIELDS = (
+    "item_id",
+    "product_id",
+    "inventory_kind",
+    "source_inventory_item_id",
+    "sku",
+    "name",
+    "qty",
+    "unit_price",
+)
+INVENTORY_EXPORT_FIELDS = (
+    "inventory_kind",
+    "id",
+    "product_id",
+    "seller_id",
+    "supplier_id",
+    "origin_type",
+    "origin",
+    "entry_date",
+    "quantity",
+    "reserved_quantity",
+    "price_per_unit",
+    "updated_at",
+    "expires_at",
+)
+PROCUREMENT_EXPORT_FIELDS = (
+    "procurement_id",
+    "supplier_id",
+    "product_id",
+    "quantity",
+    "price_per_unit",
+    "procurement_date",
+    "status",
+    "pushed_to_inventory",
+    "created_by_admin_user_id",
+    "updated_at",
+)
+
+
+def export_batch_size() -> int:
+    return int(current_app.config.get("EXPORT_BATCH_SIZE", DEFAULT_BATCH_SIZE))
+
+
+def parse_inventory_after(raw: str) -> tuple[str, int]:
+    """Parse an inventory resume key ``<inventory_kind>:<id>``."""
+    kind, _, lot_id = raw.partition(":")
+    if kind not in dict(INVENTORY_KINDS) or not lot_id.isdigit():
+        raise ValueError(raw)
+    return kind, int(lot_id)
+
+
+def _stream(stmt: Select, batch_size: int) -> Iterator[dict[str, Any]]:
+    result = db.session.execute(stmt.execution_options(yield_per=batch_size))
+    try:
+        for row in result:
+            yield row._asdict()
+    finally:
+        result.close()
+
+
+def iter_order_item_rows(
+    filters: OrderSearchFilters,
+    *,
+    participant_id: int | None = None,
+    after_id: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[dict[str, Any]]:
+    """One flat row per order item, with the order's columns repeated.
+
+    Orders without items still produce one row, with empty item columns.
+    ``participant_id`` restricts the export to orders the user bought or sold.
+    """
+    # Aliased so the item filters' EXISTS subqueries don't correlate to the join.
+    item = aliased(OrderItem)
+    stmt = (
+        select(
+            *[getattr(Order, name) for name in ORDER_EXPORT_FIELDS],
+            item.id.label("item_id"),
+            *[getattr(item, name) for name in ORDER_ITEM_EXPORT_FIELDS[1:]],
+        )
+        .outerjoin(item, item.order_id == Order.id)
+        .where(*order_criteria(filters))
+        .order_by(Order.id, item.id)
+    )
+    if participant_id is not None:
+        stmt = stmt.where(or_(Order.buyer_id == participant_id, Order.seller_id == participant_id))
+    if after_id is not None:
+        stmt = stmt.where(Order.id > after_id)
+    return _stream(stmt, batch_size)
+
+
+def group_order_rows(rows: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    """Fold consecutive rows of :func:`iter_order_item_rows` into one record
+    per order with an ``items`` list."""
+    current: dict[str, Any] | None = None
+    for row in rows:
+        if current is None or current["id"] != row["id"]:
+            if current is not None:
+                yield current
+            current = {name: row[name] for name in ORDER_EXPORT_FIELDS}
+            current["items"] = []
+        if row["item_id"] is not None:
+            current["items"].append({name: row[name] for name in ORDER_ITEM_EXPORT_FIELDS})
+    if current is not None:
+        yield current
+
+
+def iter_inventory_rows(
+    filters: InventoryFilters,
+    *,
+    after: tuple[str, int] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[dict[str, Any]]:
+    """Lots of both inventory tables, one table after the other in id order.
+
+    ``after`` is the ``(inventory_kind, id)`` of the last lot received; tables
+    before its kind are skipped entirely.
+    """
+    now = datetime.now(timezone.utc)
+    kinds = [kind for kind, _ in INVENTORY_KINDS]
+    start = kinds.index(after[0]) if after is not None else 0
+    for kind, model_cls in INVENTORY_KINDS[start:]:
+        stock = model_cls.quantity if model_cls is InventoryItem else model_cls.estimated_quantity
+        columns = tuple(
+            stock.label("quantity") if name == "quantity" else getattr(model_cls, name)
+            for name in INVENTORY_EXPORT_FIELDS[1:]
+        )
+        stmt = filtered_lots(kind, model_cls, filters, now, columns).order_by(model_cls.id)
+        if after is not None and kind == after[0]:
+            stmt = stmt.where(model_cls.id > after[1])
+        yield from _stream(stmt, batch_size)
+
+
+def iter_procurement_rows(
+    *,
+    supplier_id: int | None = None,
+    product_id: int | None = None,
+    status: str | None = None,
+    after_id: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[dict[str, Any]]:
+    """Procurement orders in ``procurement_id`` order."""
+    stmt = select(*[getattr(ProcurementOrder, name) for name in PROCUREMENT_EXPORT_FIELDS]).order_by(
+        ProcurementOrder.procurement_id
+    )
+    if supplier_id is not None:
+        stmt = stmt.where(ProcurementOrder.supplier_id == supplier_id)
+    if product_id is not None:
+        stmt = stmt.where(ProcurementOrder.product_id == product_id)
+    if status:
+        stmt = stmt.where(ProcurementOrder.status == status)
+    if after_id is not None:
+        stmt = stmt.where(ProcurementOrder.procurement_id > after_id)
+    return _stream(stmt, batch_size)
+
+
+def _export_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def render_ndjson(records: Iterable[dict[str, Any]]) -> Iterator[str]:
+    for record in records:
+        yield json.dumps(record, default=_export_value, separators=(",", ":")) + "\n"
+
+
+def render_csv(rows: Iterable[dict[str, Any]], fieldnames: Iterable[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(fieldnames), extrasaction="ignore")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({name: _export_value(value) for name, value in row.items()})
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.extensions import db
+from app.models import IdWorkerLease
+
+# Layout of the 63-bit ids, most significant first:
+#   41 bits  milliseconds since ID_EPOCH_MS (~69 years)
+#   15 bits  worker id, leased from id_worker_leases by each process
+#    7 bits  per-millisecond sequence (128 ids/ms per process)
+ID_EPOCH_MS = 1767225600000  # 2026-01-01T00:00:00Z
+WORKER_BITS = 15
+SEQUENCE_BITS = 7
+
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+_SEQUENCE_MASK = (1 << SEQUENCE_BITS) - 1
+_WORKER_SHIFT = SEQUENCE_BITS
+_TIMESTAMP_SHIFT = SEQUENCE_BITS + WORKER_BITS
+
+# A process renews its lease once half of it has run out and stops issuing
+# ids if the lease could not be renewed before it expired. Other processes
+# take an expired lease over only after a further grace period, which covers
+# clock skew between hosts.
+WORKER_LEASE_SECONDS = 10 * 60
+WORKER_LEASE_GRACE_SECONDS = 60
+
+
+class WorkerIdUnavailableError(RuntimeError):
+    """No worker id could be leased, so no ids can be issued."""
+
+
+class SnowflakeIdGenerator:
+    """Time-ordered 63-bit id generator that needs no database round trip.
+
+    Ids are unique as long as no two live processes use the same
+    ``worker_id``; :func:`next_id` guarantees that by leasing one per process.
+    """
+
+    def __init__(self, worker_id: int) -> None:
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"worker_id must be between 0 and {MAX_WORKER_ID}")
+        self.worker_id = worker_id
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._sequence = 0
+
+    def next_id(self) -> int:
+        with self._lock:
+            now_ms = max(_current_ms(), self._last_ms)  # never step backwards with the wall clock
+            if now_ms == self._last_ms:
+                self._sequence = (self._sequence + 1) & _SEQUENCE_MASK
+                if self._sequence == 0:
+                    while now_ms <= self._last_ms:
+                        now_ms = _current_ms()
+            else:
+                self._sequence = 0
+            self._last_ms = now_ms
+            return (
+                ((now_ms - ID_EPOCH_MS) << _TIMESTAMP_SHIFT)
+                | (self.worker_id << _WORKER_SHIFT)
+                | self._sequence
+            )
+
+
+@dataclass
+class WorkerLease:
+    worker_id: int
+    holder: str
+    # time.monotonic() deadlines, immune to wall clock jumps.
+    renew_at: float
+    valid_until: float
+
+
+def lease_worker_id(holder: str) -> WorkerLease:
+    """Lease the lowest free worker id for ``holder``.
+
+    Runs on its own connection and commits at once, so a lease never waits
+    for (or rolls back with) the caller's transaction.
+    """
+    started = time.monotonic()
+    for _ in range(MAX_WORKER_ID + 1):
+        now = datetime.now(timezone.utc)
+        expired_before = now - timedelta(seconds=WORKER_LEASE_GRACE_SECONDS)
+        with db.engine.begin() as connection:
+            reclaimable = connection.execute(
+                select(IdWorkerLease.worker_id)
+                .where(IdWorkerLease.expires_at < expired_before)
+                .order_by(IdWorkerLease.worker_id)
+                .limit(1)
+            ).scalar_one_or_none()
+            if reclaimable is not None:
+                # Conditional, so of two processes reclaiming the same id one wins.
+                claimed = connection.execute(
+                    update(IdWorkerLease)
+                    .where(IdWorkerLease.worker_id == reclaimable, IdWorkerLease.expires_at < expired_before)
+                    .values(holder=holder, expires_at=now + timedelta(seconds=WORKER_LEASE_SECONDS))
+                ).rowcount
+                if claimed:
+                    return _lease(reclaimable, holder, started)
+                continue
+            worker_id = connection.execute(
+                select(func.coalesce(func.max(IdWorkerLease.worker_id) + 1, 0))
+            ).scalar_one()
+            if worker_id > MAX_WORKER_ID:
+                raise WorkerIdUnavailableError(f"all {MAX_WORKER_ID + 1} worker ids are leased")
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(
+                    insert(IdWorkerLease).values(
+                        worker_id=worker_id,
+                        holder=holder,
+                        expires_at=now + timedelta(seconds=WORKER_LEASE_SECONDS),
+                    )
+                )
+        except IntegrityError:
+            continue  # another process took this id first
+        return _lease(worker_id, holder, started)
+    raise WorkerIdUnavailableError("could not lease a worker id")
+
+
+def renew_worker_lease(lease: WorkerLease) -> bool:
+    """Extend ``lease``; ``False`` if it has been lost to another process."""
+    started = time.monotonic()
+    with db.engine.begin() as connection:
+        renewed = connection.execute(
+            update(IdWorkerLease)
+            .where(IdWorkerLease.worker_id == lease.worker_id, IdWorkerLease.holder == lease.holder)
+            .values(expires_at=datetime.now(timezone.utc) + timedelta(seconds=WORKER_LEASE_SECONDS))
+        ).rowcount
+    if not renewed:
+        return False
+    renewed_lease = _lease(lease.worker_id, lease.holder, started)
+    lease.renew_at, lease.valid_until = renewed_lease.renew_at, renewed_lease.valid_until
+    return True
+
+
+def _lease(worker_id: int, holder: str, started: float) -> WorkerLease:
+    # Measured from before the database call: the row may say later.
+    return WorkerLease(
+        worker_id=worker_id,
+        holder=holder,
+        renew_at=started + WORKER_LEASE_SECONDS / 2,
+        valid_until=started + WORKER_LEASE_SECONDS,
+    )
+
+
+_generator: SnowflakeIdGenerator | None = None
+_lease_state: WorkerLease | None = None
+_generator_pid: int | None = None
+_generator_lock = threading.Lock()
+
+
+def next_id() -> int:
+    return _process_generator().next_id()
+
+
+def next_order_number() -> str:
+    return f"ORD-{next_id()}"
+
+
+def next_group_number() -> str:
+    return f"GRP-{next_id()}"
+
+
+def _process_generator() -> SnowflakeIdGenerator:
+    global _generator, _lease_state, _generator_pid
+
+    pid = os.getpid()
+    if _generator is not None and _generator_pid == pid and time.monotonic() < _lease_state.renew_at:
+        return _generator
+    with _generator_lock:
+        # Re-lease after fork so preloaded gunicorn workers do not share the
+        # master's worker id.
+        if _generator is None or _generator_pid != pid:
+            _lease_state = lease_worker_id(f"{uuid.uuid4().hex}:{pid}")
+            _generator = SnowflakeIdGenerator(_lease_state.worker_id)
+            _generator_pid = pid
+        elif time.monotonic() >= _lease_state.renew_at:
+            try:
+                renewed = renew_worker_lease(_lease_state)
+            except SQLAlchemyError:
+                # Keep issuing on a lease that still holds; past it, fail.
+                if time.monotonic() >= _lease_state.valid_until:
+                    raise
+                return _generator
+            if not renewed:
+                _lease_state = lease_worker_id(_lease_state.holder)
+                _generator = SnowflakeIdGenerator(_lease_state.worker_id)
+        return _generator
+
+
+def _current_ms() -> int:
+    return time.time_ns() // 1_000_000
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from flask import current_app
+from sqlalchemy import delete, event, select
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_CACHE_SIZE = 2048
+_PENDING_INFO_KEY = "idempotency_pending_responses"
+
+
+class IdempotencyKeyReusedError(Exception):
+    """Raised when a key is replayed with a different request body."""
+
+
+class _ReplayCache:
+    """Small thread-safe LRU of recent responses, keyed by ``(user_id, key)``."""
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[tuple[int, str], tuple[str, int, dict[str, Any], datetime]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cache_key: tuple[int, str]) -> tuple[str, int, dict[str, Any], datetime] | None:
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                return None
+            if entry[3] <= datetime.now(timezone.utc):
+                del self._entries[cache_key]
+                return None
+            self._entries.move_to_end(cache_key)
+            return entry
+
+    def put(
+        self,
+        cache_key: tuple[int, str],
+        entry: tuple[str, int, dict[str, Any], datetime],
+        *,
+        capacity: int,
+    ) -> None:
+        with self._lock:
+            self._entries[cache_key] = entry
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_replay_cache = _ReplayCache()
+
+
+def request_fingerprint(method: str, path: str, payload: object) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{method.upper()} {path}\n{canonical}".encode("utf-8")).hexdigest()
+
+
+def find_replay(user_id: int, idempotency_key: str, fingerprint: str) -> tuple[dict[str, Any], int] | None:
+    """Return the stored ``(body, status)`` for a key, or ``None`` on a miss.
+
+    Checks the in-process LRU first and falls back to the ``idempotency_keys``
+    table. Raises ``IdempotencyKeyReusedError`` if the key was first used for
+    a different request.
+    """
+    cache_key = (user_id, idempotency_key)
+    entry = _replay_cache.get(cache_key)
+    if entry is None:
+        row = db.session.execute(
+            select(IdempotencyKey).where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.idempotency_key == idempotency_key,
+            )
+        ).scalar_one_or_none()
+        if row is None:
+            return None
+        expires_at = _as_utc(row.expires_at)
+        if expires_at <= datetime.now(timezone.utc):
+            # Drop the stale key now so it can be recorded again by this request.
+            db.session.delete(row)
+            db.session.flush()
+            return None
+        entry = (row.request_fingerprint, row.response_status, row.response_body, expires_at)
+        _replay_cache.put(cache_key, entry, capacity=_cache_capacity())
+
+    stored_fingerprint, status, body, _ = entry
+    if stored_fingerprint != fingerprint:
+        raise IdempotencyKeyReusedError(idempotency_key)
+    return body, status
+
+
+def record_response(
+    user_id: int,
+    idempotency_key: str,
+    fingerprint: str,
+    body: dict[str, Any],
+    status: int,
+) -> None:
+    """Stage the response in the caller's transaction.
+
+    The row is committed together with the work it describes, so a concurrent
+    duplicate loses on the unique constraint instead of repeating the work.
+    The LRU is only warmed once that transaction actually commits.
+    """
+    ttl_seconds = int(current_app.config.get("IDEMPOTENCY_KEY_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
+    session = db.session()
+    session.add(
+        IdempotencyKey(
+            user_id=user_id,
+            idempotency_key=idempotency_key,
+            request_fingerprint=fingerprint,
+            response_status=status,
+            response_body=body,
+            expires_at=expires_at,
+        )
+    )
+    session.info.setdefault(_PENDING_INFO_KEY, []).append(
+        ((user_id, idempotency_key), (fingerprint, status, body, expires_at), _cache_capacity())
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _cache_committed_responses(session: Session) -> None:
+    for cache_key, entry, capacity in session.info.pop(_PENDING_INFO_KEY, []):
+        _replay_cache.put(cache_key, entry, capacity=capacity)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_uncommitted_responses(session: Session) -> None:
+    session.info.pop(_PENDING_INFO_KEY, None)
+
+
+def clear_replay_cache() -> None:
+    _replay_cache.clear()
+
+
+def purge_expired_idempotency_keys(*, batch_size: int = 1000) -> int:
+    """Delete expired keys in batches of ``batch_size``, committing each batch."""
+    deleted = 0
+    while True:
+        now = datetime.now(timezone.utc)
+        ids = list(
+            db.session.execute(
+                select(IdempotencyKey.id).where(IdempotencyKey.expires_at <= now).limit(batch_size)
+            ).scalars()
+        )
+        if not ids:
+            return deleted
+        db.session.execute(delete(IdempotencyKey).where(IdempotencyKey.id.in_(ids)))
+        db.session.commit()
+        deleted += len(ids)
+        if len(ids) < batch_size:
+            return deleted
+
+
+def _cache_capacity() -> int:
+    return int(current_app.config.get("IDEMPOTENCY_CACHE_SIZE", DEFAULT_CACHE_SIZE))
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
@@ -0,0 +1,175 @@
+"""Expiry sweeper: flag expired lots, settle their reservations, archive them.
+
+Listings already exclude lots past ``expires_at``, but the rows stay in the
+live tables and every scan still walks over them. The sweeper keeps
+``is_expired`` current, cancels unconfirmed orders still holding stock of an
+expired lot, reports the confirmed ones for follow-up, and moves lots that
+have been expired for a while (and hold no reservation) into the
+``*_archive`` tables. Every step works in batches and commits per batch.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import delete, insert, literal, select, update
+
+from app.extensions import db
+from app.models import FreshProduceInventoryArchive, InventoryItemArchive, Order, OrderItem
+from app.models.inventory_ledger import INVENTORY_KIND_BY_MODEL, STOCK_ATTRIBUTE_BY_MODEL
+from app.services.inventory_ledger_service import record_movements
+from app.services.inventory_service import INVENTORY_KINDS
+from app.services.order_service import SETTLED_ORDER_STATUSES, cancel_locked_orders, order_item_kind_match
+
+DEFAULT_BATCH_SIZE = 500
+ARCHIVE_MODEL_BY_KIND = {"regular": InventoryItemArchive, "fresh_produce": FreshProduceInventoryArchive}
+
+
+@dataclass
+class ExpirySweep:
+    flagged: int = 0
+    unflagged: int = 0
+    cancelled_orders: int = 0
+    # Orders past "created" that still hold stock of an expired lot; they are
+    # left for staff to resolve.
+    held_order_ids: list[int] = field(default_factory=list)
+    archived: int = 0
+
+
+def archive_after_days() -> int | None:
+    value = current_app.config.get("INVENTORY_ARCHIVE_AFTER_DAYS")
+    return int(value) if value not in (None, "") else None
+
+
+def _flag_expired(model_cls, now: datetime, batch_size: int) -> int:
+    return _set_expired_in_batches(
+        model_cls, model_cls.is_expired.is_(False) & (model_cls.expires_at <= now), True, batch_size
+    )
+
+
+def _unflag_renewed(model_cls, now: datetime, batch_size: int) -> int:
+    """Clear the flag of lots whose ``expires_at`` was pushed out in bulk."""
+    return _set_expired_in_batches(
+        model_cls, model_cls.is_expired.is_(True) & (model_cls.expires_at > now), False, batch_size
+    )
+
+
+def _set_expired_in_batches(model_cls, condition, is_expired: bool, batch_size: int) -> int:
+    changed = 0
+    while True:
+        ids = list(
+            db.session.execute(
+                select(model_cls.id)
+                .where(condition)
+                .order_by(model_cls.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            ).scalars()
+        )
+        if not ids:
+            return changed
+        # updated_at is the base of expires_at, so it must not move.
+        db.session.execute(
+            update(model_cls)
+            .where(model_cls.id.in_(ids))
+            .values(is_expired=is_expired, updated_at=model_cls.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        changed += len(ids)
+        if len(ids) < batch_size:
+            return changed
+
+
+def _settle_reservations(sweep: ExpirySweep, now: datetime, batch_size: int) -> None:
+    """Cancel "created" orders holding stock of expired lots; report the rest."""
+    holders = []
+    for _, model_cls in INVENTORY_KINDS:
+        expired_reserved = select(model_cls.id).where(model_cls.is_expired.is_(True), model_cls.reserved_quantity > 0)
+        holders.append(
+            select(Order.id, Order.status)
+            .join(OrderItem, OrderItem.order_id == Order.id)
+            .where(
+                Order.status.not_in(SETTLED_ORDER_STATUSES),
+                order_item_kind_match(model_cls),
+                OrderItem.source_inventory_item_id.in_(expired_reserved),
+            )
+        )
+    orders = {row.id: row.status for stmt in holders for row in db.session.execute(stmt)}
+    sweep.held_order_ids = sorted(order_id for order_id, status in orders.items() if status != "created")
+    created_ids = sorted(order_id for order_id, status in orders.items() if status == "created")
+    for start in range(0, len(created_ids), batch_size):
+        locked_ids = list(
+            db.session.execute(
+                select(Order.id)
+                .where(Order.id.in_(created_ids[start : start + batch_size]), Order.status == "created")
+                .order_by(Order.id)
+                .with_for_update(skip_locked=True)
+            ).scalars()
+        )
+        if locked_ids:
+            cancel_locked_orders(locked_ids, now)
+            db.session.commit()
+            sweep.cancelled_orders += len(locked_ids)
+
+
+def _archive(inventory_kind: str, model_cls, cutoff: datetime, now: datetime, batch_size: int) -> int:
+    archive_cls = ARCHIVE_MODEL_BY_KIND[inventory_kind]
+    columns = [column.key for column in archive_cls.__table__.columns if column.key != "archived_at"]
+    stock = getattr(model_cls, STOCK_ATTRIBUTE_BY_MODEL[model_cls])
+    archived = 0
+    while True:
+        lots = db.session.execute(
+            select(model_cls.id, model_cls.product_id, stock.label("stock"))
+            .where(model_cls.is_expired.is_(True), model_cls.expires_at <= cutoff, model_cls.reserved_quantity == 0)
+            .order_by(model_cls.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not lots:
+            return archived
+        ids = [lot.id for lot in lots]
+        archived_at = literal(now, type_=archive_cls.archived_at.type)
+        db.session.execute(
+            insert(archive_cls).from_select(
+                [*columns, "archived_at"],
+                select(*[getattr(model_cls, name) for name in columns], archived_at).where(model_cls.id.in_(ids)),
+            )
+        )
+        db.session.execute(
+            delete(model_cls).where(model_cls.id.in_(ids)).execution_options(synchronize_session=False)
+        )
+        record_movements(
+            {
+                "inventory_kind": INVENTORY_KIND_BY_MODEL[model_cls],
+                "inventory_item_id": lot.id,
+                "product_id": lot.product_id,
+                "movement_type": "archive",
+                "quantity_delta": -lot.stock,
+            }
+            for lot in lots
+        )
+        db.session.commit()
+        archived += len(ids)
+        if len(ids) < batch_size:
+            return archived
+
+
+def sweep_expired_inventory(
+    *, archive_after: int | None = None, batch_size: int = DEFAULT_BATCH_SIZE
+) -> ExpirySweep:
+    """Run one sweep. Lots expired more than ``archive_after`` days ago are
+    archived; with ``None`` nothing is archived."""
+    sweep = ExpirySweep()
+    now = datetime.now(timezone.utc)
+    for _, model_cls in INVENTORY_KINDS:
+        sweep.unflagged += _unflag_renewed(model_cls, now, batch_size)
+        sweep.flagged += _flag_expired(model_cls, now, batch_size)
+    _settle_reservations(sweep, now, batch_size)
+    if archive_after is not None:
+        cutoff = now - timedelta(days=archive_after)
+        for inventory_kind, model_cls in INVENTORY_KINDS:
+            sweep.archived += _archive(inventory_kind, model_cls, cutoff, now, batch_size)
+    return sweep
@@ -0,0 +1,291 @@
+"""Bulk inventory import from streamed CSV or NDJSON uploads.
+
+Records are parsed one at a time from the upload stream and validated in
+chunks: the products and sellers a chunk references are looked up with one
+query each and cached for later chunks. Valid rows are routed to
+``inventory_items`` or ``fresh_produce_inventory`` by product type and
+inserted with one executemany per table per chunk (batched into multi-row
+INSERTs by SQLAlchemy's insertmanyvalues). Rejected rows are reported with
+their record number instead of failing the whole import.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal, InvalidOperation
+from typing import IO, Any
+
+from sqlalchemy import exists, insert, select
+
+from app.extensions import db
+from app.models import FreshProduceInventoryItem, InventoryItem, Product, Role, User, UserRole
+from app.models.inventory_ledger import INVENTORY_KIND_BY_MODEL, STOCK_ATTRIBUTE_BY_MODEL
+from app.services.inventory_ledger_service import record_movements
+
+IMPORT_FORMATS = ("csv", "ndjson")
+DEFAULT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportRecordError(ValueError):
+    """A record that cannot be parsed at all (bad JSON, not an object)."""
+
+
+@dataclass
+class SellerScope:
+    """Which sellers the importing user may stock.
+
+    ``own_seller_id`` pins every row to that seller (seller users).
+    Otherwise rows name their seller, who must be a seller user and, unless
+    ``any_region``, a valid seller in one of ``region_ids``.
+    """
+
+    own_seller_id: int | None = None
+    any_region: bool = False
+    region_ids: frozenset[int] = frozenset()
+
+
+@dataclass
+class ImportReport:
+    imported: dict[str, int] = field(default_factory=lambda: {"regular": 0, "fresh_produce": 0})
+    rejected: int = 0
+    errors: list[dict[str, object]] = field(default_factory=list)
+
+    def reject(self, row_number: int, message: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_number, "message": message})
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "imported": self.imported,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "errors_truncated": self.rejected > len(self.errors),
+        }
+
+
+def iter_import_records(
+    stream: IO[bytes], import_format: str
+) -> Iterator[tuple[int, dict[str, Any] | ImportRecordError]]:
+    """Yield ``(record number, record)`` from an upload without reading it whole.
+
+    Records are numbered from 1, excluding the CSV header. A record that
+    cannot be parsed is yielded as an :class:`ImportRecordError`.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if import_format == "csv":
+        for row_number, row in enumerate(csv.DictReader(text), start=1):
+            yield row_number, row
+        return
+    row_number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield row_number, ImportRecordError("invalid JSON")
+            continue
+        yield row_number, record if isinstance(record, dict) else ImportRecordError("record must be an object")
+
+
+def _chunks(records: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    chunk: list[Any] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _parse_int(value: object) -> int | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+        return int(value.strip())
+    return None
+
+
+def _referenced_ids(records: list[dict[str, Any]], key: str) -> set[int]:
+    ids = (_parse_int(record.get(key)) for record in records)
+    return {value for value in ids if value is not None}
+
+
+def _parse_money(value: object) -> Decimal | None:
+    try:
+        amount = Decimal(str(value).strip())
+    except (InvalidOperation, TypeError, ValueError):
+        return None
+    if not amount.is_finite() or amount < 0:
+        return None
+    return amount.quantize(Decimal("0.01"))
+
+
+class _Lookups:
+    """Product and seller facts needed for validation, cached across chunks."""
+
+    def __init__(self) -> None:
+        self.products: dict[int, tuple[str, int] | None] = {}
+        self.sellers: dict[int, tuple[bool, str | None, int | None] | None] = {}
+
+    def load(self, product_ids: set[int], seller_ids: set[int]) -> None:
+        missing_products = product_ids - self.products.keys()
+        if missing_products:
+            self.products.update(dict.fromkeys(missing_products))
+            rows = db.session.execute(
+                select(Product.id, Product.product_type, Product.validity_days).where(
+                    Product.id.in_(missing_products)
+                )
+            )
+            for row in rows:
+                self.products[row.id] = (row.product_type.strip().lower(), row.validity_days)
+
+        missing_sellers = seller_ids - self.sellers.keys()
+        if missing_sellers:
+            self.sellers.update(dict.fromkeys(missing_sellers))
+            is_seller = exists().where(
+                UserRole.user_id == User.id, UserRole.role_id == Role.id, Role.name == "seller"
+            )
+            rows = db.session.execute(
+                select(User.id, is_seller.label("is_seller"), User.seller_status, User.source_region_id).where(
+                    User.id.in_(missing_sellers)
+                )
+            )
+            for row in rows:
+                self.sellers[row.id] = (bool(row.is_seller), row.seller_status, row.source_region_id)
+
+
+def _validate(
+    record: dict[str, Any], scope: SellerScope, lookups: _Lookups
+) -> tuple[type[InventoryItem] | type[FreshProduceInventoryItem], dict[str, Any]] | str:
+    """Return ``(model, values)`` for a valid record, or the error message."""
+    product_id = _parse_int(record.get("product_id"))
+    if product_id is None:
+        return "product_id must be integer"
+    quantity = _parse_int(record.get("quantity"))
+    if quantity is None or quantity < 0:
+        return "quantity must be a non-negative integer"
+    price_per_unit = _parse_money(record.get("price_per_unit"))
+    if price_per_unit is None:
+        return "price_per_unit must be a non-negative number"
+
+    product = lookups.products.get(product_id)
+    if product is None:
+        return "product not found"
+    product_type, validity_days = product
+
+    if scope.own_seller_id is not None:
+        seller_id = scope.own_seller_id
+    else:
+        seller_id = _parse_int(record.get("seller_id"))
+        if seller_id is None:
+            return "seller_id must be integer"
+        seller = lookups.sellers.get(seller_id)
+        if seller is None:
+            return "seller not found"
+        is_seller, seller_status, source_region_id = seller
+        if not is_seller:
+            return "seller_id is not a seller user"
+        if not scope.any_region:
+            if seller_status != "valid":
+                return "seller must be valid"
+            if source_region_id not in scope.region_ids:
+                return "seller is not in admin source regions"
+
+    model_cls = FreshProduceInventoryItem if product_type == "fresh_produce" else InventoryItem
+    return model_cls, {
+        "product_id": product_id,
+        "seller_id": seller_id,
+        STOCK_ATTRIBUTE_BY_MODEL[model_cls]: quantity,
+        "price_per_unit": price_per_unit,
+        "validity_days": validity_days,
+    }
+
+
+def _insert_lots(
+    model_cls: type[InventoryItem] | type[FreshProduceInventoryItem],
+    rows: list[dict[str, Any]],
+    actor_user_id: int,
+) -> None:
+    now = datetime.now(timezone.utc)
+    params = [
+        {
+            **{key: value for key, value in row.items() if key != "validity_days"},
+            "supplier_id": None,
+            "origin_type": "seller_direct",
+            "origin": "seller_direct",
+            "entry_date": now,
+            "created_by_admin_user_id": actor_user_id,
+            "reserved_quantity": 0,
+            "updated_at": now,
+            # Bulk inserts skip the mapper events, so derive expires_at and
+            # the ledger rows here, as app.models.inventory_expiry and
+            # app.models.inventory_ledger would.
+            "expires_at": now + timedelta(days=row["validity_days"]),
+        }
+        for row in rows
+    ]
+    ids = db.session.execute(
+        insert(model_cls).returning(model_cls.id, sort_by_parameter_order=True), params
+    ).scalars().all()
+    stock_key = STOCK_ATTRIBUTE_BY_MODEL[model_cls]
+    record_movements(
+        {
+            "inventory_kind": INVENTORY_KIND_BY_MODEL[model_cls],
+            "inventory_item_id": lot_id,
+            "product_id": row["product_id"],
+            "movement_type": "receipt",
+            "quantity_delta": row[stock_key],
+        }
+        for lot_id, row in zip(ids, rows)
+    )
+
+
+def import_inventory(
+    records: Iterable[tuple[int, dict[str, Any] | ImportRecordError]],
+    *,
+    actor_user_id: int,
+    scope: SellerScope,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dry_run: bool = False,
+) -> ImportReport:
+    """Validate and insert ``records`` chunk by chunk in the caller's
+    transaction; the caller commits. With ``dry_run`` nothing is written."""
+    report = ImportReport()
+    lookups = _Lookups()
+    for chunk in _chunks(records, chunk_size):
+        parsed = [record for _, record in chunk if isinstance(record, dict)]
+        product_ids = _referenced_ids(parsed, "product_id")
+        seller_ids = _referenced_ids(parsed, "seller_id") if scope.own_seller_id is None else set()
+        lookups.load(product_ids, seller_ids)
+
+        rows_by_model: dict[type, list[dict[str, Any]]] = {InventoryItem: [], FreshProduceInventoryItem: []}
+        for row_number, record in chunk:
+            if isinstance(record, ImportRecordError):
+                report.reject(row_number, str(record))
+                continue
+            validated = _validate(record, scope, lookups)
+            if isinstance(validated, str):
+                report.reject(row_number, validated)
+                continue
+            model_cls, values = validated
+            rows_by_model[model_cls].append(values)
+
+        for model_cls, rows in rows_by_model.items():
+            if not rows:
+                continue
+            if not dry_run:
+                _insert_lots(model_cls, rows, actor_user_id)
+            report.imported[INVENTORY_KIND_BY_MODEL[model_cls]] += len(rows)
+    return report
@@ -0,0 +1,173 @@
+"""Inventory movement ledger, compacted snapshots and point-in-time stock.
+
+Every change to a lot's stock or reservation appends an
+``inventory_movements`` row in the same transaction. Periodically,
+:func:`take_inventory_snapshot` folds the movements since the previous
+snapshot into a new per-lot snapshot, so "stock as of T" reads the latest
+snapshot at or before T plus only the movements between it and T.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import ColumnElement, Row, delete, func, insert, literal, or_, select, union_all
+
+from app.extensions import db
+from app.models import InventoryMovement, InventorySnapshot, InventorySnapshotLot
+
+# Snapshots stop this far behind "now" so movements of transactions still in
+# flight are not skipped by a snapshot that has already been taken.
+DEFAULT_SNAPSHOT_SETTLE_SECONDS = 60
+
+
+@dataclass(frozen=True)
+class LotFilters:
+    product_id: int | None = None
+    inventory_kind: str | None = None
+    inventory_item_id: int | None = None
+
+
+def record_movements(movements: Iterable[dict[str, object]]) -> None:
+    """Append movements (``inventory_kind``, ``inventory_item_id``,
+    ``product_id``, ``movement_type``, deltas) in the caller's transaction."""
+    rows = [row for row in movements if row.get("quantity_delta") or row.get("reserved_delta")]
+    if rows:
+        now = datetime.now(timezone.utc)
+        db.session.execute(
+            insert(InventoryMovement),
+            [{"quantity_delta": 0, "reserved_delta": 0, "occurred_at": now, **row} for row in rows],
+        )
+
+
+def _lot_criteria(columns, filters: LotFilters) -> list[ColumnElement[bool]]:
+    criteria: list[ColumnElement[bool]] = []
+    if filters.product_id is not None:
+        criteria.append(columns.product_id == filters.product_id)
+    if filters.inventory_kind is not None:
+        criteria.append(columns.inventory_kind == filters.inventory_kind)
+    if filters.inventory_item_id is not None:
+        criteria.append(columns.inventory_item_id == filters.inventory_item_id)
+    return criteria
+
+
+def _positions(snapshot: InventorySnapshot | None, until: datetime, filters: LotFilters):
+    """Per-lot stock as of ``until``: ``snapshot`` plus the later movements."""
+    movements = select(
+        InventoryMovement.inventory_kind,
+        InventoryMovement.inventory_item_id,
+        InventoryMovement.product_id,
+        InventoryMovement.quantity_delta.label("quantity"),
+        InventoryMovement.reserved_delta.label("reserved_quantity"),
+    ).where(InventoryMovement.occurred_at <= until, *_lot_criteria(InventoryMovement, filters))
+    parts = [movements]
+    if snapshot is not None:
+        parts[0] = movements.where(InventoryMovement.occurred_at > snapshot.as_of)
+        parts.append(
+            select(
+                InventorySnapshotLot.inventory_kind,
+                InventorySnapshotLot.inventory_item_id,
+                InventorySnapshotLot.product_id,
+                InventorySnapshotLot.quantity,
+                InventorySnapshotLot.reserved_quantity,
+            ).where(InventorySnapshotLot.snapshot_id == snapshot.id, *_lot_criteria(InventorySnapshotLot, filters))
+        )
+    combined = union_all(*parts).subquery("positions")
+    quantity = func.sum(combined.c.quantity)
+    reserved_quantity = func.sum(combined.c.reserved_quantity)
+    return (
+        select(
+            combined.c.inventory_kind,
+            combined.c.inventory_item_id,
+            combined.c.product_id,
+            quantity.label("quantity"),
+            reserved_quantity.label("reserved_quantity"),
+        )
+        .group_by(combined.c.inventory_kind, combined.c.inventory_item_id, combined.c.product_id)
+        .having(or_(quantity != 0, reserved_quantity != 0))
+    )
+
+
+def _latest_snapshot(at: datetime | None = None) -> InventorySnapshot | None:
+    stmt = select(InventorySnapshot).order_by(InventorySnapshot.as_of.desc()).limit(1)
+    if at is not None:
+        stmt = stmt.where(InventorySnapshot.as_of <= at)
+    return db.session.execute(stmt).scalar_one_or_none()
+
+
+def stock_as_of(at: datetime, filters: LotFilters = LotFilters()) -> list[Row]:
+    """Stock and reservations of every non-empty lot matching ``filters`` at ``at``."""
+    stmt = _positions(_latest_snapshot(at), at, filters)
+    return list(db.session.execute(stmt.order_by("inventory_kind", "inventory_item_id")).all())
+
+
+def movement_totals(start: datetime, end: datetime, filters: LotFilters = LotFilters()) -> list[Row]:
+    """Net deltas per movement type for movements in ``(start, end]``."""
+    stmt = (
+        select(
+            InventoryMovement.movement_type,
+            func.count().label("movements"),
+            func.sum(InventoryMovement.quantity_delta).label("quantity_delta"),
+            func.sum(InventoryMovement.reserved_delta).label("reserved_delta"),
+        )
+        .where(
+            InventoryMovement.occurred_at > start,
+            InventoryMovement.occurred_at <= end,
+            *_lot_criteria(InventoryMovement, filters),
+        )
+        .group_by(InventoryMovement.movement_type)
+        .order_by(InventoryMovement.movement_type)
+    )
+    return list(db.session.execute(stmt).all())
+
+
+def take_inventory_snapshot(*, as_of: datetime | None = None, keep: int | None = None) -> InventorySnapshot | None:
+    """Write a snapshot as of ``as_of`` from the previous one plus the
+    movements since, in one INSERT ... SELECT, and commit it.
+
+    ``as_of`` defaults to a settle window before now. Returns ``None`` when
+    it would not be newer than the latest snapshot. With ``keep``, only the
+    newest ``keep`` snapshots are retained.
+    """
+    if as_of is None:
+        settle_seconds = int(
+            current_app.config.get("INVENTORY_SNAPSHOT_SETTLE_SECONDS", DEFAULT_SNAPSHOT_SETTLE_SECONDS)
+        )
+        as_of = datetime.now(timezone.utc) - timedelta(seconds=settle_seconds)
+    previous = _latest_snapshot()
+    if previous is not None:
+        previous_as_of = previous.as_of if previous.as_of.tzinfo else previous.as_of.replace(tzinfo=timezone.utc)
+        if previous_as_of >= as_of:
+            return None
+
+    snapshot = InventorySnapshot(as_of=as_of)
+    db.session.add(snapshot)
+    db.session.flush()
+    positions = _positions(previous, as_of, LotFilters()).subquery()
+    db.session.execute(
+        insert(InventorySnapshotLot).from_select(
+            ["snapshot_id", "inventory_kind", "inventory_item_id", "product_id", "quantity", "reserved_quantity"],
+            select(
+                literal(snapshot.id),
+                positions.c.inventory_kind,
+                positions.c.inventory_item_id,
+                positions.c.product_id,
+                positions.c.quantity,
+                positions.c.reserved_quantity,
+            ),
+        )
+    )
+    if keep is not None:
+        stale_ids = list(
+            db.session.execute(
+                select(InventorySnapshot.id).order_by(InventorySnapshot.as_of.desc()).offset(keep)
+            ).scalars()
+        )
+        if stale_ids:
+            db.session.execute(delete(InventorySnapshotLot).where(InventorySnapshotLot.snapshot_id.in_(stale_ids)))
+            db.session.execute(delete(InventorySnapshot).where(InventorySnapshot.id.in_(stale_ids)))
+    db.session.commit()
+    return snapshot
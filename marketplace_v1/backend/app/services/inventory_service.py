@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy import (
+    Integer,
+    Numeric,
+    Row,
+    cast,
+    column,
+    func,
+    literal,
+    select,
+    tuple_,
+    union_all,
+    update,
+    values,
+)
+
+from app.extensions import db
+from app.models import FreshProduceInventoryItem, InventoryItem, Product, Supplier, User
+from app.models.inventory_expiry import INVENTORY_MODELS
+from app.models.inventory_ledger import STOCK_ATTRIBUTE_BY_MODEL
+from app.services.inventory_ledger_service import record_movements
+from app.services.load_plans import inventory_item_response
+from app.utils.pagination import Page, capped_count, decode_cursor, encode_cursor
+from app.utils.sql import add_days
+
+INVENTORY_KINDS = (("regular", InventoryItem), ("fresh_produce", FreshProduceInventoryItem))
+INVENTORY_CURSOR_SCOPE = "admin.inventory"
+
+
+class ConcurrentInventoryUpdateError(Exception):
+    """A lot changed between being read and being updated."""
+
+
+@dataclass(frozen=True)
+class LotUpdate:
+    inventory_kind: str
+    id: int
+    quantity: int | None = None
+    price_per_unit: Decimal | None = None
+
+
+@dataclass(frozen=True)
+class InventoryFilters:
+    seller_id: int | None = None
+    product_id: int | None = None
+    product_type: str = ""
+    status: str = ""
+    expired: bool | None = None
+
+
+def backfill_inventory_expiry(*, product_id: int | None = None, batch_size: int = 1000) -> int:
+    """Recompute ``expires_at`` from ``updated_at`` and the product's validity,
+    and ``is_expired`` with it.
+
+    Walks both inventory tables in primary-key order, ``batch_size`` rows per
+    UPDATE, committing each batch so no lock is held for the whole table.
+    Restrict to one product with ``product_id`` (run after changing its
+    ``validity_days``). Returns the rows touched.
+    """
+    touched = 0
+    now = datetime.now(timezone.utc)
+    for model_cls in INVENTORY_MODELS:
+        validity_days = (
+            select(Product.validity_days).where(Product.id == model_cls.product_id).scalar_subquery()
+        )
+        expires_at = add_days(model_cls.updated_at, validity_days)
+        last_id = 0
+        while True:
+            stmt = select(model_cls.id).where(model_cls.id > last_id).order_by(model_cls.id).limit(batch_size)
+            if product_id is not None:
+                stmt = stmt.where(model_cls.product_id == product_id)
+            ids = list(db.session.execute(stmt).scalars())
+            if not ids:
+                break
+            db.session.execute(
+                update(model_cls)
+                .where(model_cls.id.in_(ids))
+                .values(
+                    expires_at=expires_at,
+                    is_expired=expires_at <= literal(now, type_=model_cls.expires_at.type),
+                    updated_at=model_cls.updated_at,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            touched += len(ids)
+            last_id = ids[-1]
+            if len(ids) < batch_size:
+                break
+    return touched
+
+
+def filtered_lots(
+    inventory_kind: str,
+    model_cls: type[InventoryItem] | type[FreshProduceInventoryItem],
+    filters: InventoryFilters,
+    now: datetime,
+    columns: tuple | None = None,
+):
+    """Select ``columns`` (by default the ``(id, entry_date)`` sort key) of the
+    lots in one inventory table that match ``filters``, tagged with their kind."""
+    if columns is None:
+        columns = (model_cls.id.label("id"), model_cls.entry_date.label("entry_date"))
+    stmt = select(literal(inventory_kind).label("inventory_kind"), *columns)
+    if filters.seller_id is not None:
+        stmt = stmt.where(model_cls.seller_id == filters.seller_id)
+    if filters.product_id is not None:
+        stmt = stmt.where(model_cls.product_id == filters.product_id)
+    if filters.product_type:
+        stmt = stmt.join(Product, model_cls.product_id == Product.id).where(
+            Product.product_type == filters.product_type
+        )
+    if filters.expired is True:
+        stmt = stmt.where(model_cls.expires_at <= now)
+    elif filters.expired is False:
+        stmt = stmt.where(model_cls.expires_at > now)
+    if filters.status in {"active", "inactive"}:
+        stmt = stmt.join(Supplier, model_cls.supplier_id == Supplier.supplier_id).where(
+            model_cls.origin_type == "procurement",
+            Supplier.is_active.is_(filters.status == "active"),
+        )
+    elif filters.status:
+        stmt = stmt.join(User, model_cls.seller_id == User.id).where(
+            model_cls.origin_type == "seller_direct",
+            User.seller_status == filters.status,
+        )
+    return stmt
+
+
+def list_inventory_page(
+    filters: InventoryFilters,
+    *,
+    page_size: int,
+    page: int = 1,
+    cursor: str | None = None,
+) -> Page[tuple[str, InventoryItem | FreshProduceInventoryItem]]:
+    """Return one page of lots from both inventory tables, newest entry first.
+
+    Ordering is ``(entry_date DESC, id DESC, inventory_kind DESC)``. Only the
+    narrow ``(kind, id, entry_date)`` keys of each table are unioned, sorted
+    and limited in SQL; the page's lots are then hydrated with one query per
+    table. With ``cursor`` the page starts right after the cursor's row
+    (keyset), so deep pages cost the same as the first; otherwise ``page`` is
+    applied as an OFFSET. The total is capped (see ``capped_count``).
+    """
+    now = datetime.now(timezone.utc)
+    after = decode_cursor(INVENTORY_CURSOR_SCOPE, cursor, arity=3) if cursor else None
+
+    total, total_is_exact = capped_count(
+        select(
+            union_all(*[filtered_lots(kind, model_cls, filters, now) for kind, model_cls in INVENTORY_KINDS])
+            .subquery()
+            .c.id
+        )
+    )
+
+    branches = []
+    for kind, model_cls in INVENTORY_KINDS:
+        branch = filtered_lots(kind, model_cls, filters, now)
+        if after is not None:
+            after_entry_date, after_id, after_kind = after
+            row_key = tuple_(model_cls.entry_date, model_cls.id)
+            # inventory_kind is constant per branch, so the three-part keyset
+            # comparison reduces to a two-column one the (entry_date, id)
+            # index can serve.
+            if kind < after_kind:
+                branch = branch.where(row_key <= tuple_(after_entry_date, after_id))
+            else:
+                branch = branch.where(row_key < tuple_(after_entry_date, after_id))
+            # Each branch only needs its own first page_size + 1 rows.
+            branch = select(
+                branch.order_by(model_cls.entry_date.desc(), model_cls.id.desc()).limit(page_size + 1).subquery()
+            )
+        branches.append(branch)
+    lots = union_all(*branches).subquery("lots")
+    stmt = select(lots.c.inventory_kind, lots.c.id, lots.c.entry_date).order_by(
+        lots.c.entry_date.desc(), lots.c.id.desc(), lots.c.inventory_kind.desc()
+    )
+    if after is not None:
+        stmt = stmt.limit(page_size + 1)
+    else:
+        stmt = stmt.limit(page_size + 1).offset((page - 1) * page_size)
+    keys = db.session.execute(stmt).all()
+
+    has_more = len(keys) > page_size
+    keys = keys[:page_size]
+    next_cursor = (
+        encode_cursor(INVENTORY_CURSOR_SCOPE, (keys[-1].entry_date, keys[-1].id, keys[-1].inventory_kind))
+        if has_more
+        else None
+    )
+
+    loaded: dict[tuple[str, int], InventoryItem | FreshProduceInventoryItem] = {}
+    for kind, model_cls in INVENTORY_KINDS:
+        ids = [key.id for key in keys if key.inventory_kind == kind]
+        if not ids:
+            continue
+        rows = db.session.execute(
+            select(model_cls).where(model_cls.id.in_(ids)).options(*inventory_item_response(model_cls))
+        ).unique().scalars()
+        loaded.update({(kind, row.id): row for row in rows})
+    return Page(
+        items=[(key.inventory_kind, loaded[(key.inventory_kind, key.id)]) for key in keys],
+        next_cursor=next_cursor,
+        total=total,
+        total_is_exact=total_is_exact,
+    )
+
+
+def load_lots(keys: Iterable[tuple[str, int]]) -> dict[tuple[str, int], Row]:
+    """Ownership and stock of the ``(inventory_kind, id)`` lots, in one query."""
+    ids_by_kind: dict[str, set[int]] = {}
+    for inventory_kind, lot_id in keys:
+        ids_by_kind.setdefault(inventory_kind, set()).add(lot_id)
+    branches = []
+    for kind, model_cls in INVENTORY_KINDS:
+        if not ids_by_kind.get(kind):
+            continue
+        branches.append(
+            select(
+                literal(kind).label("inventory_kind"),
+                model_cls.id,
+                model_cls.product_id,
+                model_cls.seller_id,
+                model_cls.origin_type,
+                model_cls.created_by_admin_user_id,
+                getattr(model_cls, STOCK_ATTRIBUTE_BY_MODEL[model_cls]).label("stock"),
+            ).where(model_cls.id.in_(ids_by_kind[kind]))
+        )
+    if not branches:
+        return {}
+    rows = db.session.execute(union_all(*branches) if len(branches) > 1 else branches[0]).all()
+    return {(row.inventory_kind, row.id): row for row in rows}
+
+
+def apply_lot_updates(updates: list[LotUpdate], lots: dict[tuple[str, int], Row]) -> None:
+    """Apply ``updates`` with one ``UPDATE ... FROM (VALUES ...)`` per table.
+
+    Omitted fields keep their value. Each row is guarded on the stock read
+    into ``lots``, so a lot changed in between raises
+    ``ConcurrentInventoryUpdateError`` (the caller rolls back) instead of
+    being overwritten. Like a single-lot edit, the update restarts the lot's
+    shelf life from now. Quantity changes are recorded in the ledger.
+    """
+    now = datetime.now(timezone.utc)
+    movements: list[dict[str, object]] = []
+    for kind, model_cls in INVENTORY_KINDS:
+        batch = [update_ for update_ in updates if update_.inventory_kind == kind]
+        if not batch:
+            continue
+        stock = getattr(model_cls, STOCK_ATTRIBUTE_BY_MODEL[model_cls])
+        changes = values(
+            column("id", Integer),
+            column("expected_stock", Integer),
+            column("quantity", Integer),
+            column("price_per_unit", Numeric(12, 2)),
+            name="lot_changes",
+        ).data(
+            [(u.id, lots[(kind, u.id)].stock, u.quantity, u.price_per_unit) for u in batch]
+        )
+        validity_days = select(Product.validity_days).where(Product.id == model_cls.product_id).scalar_subquery()
+        result = db.session.execute(
+            update(model_cls)
+            .where(model_cls.id == changes.c.id, stock == changes.c.expected_stock)
+            .values(
+                {
+                    stock: func.coalesce(cast(changes.c.quantity, Integer), stock),
+                    model_cls.price_per_unit: func.coalesce(
+                        cast(changes.c.price_per_unit, Numeric(12, 2)), model_cls.price_per_unit
+                    ),
+                    model_cls.updated_at: now,
+                    model_cls.expires_at: add_days(literal(now, type_=model_cls.updated_at.type), validity_days),
+                    model_cls.is_expired: False,
+                }
+            )
+            .returning(model_cls.id)
+            .execution_options(synchronize_session=False)
+        )
+        updated_ids = set(result.scalars())
+        if len(updated_ids) != len(batch):
+            raise ConcurrentInventoryUpdateError(kind)
+        for u in batch:
+            lot = lots[(kind, u.id)]
+            if u.quantity is not None and u.quantity != lot.stock:
+                movements.append(
+                    {
+                        "inventory_kind": kind,
+                        "inventory_item_id": u.id,
+                        "product_id": lot.product_id,
+                        "movement_type": "adjustment",
+                        "quantity_delta": u.quantity - lot.stock,
+                    }
+                )
+    record_movements(movements)
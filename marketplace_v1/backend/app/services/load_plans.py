@@ -0,0 +1,49 @@
+"""Named loader-option profiles, one per kind of response.
+
+Model relationships default to lazy loading (collections on ``User`` raise),
+so each endpoint states what it renders by passing one of these to
+``.options(*...)``. Keeping the plans here means a serializer change and the
+matching load plan are reviewed together.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from app.models import FreshProduceInventoryItem, InventoryItem, Order, OrderGroup, Role, User
+
+# Login, /auth/me and token refresh: the claims need role and permission names.
+USER_WITH_PERMISSIONS: tuple[LoaderOption, ...] = (
+    selectinload(User.roles).selectinload(Role.permissions),
+)
+
+# Admin user lists render role names only.
+USER_WITH_ROLES: tuple[LoaderOption, ...] = (selectinload(User.roles),)
+
+# _build_order_response: group number, seller name, supplier name, items.
+ORDER_RESPONSE: tuple[LoaderOption, ...] = (
+    joinedload(Order.order_group),
+    selectinload(Order.seller),
+    joinedload(Order.supplier),
+    selectinload(Order.items),
+)
+
+# _build_order_group_response: buyer plus every order rendered as above.
+ORDER_GROUP_RESPONSE: tuple[LoaderOption, ...] = (
+    selectinload(OrderGroup.buyer),
+    selectinload(OrderGroup.orders).selectinload(Order.seller),
+    selectinload(OrderGroup.orders).joinedload(Order.supplier),
+    selectinload(OrderGroup.orders).selectinload(Order.items),
+)
+
+
+def inventory_item_response(
+    model_cls: type[InventoryItem] | type[FreshProduceInventoryItem],
+) -> tuple[LoaderOption, ...]:
+    """Product, seller and supplier columns shown by ``_build_inventory_item_response``."""
+    return (
+        joinedload(model_cls.product),
+        selectinload(model_cls.seller),
+        joinedload(model_cls.supplier),
+    )
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import ColumnElement, exists, select, union
+
+from app.extensions import db
+from app.models import Order, OrderGroup, OrderItem
+from app.services.load_plans import ORDER_RESPONSE
+from app.utils.pagination import Page, after_keyset, decode_cursor, encode_cursor, paginate
+
+ORDER_SEARCH_SCOPE = "orders"
+
+
+@dataclass(frozen=True)
+class OrderSearchFilters:
+    statuses: tuple[str, ...] = field(default_factory=tuple)
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    seller_id: int | None = None
+    supplier_id: int | None = None
+    product_id: int | None = None
+    sku: str | None = None
+    group_number: str | None = None
+
+
+def order_criteria(filters: OrderSearchFilters) -> list[ColumnElement[bool]]:
+    criteria: list[ColumnElement[bool]] = []
+    if filters.statuses:
+        criteria.append(Order.status.in_(filters.statuses))
+    if filters.created_from is not None:
+        criteria.append(Order.created_at >= filters.created_from)
+    if filters.created_to is not None:
+        criteria.append(Order.created_at < filters.created_to)
+    if filters.seller_id is not None:
+        criteria.append(Order.seller_id == filters.seller_id)
+    if filters.supplier_id is not None:
+        criteria.append(Order.supplier_id == filters.supplier_id)
+    if filters.product_id is not None or filters.sku:
+        item_match = [OrderItem.order_id == Order.id]
+        if filters.product_id is not None:
+            item_match.append(OrderItem.product_id == filters.product_id)
+        if filters.sku:
+            item_match.append(OrderItem.sku == filters.sku)
+        criteria.append(exists().where(*item_match))
+    if filters.group_number:
+        criteria.append(
+            Order.order_group_id
+            == select(OrderGroup.id).where(OrderGroup.group_number == filters.group_number).scalar_subquery()
+        )
+    return criteria
+
+
+def search_orders(
+    filters: OrderSearchFilters,
+    *,
+    participant_id: int | None,
+    page_size: int,
+    cursor: str | None = None,
+) -> Page[Order]:
+    """Return one page of orders, newest first, matching ``filters``.
+
+    ``participant_id`` restricts results to orders the user bought or sold.
+    That visibility rule is evaluated as a UNION of a buyer branch and a
+    seller branch instead of ``buyer_id = ? OR seller_id = ?``, so each branch
+    walks its own ``(buyer_id|seller_id, created_at, id)`` index and stops
+    after one page.
+    """
+    criteria = order_criteria(filters)
+    sort = [Order.created_at, Order.id]
+    if participant_id is None:
+        return paginate(
+            select(Order).where(*criteria).options(*ORDER_RESPONSE),
+            scope=ORDER_SEARCH_SCOPE,
+            sort=sort,
+            page_size=page_size,
+            cursor=cursor,
+        )
+
+    after = decode_cursor(ORDER_SEARCH_SCOPE, cursor, arity=len(sort)) if cursor else None
+    branches = []
+    for participant_column in (Order.buyer_id, Order.seller_id):
+        branch = select(Order.id, Order.created_at).where(participant_column == participant_id, *criteria)
+        if after is not None:
+            branch = branch.where(after_keyset(sort, after, descending=True))
+        branch = branch.order_by(Order.created_at.desc(), Order.id.desc()).limit(page_size + 1)
+        branches.append(select(branch.subquery()))
+    keys = union(*branches).subquery("visible_orders")
+    rows = db.session.execute(
+        select(keys.c.id, keys.c.created_at)
+        .order_by(keys.c.created_at.desc(), keys.c.id.desc())
+        .limit(page_size + 1)
+    ).all()
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    orders_by_id = {
+        order.id: order
+        for order in db.session.execute(
+            select(Order).where(Order.id.in_([row.id for row in rows])).options(*ORDER_RESPONSE)
+        ).unique().scalars()
+    }
+    next_cursor = encode_cursor(ORDER_SEARCH_SCOPE, (rows[-1].created_at, rows[-1].id)) if has_more else None
+    return Page(items=[orders_by_id[row.id] for row in rows], next_cursor=next_cursor)
@@ -1 +1,368 @@
-"""Order service placeholder for v1."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import case, func, or_, select, update
+
+from app.extensions import db
+from app.models import FreshProduceInventoryItem, InventoryItem, Order, OrderItem, Supplier, User
+from app.models.inventory_ledger import INVENTORY_KIND_BY_MODEL
+from app.services.inventory_ledger_service import record_movements
+from app.services.load_plans import USER_WITH_ROLES
+
+
+DEFAULT_RESERVATION_TTL_SECONDS = 24 * 60 * 60
+# Orders in these statuses no longer hold a reservation.
+SETTLED_ORDER_STATUSES = ("delivered", "cancelled")
+
+
+@dataclass(frozen=True)
+class ReservationDrift:
+    inventory_kind: str
+    inventory_item_id: int
+    stored: int
+    expected: int
+
+
+class InsufficientStockError(Exception):
+    def __init__(self, inventory_kind: str, inventory_item_id: int, requested_qty: int) -> None:
+        super().__init__(f"insufficient stock for {inventory_kind} inventory item {inventory_item_id}")
+        self.inventory_kind = inventory_kind
+        self.inventory_item_id = inventory_item_id
+        self.requested_qty = requested_qty
+
+
+def inventory_model_for_kind(
+    inventory_kind: str | None,
+) -> type[InventoryItem] | type[FreshProduceInventoryItem]:
+    return InventoryItem if inventory_kind == "regular" else FreshProduceInventoryItem
+
+
+def load_checkout_sources(
+    cart_lines: Iterable[dict[str, object]],
+) -> tuple[
+    dict[int, User],
+    dict[int, Supplier],
+    dict[tuple[str, int], InventoryItem | FreshProduceInventoryItem],
+]:
+    """Load every seller, supplier and inventory lot referenced by a cart.
+
+    Issues one IN query per table regardless of cart size and returns lookup
+    maps keyed by id (inventory keyed by ``(inventory_kind, id)``).
+    """
+    seller_ids: set[int] = set()
+    supplier_ids: set[int] = set()
+    inventory_ids: dict[str, set[int]] = {"regular": set(), "fresh_produce": set()}
+    for line in cart_lines:
+        if line.get("seller_id") is not None:
+            seller_ids.add(line["seller_id"])
+        if line.get("supplier_id") is not None:
+            supplier_ids.add(line["supplier_id"])
+        inventory_ids[line["inventory_kind"]].add(line["source_inventory_item_id"])
+
+    sellers_by_id: dict[int, User] = {}
+    if seller_ids:
+        stmt = select(User).where(User.id.in_(seller_ids)).options(*USER_WITH_ROLES)
+        sellers_by_id = {user.id: user for user in db.session.execute(stmt).scalars()}
+
+    suppliers_by_id: dict[int, Supplier] = {}
+    if supplier_ids:
+        stmt = select(Supplier).where(Supplier.supplier_id.in_(supplier_ids))
+        suppliers_by_id = {supplier.supplier_id: supplier for supplier in db.session.execute(stmt).scalars()}
+
+    inventory_by_source: dict[tuple[str, int], InventoryItem | FreshProduceInventoryItem] = {}
+    for inventory_kind, ids in inventory_ids.items():
+        if not ids:
+            continue
+        model_cls = inventory_model_for_kind(inventory_kind)
+        stmt = select(model_cls).where(model_cls.id.in_(ids))
+        for item in db.session.execute(stmt).unique().scalars():
+            inventory_by_source[(inventory_kind, item.id)] = item
+
+    return sellers_by_id, suppliers_by_id, inventory_by_source
+
+
+def _stock_column(model_cls: type[InventoryItem] | type[FreshProduceInventoryItem]):
+    return model_cls.quantity if model_cls is InventoryItem else model_cls.estimated_quantity
+
+
+def _sum_by_inventory_source(
+    lines: Iterable[tuple[str | None, int | None, int]],
+) -> list[tuple[str | None, int, int]]:
+    totals: dict[tuple[str | None, int], int] = {}
+    for inventory_kind, inventory_item_id, qty in lines:
+        if inventory_item_id is None:
+            continue
+        key = (inventory_kind, inventory_item_id)
+        totals[key] = totals.get(key, 0) + qty
+    # Touch rows in a fixed (table, id) order so concurrent checkouts always
+    # acquire row locks in the same sequence and cannot deadlock each other.
+    ordered_keys = sorted(totals, key=lambda key: (str(key[0]), key[1]))
+    return [(kind, item_id, totals[(kind, item_id)]) for kind, item_id in ordered_keys]
+
+
+def reserve_inventory(lines: Iterable[tuple[str, int, int]]) -> None:
+    """Reserve stock for ``(inventory_kind, inventory_item_id, qty)`` lines.
+
+    Each lot is reserved with a single conditional UPDATE, so the availability
+    check and the increment happen atomically in the database; expired lots
+    never match. Raises ``InsufficientStockError`` for the first lot that
+    cannot cover its quantity; the caller is expected to roll back the
+    transaction.
+    """
+    now = datetime.now(timezone.utc)
+    movements: list[dict[str, object]] = []
+    for inventory_kind, inventory_item_id, qty in _sum_by_inventory_source(lines):
+        model_cls = inventory_model_for_kind(inventory_kind)
+        stock = _stock_column(model_cls)
+        stmt = (
+            update(model_cls)
+            .where(
+                model_cls.id == inventory_item_id,
+                stock - model_cls.reserved_quantity >= qty,
+                model_cls.expires_at > now,
+            )
+            .values(
+                reserved_quantity=model_cls.reserved_quantity + qty,
+                updated_at=model_cls.updated_at,
+            )
+            .returning(model_cls.product_id)
+            # The in-Python "evaluate" strategy cannot compare the naive
+            # datetimes SQLite hands back against an aware ``now``.
+            .execution_options(synchronize_session="fetch")
+        )
+        product_id = db.session.execute(stmt).scalar_one_or_none()
+        if product_id is None:
+            raise InsufficientStockError(str(inventory_kind), inventory_item_id, qty)
+        movements.append(
+            {
+                "inventory_kind": INVENTORY_KIND_BY_MODEL[model_cls],
+                "inventory_item_id": inventory_item_id,
+                "product_id": product_id,
+                "movement_type": "reserve",
+                "reserved_delta": qty,
+            }
+        )
+    record_movements(movements)
+
+
+def reservation_deadline(now: datetime | None = None) -> datetime:
+    """When a reservation taken ``now`` lapses if its order is still "created"."""
+    ttl_seconds = int(current_app.config.get("ORDER_RESERVATION_TTL_SECONDS", DEFAULT_RESERVATION_TTL_SECONDS))
+    return (now or datetime.now(timezone.utc)) + timedelta(seconds=ttl_seconds)
+
+
+def expire_stale_orders(*, batch_size: int = 500) -> int:
+    """Cancel "created" orders whose reservation has lapsed, releasing their stock.
+
+    Works through the overdue orders ``batch_size`` at a time; each batch
+    releases its items with :func:`settle_inventory` (one UPDATE per
+    inventory table), flips the orders with one UPDATE and commits. Rows
+    another transaction holds are skipped and picked up by the next run.
+    Returns the number of orders cancelled.
+    """
+    cancelled = 0
+    while True:
+        now = datetime.now(timezone.utc)
+        order_ids = list(
+            db.session.execute(
+                select(Order.id)
+                .where(Order.status == "created", Order.reservation_expires_at <= now)
+                .order_by(Order.reservation_expires_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            ).scalars()
+        )
+        if not order_ids:
+            return cancelled
+        cancel_locked_orders(order_ids, now)
+        db.session.commit()
+        cancelled += len(order_ids)
+        if len(order_ids) < batch_size:
+            return cancelled
+
+
+def cancel_locked_orders(order_ids: list[int], now: datetime) -> None:
+    """Cancel orders the caller has locked, releasing their reservations with
+    one :func:`settle_inventory` call and flipping them with one UPDATE."""
+    items = db.session.execute(select(OrderItem).where(OrderItem.order_id.in_(order_ids))).scalars().all()
+    settle_inventory(cancelled=items)
+    db.session.execute(
+        update(Order)
+        .where(Order.id.in_(order_ids))
+        .values(status="cancelled", updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def release_inventory(items: Iterable[OrderItem], *, consume: bool) -> None:
+    """Release the reservations held by ``items``.
+
+    With ``consume=True`` the released quantity is also deducted from stock
+    (delivery); otherwise it simply becomes available again (cancellation).
+    """
+    if consume:
+        settle_inventory(delivered=items)
+    else:
+        settle_inventory(cancelled=items)
+
+
+def order_item_kind_match(model_cls: type[InventoryItem] | type[FreshProduceInventoryItem]):
+    """SQL criterion selecting the order items whose lots live in ``model_cls``."""
+    if model_cls is InventoryItem:
+        return OrderItem.inventory_kind == "regular"
+    # inventory_model_for_kind sends every non-"regular" kind here.
+    return or_(OrderItem.inventory_kind.is_(None), OrderItem.inventory_kind != "regular")
+
+
+def settle_inventory(
+    *,
+    delivered: Iterable[OrderItem] = (),
+    cancelled: Iterable[OrderItem] = (),
+) -> None:
+    """Release the reservations of delivered and cancelled order items.
+
+    Delivered quantities are also deducted from stock. Quantities are summed
+    per lot and applied with one UPDATE per inventory table, whatever the
+    number of orders; per-lot amounts are mapped in with ``CASE id``. Values
+    are clamped at zero in SQL, mirroring the previous per-row logic.
+    """
+    totals: dict[tuple[str | None, int], list[int]] = {}
+    for consumed, items in ((True, delivered), (False, cancelled)):
+        for item in items:
+            if item.source_inventory_item_id is None:
+                continue
+            released_and_consumed = totals.setdefault((item.inventory_kind, item.source_inventory_item_id), [0, 0])
+            released_and_consumed[0] += item.qty
+            if consumed:
+                released_and_consumed[1] += item.qty
+
+    movements: list[dict[str, object]] = []
+    for model_cls in (InventoryItem, FreshProduceInventoryItem):
+        lots = {
+            item_id: amounts
+            for (inventory_kind, item_id), amounts in totals.items()
+            if inventory_model_for_kind(inventory_kind) is model_cls
+        }
+        if not lots:
+            continue
+        ids = sorted(lots)
+        stock = _stock_column(model_cls)
+        # Lock the lots in id order first, as reserve_inventory does, so a
+        # batch release cannot deadlock against concurrent checkouts. The
+        # values read give the ledger the exact (clamped) deltas.
+        locked = db.session.execute(
+            select(model_cls.id, model_cls.product_id, model_cls.reserved_quantity, stock.label("stock"))
+            .where(model_cls.id.in_(ids))
+            .order_by(model_cls.id)
+            .with_for_update()
+        ).all()
+        for lot in locked:
+            released_qty, consumed_qty = lots[lot.id]
+            movements.append(
+                {
+                    "inventory_kind": INVENTORY_KIND_BY_MODEL[model_cls],
+                    "inventory_item_id": lot.id,
+                    "product_id": lot.product_id,
+                    "movement_type": "delivery" if consumed_qty else "release",
+                    "quantity_delta": -min(consumed_qty, lot.stock),
+                    "reserved_delta": -min(released_qty, lot.reserved_quantity),
+                }
+            )
+
+        released = case({item_id: lots[item_id][0] for item_id in ids}, value=model_cls.id, else_=0)
+        values = {
+            "reserved_quantity": case(
+                (model_cls.reserved_quantity >= released, model_cls.reserved_quantity - released),
+                else_=0,
+            ),
+            "updated_at": model_cls.updated_at,
+        }
+        consumed_lots = {item_id: lots[item_id][1] for item_id in ids if lots[item_id][1]}
+        if consumed_lots:
+            consumed = case(consumed_lots, value=model_cls.id, else_=0)
+            values[stock.key] = case((stock >= consumed, stock - consumed), else_=0)
+        db.session.execute(update(model_cls).where(model_cls.id.in_(ids)).values(**values))
+    record_movements(movements)
+
+
+def reconcile_reserved_quantities(
+    *, batch_size: int = 1000, dry_run: bool = False
+) -> tuple[list[ReservationDrift], int]:
+    """Recompute ``reserved_quantity`` from the items of unsettled orders.
+
+    Per inventory table, one GROUP BY sums the open order items per source
+    lot and is outer-joined to the lots, so only drifted lots leave the
+    database. Those are corrected ``batch_size`` at a time with one UPDATE
+    each, committing per batch. A lot is only overwritten if it still holds
+    the value that was read, so a checkout racing the job is never undone;
+    such lots are left for the next run. Returns the drift found and the
+    number of lots corrected (always 0 with ``dry_run``).
+    """
+    drifts: list[ReservationDrift] = []
+    corrected = 0
+    for inventory_kind, model_cls in (("regular", InventoryItem), ("fresh_produce", FreshProduceInventoryItem)):
+        kind_match = order_item_kind_match(model_cls)
+        open_reservations = (
+            select(
+                OrderItem.source_inventory_item_id.label("inventory_item_id"),
+                func.sum(OrderItem.qty).label("reserved_quantity"),
+            )
+            .join(Order, Order.id == OrderItem.order_id)
+            .where(
+                Order.status.not_in(SETTLED_ORDER_STATUSES),
+                OrderItem.source_inventory_item_id.is_not(None),
+                kind_match,
+            )
+            .group_by(OrderItem.source_inventory_item_id)
+            .subquery("open_reservations")
+        )
+        expected = func.coalesce(open_reservations.c.reserved_quantity, 0)
+        rows = db.session.execute(
+            select(model_cls.id, model_cls.reserved_quantity, expected.label("expected"))
+            .outerjoin(open_reservations, open_reservations.c.inventory_item_id == model_cls.id)
+            .where(model_cls.reserved_quantity != expected)
+            .order_by(model_cls.id)
+        ).all()
+        table_drifts = [ReservationDrift(inventory_kind, row.id, row.reserved_quantity, row.expected) for row in rows]
+        drifts.extend(table_drifts)
+        if dry_run:
+            continue
+
+        for start in range(0, len(table_drifts), batch_size):
+            batch = table_drifts[start : start + batch_size]
+            ids = [drift.inventory_item_id for drift in batch]
+            result = db.session.execute(
+                update(model_cls)
+                .where(
+                    model_cls.id.in_(ids),
+                    model_cls.reserved_quantity
+                    == case({drift.inventory_item_id: drift.stored for drift in batch}, value=model_cls.id),
+                )
+                .values(
+                    reserved_quantity=case(
+                        {drift.inventory_item_id: drift.expected for drift in batch}, value=model_cls.id
+                    ),
+                    updated_at=model_cls.updated_at,
+                )
+                .returning(model_cls.id, model_cls.product_id)
+                .execution_options(synchronize_session=False)
+            )
+            drift_by_id = {drift.inventory_item_id: drift for drift in batch}
+            updated = result.all()
+            record_movements(
+                {
+                    "inventory_kind": inventory_kind,
+                    "inventory_item_id": row.id,
+                    "product_id": row.product_id,
+                    "movement_type": "reconcile",
+                    "reserved_delta": drift_by_id[row.id].expected - drift_by_id[row.id].stored,
+                }
+                for row in updated
+            )
+            db.session.commit()
+            corrected += len(updated)
+    return drifts, corrected
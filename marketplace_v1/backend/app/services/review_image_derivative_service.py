@@ -0,0 +1,194 @@
+"""Thumbnail and WebP derivatives of review images, rendered in a process pool.
+
+Newly stored blobs start out ``pending``. :func:`generate_review_image_derivatives`
+claims pending blobs a batch at a time (``rendering``, committed at once so
+no row stays locked while images are decoded), renders every variant of
+``DERIVATIVE_VARIANTS`` next to the original in worker processes (image
+decoding and encoding is CPU-bound), and marks each blob ``ready`` or
+``failed``. List views then load the small derivatives instead of the
+original upload.
+
+A crashed worker or a file not moved into place yet only defers the blob:
+it goes back to ``pending`` until it has been tried
+``MAX_DERIVATIVE_ATTEMPTS`` times. Claims left ``rendering`` by a run that
+died are taken over once ``STALE_CLAIM_SECONDS`` old.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import and_, or_, select, update
+
+from app.extensions import db
+from app.models import ProcurementReviewImageBlob
+from app.services.review_image_service import DERIVATIVE_VARIANTS, derivative_path, review_images_root
+
+DEFAULT_BATCH_SIZE = 50
+WEBP_QUALITY = 80
+MAX_DERIVATIVE_ATTEMPTS = 5
+STALE_CLAIM_SECONDS = 15 * 60
+# Worth another attempt: the pool lost a worker, or the upload's transaction
+# has not moved the file into place yet.
+TRANSIENT_ERRORS = (BrokenProcessPool, FileNotFoundError)
+
+
+@dataclass
+class DerivativeRun:
+    ready: int = 0
+    # Blobs given up on: undecodable, or out of attempts.
+    failed: list[str] = field(default_factory=list)
+    # Blobs put back to pending for a later run.
+    deferred: int = 0
+
+
+def derivative_workers() -> int:
+    return int(current_app.config.get("REVIEW_IMAGE_DERIVATIVE_WORKERS") or os.cpu_count() or 1)
+
+
+def render_derivatives(source_path: str) -> None:
+    """Write every WebP variant of the image at ``source_path`` beside it.
+
+    Runs in a worker process: takes and touches only files, never the
+    database or the app.
+    """
+    if not os.path.isfile(source_path):
+        raise FileNotFoundError(source_path)
+    from PIL import Image, ImageOps
+
+    with Image.open(source_path) as original:
+        image = ImageOps.exif_transpose(original)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+        for variant, (box, crop) in DERIVATIVE_VARIANTS.items():
+            if crop:
+                rendered = ImageOps.fit(image, box)
+            else:
+                rendered = image.copy()
+                rendered.thumbnail(box)
+            target = derivative_path(source_path, variant)
+            partial = f"{target}.partial"
+            rendered.save(partial, "WEBP", quality=WEBP_QUALITY, method=4)
+            os.replace(partial, target)
+
+
+def _claim_batch(batch_size: int, run_started: datetime) -> tuple[list, datetime]:
+    """Mark up to ``batch_size`` blobs ``rendering`` and commit. Blobs this
+    run already deferred (claimed since ``run_started``) are left for the next."""
+    blob = ProcurementReviewImageBlob
+    claimed_at = datetime.now(timezone.utc)
+    rows = db.session.execute(
+        select(blob.sha256, blob.file_path, blob.derivatives_attempts)
+        .where(
+            or_(
+                and_(
+                    blob.derivatives_status == "pending",
+                    or_(blob.derivatives_claimed_at.is_(None), blob.derivatives_claimed_at < run_started),
+                ),
+                and_(
+                    blob.derivatives_status == "rendering",
+                    blob.derivatives_claimed_at < claimed_at - timedelta(seconds=STALE_CLAIM_SECONDS),
+                ),
+            )
+        )
+        .order_by(blob.created_at, blob.sha256)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if rows:
+        db.session.execute(
+            update(blob)
+            .where(blob.sha256.in_([row.sha256 for row in rows]))
+            .values(
+                derivatives_status="rendering",
+                derivatives_claimed_at=claimed_at,
+                derivatives_attempts=blob.derivatives_attempts + 1,
+            )
+        )
+    db.session.commit()
+    return rows, claimed_at
+
+
+def _settle(digests: list[str], status: str, claimed_at: datetime) -> None:
+    if not digests:
+        return
+    blob = ProcurementReviewImageBlob
+    # Only claims still ours: a stale one may have been taken over meanwhile.
+    db.session.execute(
+        update(blob)
+        .where(
+            blob.sha256.in_(digests),
+            blob.derivatives_status == "rendering",
+            blob.derivatives_claimed_at == claimed_at,
+        )
+        .values(derivatives_status=status)
+    )
+
+
+def generate_review_image_derivatives(
+    *, workers: int | None = None, batch_size: int = DEFAULT_BATCH_SIZE
+) -> DerivativeRun:
+    """Render derivatives of all pending blobs; see the module docstring."""
+    root = review_images_root()
+    run = DerivativeRun()
+    run_started = datetime.now(timezone.utc)
+    # Spawned workers do not inherit the parent's database connections.
+    context = multiprocessing.get_context("spawn")
+    max_workers = workers or derivative_workers()
+    pool: ProcessPoolExecutor | None = None
+    try:
+        while True:
+            blobs, claimed_at = _claim_batch(batch_size, run_started)
+            if not blobs:
+                return run
+            if pool is None:
+                pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+            futures = {
+                blob.sha256: pool.submit(render_derivatives, os.path.join(root, *blob.file_path.split("/")))
+                for blob in blobs
+            }
+            outcome: dict[str, list[str]] = {"ready": [], "pending": [], "failed": []}
+            for blob in blobs:
+                try:
+                    futures[blob.sha256].result()
+                except TRANSIENT_ERRORS as exc:
+                    if isinstance(exc, BrokenProcessPool) and pool is not None:
+                        pool.shutdown(wait=False)
+                        pool = None  # unusable now; the next batch starts a new one
+                    if blob.derivatives_attempts + 1 < MAX_DERIVATIVE_ATTEMPTS:
+                        outcome["pending"].append(blob.sha256)
+                    else:
+                        outcome["failed"].append(blob.sha256)
+                except Exception:
+                    # Undecodable upload; `--requeue-failed` puts it back.
+                    outcome["failed"].append(blob.sha256)
+                else:
+                    outcome["ready"].append(blob.sha256)
+            for status, digests in outcome.items():
+                _settle(digests, status, claimed_at)
+            db.session.commit()
+            run.ready += len(outcome["ready"])
+            run.deferred += len(outcome["pending"])
+            run.failed.extend(outcome["failed"])
+            if len(blobs) < batch_size:
+                return run
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def requeue_failed_review_image_derivatives() -> int:
+    """Put every ``failed`` blob back to ``pending`` with a fresh attempt count."""
+    blob = ProcurementReviewImageBlob
+    requeued = db.session.execute(
+        update(blob)
+        .where(blob.derivatives_status == "failed")
+        .values(derivatives_status="pending", derivatives_claimed_at=None, derivatives_attempts=0)
+    ).rowcount
+    db.session.commit()
+    return requeued
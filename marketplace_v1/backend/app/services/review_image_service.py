@@ -0,0 +1,264 @@
+"""Content-addressed storage for procurement review images.
+
+Uploads are streamed to a temporary file while their SHA-256 is computed,
+then stored once under ``blobs/<aa>/<bb>/<digest><ext>`` below the review
+image root; the file is moved there only once the transaction recording it
+commits, and dropped if it rolls back. Every
+``procurement_order_review_images`` row points at its blob by digest and the
+blob counts its references, so the same photo attached to many reviews takes
+the disk (and the backups) once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import IO
+
+from flask import current_app
+from sqlalchemy import event, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from werkzeug.utils import secure_filename
+
+from app.extensions import db
+from app.models import ProcurementOrderReviewImage, ProcurementReviewImageBlob
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif")
+# The same bytes uploaded as .jpeg and .jpg share one blob name.
+CANONICAL_EXTENSIONS = {".jpeg": ".jpg"}
+BLOB_DIRECTORY = "blobs"
+TEMP_DIRECTORY = "tmp"
+CHUNK_SIZE = 64 * 1024
+# Files younger than this may belong to an upload still in flight.
+DEFAULT_PRUNE_MIN_AGE_SECONDS = 60 * 60
+_PENDING_INFO_KEY = "review_image_pending_blobs"
+# WebP derivatives written next to each blob by
+# app.services.review_image_derivative_service: variant -> (box, crop to box).
+DERIVATIVE_VARIANTS = {"thumb": ((320, 320), True), "display": ((1280, 1280), False)}
+
+
+@dataclass(frozen=True)
+class StoredImage:
+    sha256: str
+    file_path: str
+
+
+def review_images_root() -> str:
+    return os.path.join(current_app.instance_path, "uploads", "procurement_reviews")
+
+
+def is_blob_path(relative_path: str) -> bool:
+    return relative_path.replace("\\", "/").startswith(f"{BLOB_DIRECTORY}/")
+
+
+def is_legacy_review_path(relative_path: str) -> bool:
+    """``<review id>/<file>``: where images were stored before content addressing."""
+    parts = relative_path.replace("\\", "/").split("/")
+    return len(parts) == 2 and parts[0].isdigit() and bool(parts[1])
+
+
+def derivative_path(file_path: str, variant: str) -> str:
+    """Path of ``variant`` of the image at ``file_path``, beside it."""
+    return f"{os.path.splitext(file_path)[0]}.{variant}.webp"
+
+
+def _dialect_insert():
+    dialect_name = db.session.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        return postgresql.insert
+    if dialect_name == "sqlite":
+        return sqlite.insert
+    raise NotImplementedError(f"review image blob upsert is not implemented for {dialect_name}")
+
+
+def _hash_to_temp(stream: IO[bytes]) -> tuple[str, str, int]:
+    """Copy ``stream`` to a temp file next to the blob store, hashing as it
+    goes. Returns ``(temp path, hex digest, size)``."""
+    temp_dir = os.path.join(review_images_root(), TEMP_DIRECTORY)
+    os.makedirs(temp_dir, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    with tempfile.NamedTemporaryFile(dir=temp_dir, delete=False) as temp_file:
+        try:
+            while chunk := stream.read(CHUNK_SIZE):
+                digest.update(chunk)
+                size += len(chunk)
+                temp_file.write(chunk)
+        except BaseException:
+            temp_file.close()
+            os.unlink(temp_file.name)
+            raise
+    return temp_file.name, digest.hexdigest(), size
+
+
+def _add_reference(sha256: str, file_path: str, size_bytes: int) -> str:
+    """Count one more reference to the blob, creating its row if needed, and
+    return the blob's stored path (another upload may have recorded it first)."""
+    table = ProcurementReviewImageBlob.__table__
+    stmt = _dialect_insert()(table).values(sha256=sha256, file_path=file_path, size_bytes=size_bytes, ref_count=1)
+    return db.session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[table.c.sha256], set_={"ref_count": table.c.ref_count + 1}
+        ).returning(table.c.file_path)
+    ).scalar_one()
+
+
+def _place_blob(temp_path: str, sha256: str, ext: str, size_bytes: int) -> tuple[StoredImage, bool]:
+    """Record a hashed temp file as a blob, or drop it if the bytes are stored
+    already. A new blob's file is moved into place when the caller's
+    transaction commits. Returns the stored image and whether it was a
+    duplicate."""
+    root = review_images_root()
+    existing = db.session.execute(
+        select(ProcurementReviewImageBlob.file_path).where(ProcurementReviewImageBlob.sha256 == sha256)
+    ).scalar_one_or_none()
+    if existing is not None:
+        os.unlink(temp_path)
+        return StoredImage(sha256=sha256, file_path=_add_reference(sha256, existing, size_bytes)), True
+    relative_path = f"{BLOB_DIRECTORY}/{sha256[:2]}/{sha256[2:4]}/{sha256}{ext}"
+    stored_path = _add_reference(sha256, relative_path, size_bytes)
+    if stored_path == relative_path:
+        absolute_path = os.path.join(root, *relative_path.split("/"))
+        db.session.info.setdefault(_PENDING_INFO_KEY, []).append((temp_path, absolute_path))
+    else:
+        os.unlink(temp_path)  # a concurrent upload recorded it under another extension
+    return StoredImage(sha256=sha256, file_path=stored_path), False
+
+
+@event.listens_for(Session, "after_commit")
+def _move_committed_blobs(session: Session) -> None:
+    for temp_path, absolute_path in session.info.pop(_PENDING_INFO_KEY, []):
+        os.makedirs(os.path.dirname(absolute_path), exist_ok=True)
+        # Same digest, same bytes: replacing a concurrent writer's file is harmless.
+        os.replace(temp_path, absolute_path)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_uncommitted_blobs(session: Session) -> None:
+    for temp_path, _ in session.info.pop(_PENDING_INFO_KEY, []):
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+
+
+def store_review_image(file_storage) -> tuple[StoredImage | None, str | None]:
+    """Store an uploaded image in the caller's transaction, deduplicated by
+    content. Returns ``(stored image, None)`` or ``(None, error message)``."""
+    filename = secure_filename(file_storage.filename or "")
+    if not filename:
+        return None, "invalid image filename"
+    ext = os.path.splitext(filename)[1].lower()
+    if ext not in IMAGE_EXTENSIONS:
+        return None, "only .jpg, .jpeg, .png, .webp, .gif images are allowed"
+    temp_path, sha256, size_bytes = _hash_to_temp(file_storage.stream)
+    stored, _ = _place_blob(temp_path, sha256, CANONICAL_EXTENSIONS.get(ext, ext), size_bytes)
+    return stored, None
+
+
+def dedupe_legacy_review_images(*, batch_size: int = 200) -> tuple[int, int, int]:
+    """Move images stored before content addressing into the blob store.
+
+    Works through rows without a digest in id order, ``batch_size`` per
+    commit; the per-review files are deleted once their batch has committed.
+    Returns ``(migrated, deduplicated, missing)``: rows moved, of those the
+    ones whose bytes were already stored, and rows whose file is gone (left
+    untouched).
+    """
+    root = review_images_root()
+    migrated = deduplicated = missing = 0
+    last_id = 0
+    while True:
+        rows = list(
+            db.session.execute(
+                select(ProcurementOrderReviewImage)
+                .where(
+                    ProcurementOrderReviewImage.content_sha256.is_(None),
+                    ProcurementOrderReviewImage.image_id > last_id,
+                )
+                .order_by(ProcurementOrderReviewImage.image_id)
+                .limit(batch_size)
+            ).scalars()
+        )
+        if not rows:
+            return migrated, deduplicated, missing
+        last_id = rows[-1].image_id
+        legacy_paths: list[str] = []
+        for row in rows:
+            legacy_path = os.path.join(root, *row.file_path.replace("\\", "/").split("/"))
+            if not os.path.isfile(legacy_path):
+                missing += 1
+                continue
+            with open(legacy_path, "rb") as legacy_file:
+                temp_path, sha256, size_bytes = _hash_to_temp(legacy_file)
+            ext = os.path.splitext(legacy_path)[1].lower()
+            stored, duplicate = _place_blob(temp_path, sha256, CANONICAL_EXTENSIONS.get(ext, ext), size_bytes)
+            deduplicated += duplicate
+            row.file_path = stored.file_path
+            row.content_sha256 = stored.sha256
+            legacy_paths.append(legacy_path)
+            migrated += 1
+        db.session.commit()
+        for legacy_path in legacy_paths:
+            os.unlink(legacy_path)
+            try:
+                os.rmdir(os.path.dirname(legacy_path))
+            except OSError:
+                pass  # other images of the review are still there
+
+
+def prune_review_image_blobs(*, min_age_seconds: int = DEFAULT_PRUNE_MIN_AGE_SECONDS) -> int:
+    """Recount blob references and delete blobs no image uses any more.
+
+    Review images can disappear without touching the counters (reviews are
+    removed by cascade with their procurement order), so the counts are
+    recomputed first. A blob's derivatives go with it. Files in the blob
+    store without a row, and temp files, older than ``min_age_seconds``
+    (uploads rolled back mid-request) are removed too. Returns the number of
+    files deleted.
+    """
+    references = (
+        select(func.count())
+        .where(ProcurementOrderReviewImage.content_sha256 == ProcurementReviewImageBlob.sha256)
+        .scalar_subquery()
+    )
+    db.session.execute(update(ProcurementReviewImageBlob).values(ref_count=references))
+    unused = list(
+        db.session.execute(
+            select(ProcurementReviewImageBlob).where(ProcurementReviewImageBlob.ref_count == 0)
+        ).scalars()
+    )
+    for blob in unused:
+        db.session.delete(blob)
+    db.session.commit()
+
+    root = review_images_root()
+    deleted = 0
+    for blob in unused:
+        derivatives = [derivative_path(blob.file_path, variant) for variant in DERIVATIVE_VARIANTS]
+        for file_path in (blob.file_path, *derivatives):
+            try:
+                os.unlink(os.path.join(root, *file_path.split("/")))
+                deleted += 1
+            except FileNotFoundError:
+                pass
+
+    known: set[str] = set()
+    for file_path in db.session.execute(select(ProcurementReviewImageBlob.file_path)).scalars():
+        known.add(file_path)
+        known.update(derivative_path(file_path, variant) for variant in DERIVATIVE_VARIANTS)
+    cutoff = time.time() - min_age_seconds
+    for directory in (BLOB_DIRECTORY, TEMP_DIRECTORY):
+        for dirpath, _, filenames in os.walk(os.path.join(root, directory)):
+            for filename in filenames:
+                absolute_path = os.path.join(dirpath, filename)
+                relative_path = os.path.relpath(absolute_path, root).replace(os.sep, "/")
+                if relative_path in known or os.path.getmtime(absolute_path) > cutoff:
+                    continue
+                os.unlink(absolute_path)
+                deleted += 1
+    return deleted
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from sqlalchemy import ColumnElement, column, func, literal, literal_column, or_, select, table
+
+from app.extensions import db
+from app.models.search_index import SEARCH_INDEXED_COLUMNS, fts_table_name
+
+# FTS5's trigram tokenizer cannot match terms shorter than one trigram.
+MIN_FTS_TERM_LENGTH = 3
+
+
+def text_search(table_name: str, term: str) -> tuple[ColumnElement[bool], ColumnElement[float]]:
+    """Build ``(predicate, relevance)`` for a substring search on ``table_name``.
+
+    ``table_name`` is one of the tables in ``SEARCH_INDEXED_COLUMNS``; every
+    indexed name column of it is searched. Higher relevance is a better match.
+    On PostgreSQL the predicate is served by the pg_trgm GIN indexes and
+    relevance is trigram similarity; on SQLite the FTS5 trigram table is used
+    and relevance is the negated bm25 score.
+    """
+    source = db.metadata.tables[table_name]
+    pk_name, column_names = SEARCH_INDEXED_COLUMNS[table_name]
+    columns = [source.c[name] for name in column_names]
+    substring_match = or_(*[col.icontains(term, autoescape=True) for col in columns])
+
+    dialect_name = db.session.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        relevance = func.greatest(*[func.coalesce(func.similarity(col, term), 0.0) for col in columns])
+        return substring_match, relevance
+
+    if dialect_name == "sqlite" and len(term) >= MIN_FTS_TERM_LENGTH:
+        fts_name = fts_table_name(table_name)
+        fts = table(fts_name, column("rowid"))
+        fts_match = literal_column(fts_name).op("MATCH")(_fts5_phrase(term))
+        pk = source.c[pk_name]
+        predicate = pk.in_(select(fts.c.rowid).where(fts_match))
+        relevance = (
+            select(-func.bm25(literal_column(fts_name)))
+            .where(fts.c.rowid == pk, fts_match)
+            .scalar_subquery()
+        )
+        return predicate, relevance
+
+    return substring_match, literal(0.0)
+
+
+def _fts5_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
@@ -0,0 +1,80 @@
+"""Keep ``supplier_rating_stats`` in step with procurement reviews.
+
+Each review write adjusts its supplier's row by the change in rating with
+one upsert whose increments are applied in SQL, so concurrent reviews of the
+same supplier never overwrite each other's counts.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.extensions import db
+from app.models import ProcurementOrderReview, SupplierRatingStats
+from app.models.supplier_rating_stats import RATING_VALUES
+
+COUNTER_COLUMNS = ("rating_sum", "rating_count", *(f"rating_{rating}_count" for rating in RATING_VALUES))
+
+
+def _dialect_insert():
+    dialect_name = db.session.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        return postgresql.insert
+    if dialect_name == "sqlite":
+        return sqlite.insert
+    raise NotImplementedError(f"supplier rating stats upsert is not implemented for {dialect_name}")
+
+
+def record_rating_change(supplier_id: int, *, old_rating: int | None = None, new_rating: int | None = None) -> None:
+    """Apply a review's rating going from ``old_rating`` to ``new_rating``
+    (``None`` for a review that did not or no longer exists) in the caller's
+    transaction."""
+    if old_rating == new_rating:
+        return
+    deltas = dict.fromkeys(COUNTER_COLUMNS, 0)
+    if old_rating is not None:
+        deltas["rating_sum"] -= old_rating
+        deltas["rating_count"] -= 1
+        deltas[f"rating_{old_rating}_count"] -= 1
+    if new_rating is not None:
+        deltas["rating_sum"] += new_rating
+        deltas["rating_count"] += 1
+        deltas[f"rating_{new_rating}_count"] += 1
+
+    now = datetime.now(timezone.utc)
+    table = SupplierRatingStats.__table__
+    stmt = _dialect_insert()(table).values(supplier_id=supplier_id, updated_at=now, **deltas)
+    db.session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[table.c.supplier_id],
+            set_={
+                **{name: table.c[name] + stmt.excluded[name] for name in COUNTER_COLUMNS},
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+    )
+
+
+def rebuild_supplier_rating_stats() -> int:
+    """Recompute every supplier's stats from the reviews in one
+    INSERT ... SELECT and commit. Returns the number of suppliers rated."""
+    rating = ProcurementOrderReview.rating
+    counters = [
+        func.sum(rating).label("rating_sum"),
+        func.count().label("rating_count"),
+        *(func.sum(case((rating == value, 1), else_=0)).label(f"rating_{value}_count") for value in RATING_VALUES),
+    ]
+    db.session.execute(delete(SupplierRatingStats))
+    result = db.session.execute(
+        insert(SupplierRatingStats).from_select(
+            ["supplier_id", *COUNTER_COLUMNS, "updated_at"],
+            select(ProcurementOrderReview.supplier_id, *counters, func.now()).group_by(
+                ProcurementOrderReview.supplier_id
+            ),
+        )
+    )
+    db.session.commit()
+    return result.rowcount
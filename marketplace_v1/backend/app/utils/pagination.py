@@ -1 +1,164 @@
-"""Pagination utilities placeholder for v1."""
+"""Keyset pagination shared by the list endpoints.
+
+A listing is ordered by one or more sort columns that end in a unique id, so
+the order is total and ties never reorder between requests. The client gets
+an opaque cursor holding the last row's sort values; the next page is the
+rows strictly after it, which an index on the same columns serves without
+reading the skipped rows. Cursors are signed so clients cannot forge
+arbitrary predicates, and bound to the listing they came from.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Generic, TypeVar
+
+from flask import current_app
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import ColumnElement, Select, func, select, tuple_
+
+from app.extensions import db
+
+T = TypeVar("T")
+
+DEFAULT_TOTAL_CAP = 10_000
+_CURSOR_SALT = "pagination-cursor"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor is malformed, tampered with or from another listing."""
+
+
+@dataclass
+class Page(Generic[T]):
+    items: list[T]
+    next_cursor: str | None
+    total: int | None = None
+    total_is_exact: bool = True
+
+    def pagination(self, *, page_size: int, page: int | None = None) -> dict[str, object]:
+        """The ``pagination`` block returned by list endpoints."""
+        body: dict[str, object] = {"page_size": page_size, "next_cursor": self.next_cursor}
+        if page is not None:
+            body["page"] = page
+        if self.total is not None:
+            body["total"] = self.total
+            body["total_is_exact"] = self.total_is_exact
+            body["total_pages"] = (self.total + page_size - 1) // page_size
+        return body
+
+
+def _serializer() -> URLSafeSerializer:
+    secret = current_app.config.get("PAGINATION_CURSOR_SECRET") or current_app.config["JWT_SECRET_KEY"]
+    return URLSafeSerializer(secret, salt=_CURSOR_SALT)
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        raise ValueError("unknown cursor value")
+    return value
+
+
+def encode_cursor(scope: str, values: Sequence[Any]) -> str:
+    """Sign ``values`` (the last row's sort key) for the listing ``scope``."""
+    return _serializer().dumps([scope, [_dump_value(value) for value in values]])
+
+
+def decode_cursor(scope: str, cursor: str, *, arity: int) -> tuple[Any, ...]:
+    """Verify a cursor from :func:`encode_cursor` and return its sort values."""
+    try:
+        cursor_scope, values = _serializer().loads(cursor)
+        if cursor_scope != scope or len(values) != arity:
+            raise ValueError("cursor does not belong to this listing")
+        return tuple(_load_value(value) for value in values)
+    except (BadSignature, ValueError, TypeError) as exc:
+        raise InvalidCursorError(cursor) from exc
+
+
+def after_keyset(
+    columns: Sequence[ColumnElement[Any]],
+    values: Sequence[Any],
+    *,
+    descending: bool,
+) -> ColumnElement[bool]:
+    """Row-value predicate selecting rows after ``values`` in the sort order."""
+    if len(columns) == 1:
+        return columns[0] < values[0] if descending else columns[0] > values[0]
+    if descending:
+        return tuple_(*columns) < tuple_(*values)
+    return tuple_(*columns) > tuple_(*values)
+
+
+def capped_count(stmt: Select, cap: int = DEFAULT_TOTAL_CAP) -> tuple[int, bool]:
+    """Count ``stmt``'s rows, reading at most ``cap + 1`` of them.
+
+    Returns ``(total, is_exact)``; past the cap the total is ``cap`` and only
+    a lower bound.
+    """
+    limited = stmt.order_by(None).limit(cap + 1).subquery()
+    total = db.session.execute(select(func.count()).select_from(limited)).scalar_one()
+    if total > cap:
+        return cap, False
+    return total, True
+
+
+def paginate(
+    stmt: Select,
+    *,
+    scope: str,
+    sort: Sequence[ColumnElement[Any]],
+    page_size: int,
+    descending: bool = True,
+    cursor: str | None = None,
+    page: int = 1,
+    total_cap: int | None = None,
+    key: Callable[[Any], Sequence[Any]] | None = None,
+    scalars: bool = True,
+) -> Page[Any]:
+    """Run one page of ``stmt`` ordered by ``sort``.
+
+    ``sort`` must end with a unique column (normally the primary key) and
+    every column is ordered in the same direction. With ``cursor`` the page
+    starts after the cursor's row; otherwise ``page`` falls back to OFFSET so
+    numbered-page clients keep working. ``key`` extracts the sort values from
+    a result item and defaults to reading each column's attribute name.
+    ``total_cap`` adds a capped count to the page.
+    """
+    if key is None:
+        names = [column.key for column in sort]
+
+        def key(item: Any) -> Sequence[Any]:
+            return [getattr(item, name) for name in names]
+
+    total: int | None = None
+    total_is_exact = True
+    if total_cap is not None:
+        total, total_is_exact = capped_count(stmt, total_cap)
+
+    ordered = stmt.order_by(*[column.desc() if descending else column.asc() for column in sort])
+    if cursor:
+        values = decode_cursor(scope, cursor, arity=len(sort))
+        ordered = ordered.where(after_keyset(sort, values, descending=descending))
+    elif page > 1:
+        ordered = ordered.offset((page - 1) * page_size)
+
+    result = db.session.execute(ordered.limit(page_size + 1))
+    rows = list(result.unique().scalars() if scalars else result)
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = encode_cursor(scope, key(rows[-1])) if has_more else None
+    return Page(items=rows, next_cursor=next_cursor, total=total, total_is_exact=total_is_exact)
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from sqlalchemy import bindparam
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import Values
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import DateTime
+
+
+class add_days(FunctionElement):
+    """``timestamp + days`` rendered for the dialects the app runs on.
+
+    PostgreSQL uses interval arithmetic; SQLite (tests) uses ``datetime()``.
+    """
+
+    type = DateTime(timezone=True)
+    name = "add_days"
+    inherit_cache = True
+
+
+@compiles(add_days)
+def _compile_add_days(element: add_days, compiler, **kw) -> str:
+    timestamp, days = list(element.clauses)
+    return f"({compiler.process(timestamp, **kw)} + {compiler.process(days, **kw)} * INTERVAL '1 day')"
+
+
+@compiles(add_days, "sqlite")
+def _compile_add_days_sqlite(element: add_days, compiler, **kw) -> str:
+    timestamp, days = list(element.clauses)
+    return f"datetime({compiler.process(timestamp, **kw)}, '+' || {compiler.process(days, **kw)} || ' days')"
+
+
+@compiles(Values, "sqlite")
+def _compile_values_sqlite(element: Values, compiler, asfrom: bool = False, **kw) -> str:
+    """SQLite cannot name the columns of ``(VALUES ...) AS v (a, b)``, so
+    render the rows as a ``SELECT ... UNION ALL SELECT ...`` subquery."""
+    columns = list(element.columns)
+    selects = []
+    for index, row in enumerate(row for rows in element._data for row in rows):
+        parts = []
+        for column, value in zip(columns, row):
+            rendered = compiler.process(bindparam(None, value, type_=column.type), **kw)
+            parts.append(f"{rendered} AS {compiler.preparer.quote(column.name)}" if index == 0 else rendered)
+        selects.append("SELECT " + ", ".join(parts))
+    body = " UNION ALL ".join(selects)
+    if asfrom:
+        return f"({body}) AS {compiler.preparer.quote(element.name)}"
+    return body
@@ -0,0 +1,72 @@
+"""add trigram name-search indexes for catalog and admin lookups
+
+Revision ID: 20261017_0024
+Revises: 20261017_0023
+Create Date: 2026-10-17 10:00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0024"
+down_revision: str | None = "20261017_0023"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+SEARCH_INDEXED_COLUMNS = {
+    "products": ("id", ("product_name",)),
+    "users": ("id", ("email", "first_name", "last_name")),
+    "suppliers": ("supplier_id", ("supplier_name",)),
+}
+
+
+def upgrade() -> None:
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for table_name, (_, columns) in SEARCH_INDEXED_COLUMNS.items():
+            for column in columns:
+                op.execute(
+                    f"CREATE INDEX IF NOT EXISTS ix_{table_name}_{column}_trgm "
+                    f"ON {table_name} USING gin ({column} gin_trgm_ops)"
+                )
+    elif dialect_name == "sqlite":
+        for table_name, (pk, columns) in SEARCH_INDEXED_COLUMNS.items():
+            fts = f"{table_name}_fts"
+            column_list = ", ".join(columns)
+            new_values = ", ".join(f"new.{column}" for column in columns)
+            old_values = ", ".join(f"old.{column}" for column in columns)
+            op.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+                f"{column_list}, content='{table_name}', content_rowid='{pk}', tokenize='trigram')"
+            )
+            op.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table_name} BEGIN "
+                f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.{pk}, {new_values}); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table_name} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.{pk}, {old_values}); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column_list} ON {table_name} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.{pk}, {old_values}); "
+                f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.{pk}, {new_values}); END"
+            )
+            op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        for table_name, (_, columns) in SEARCH_INDEXED_COLUMNS.items():
+            for column in columns:
+                op.execute(f"DROP INDEX IF EXISTS ix_{table_name}_{column}_trgm")
+    elif dialect_name == "sqlite":
+        for table_name in SEARCH_INDEXED_COLUMNS:
+            fts = f"{table_name}_fts"
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {fts}")
@@ -0,0 +1,65 @@
+"""store inventory expiry as an indexed expires_at column
+
+Revision ID: 20261017_0025
+Revises: 20261017_0024
+Create Date: 2026-10-17 11:00:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0025"
+down_revision: str | None = "20261017_0024"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+INVENTORY_TABLES = ("inventory_items", "fresh_produce_inventory")
+BACKFILL_BATCH_SIZE = 5000
+
+
+def _expires_at_sql(table_name: str, dialect_name: str) -> str:
+    validity = f"(SELECT products.validity_days FROM products WHERE products.id = {table_name}.product_id)"
+    if dialect_name == "sqlite":
+        return f"datetime(updated_at, '+' || {validity} || ' days')"
+    return f"(updated_at + {validity} * INTERVAL '1 day')"
+
+
+def _backfill(table_name: str) -> None:
+    bind = op.get_bind()
+    expires_at = _expires_at_sql(table_name, bind.dialect.name)
+    last_id = 0
+    while True:
+        upper_id = bind.execute(
+            sa.text(
+                f"SELECT MAX(id) FROM (SELECT id FROM {table_name} WHERE id > :last_id "
+                f"ORDER BY id LIMIT :batch_size) AS batch"
+            ),
+            {"last_id": last_id, "batch_size": BACKFILL_BATCH_SIZE},
+        ).scalar()
+        if upper_id is None:
+            return
+        bind.execute(
+            sa.text(f"UPDATE {table_name} SET expires_at = {expires_at} WHERE id > :last_id AND id <= :upper_id"),
+            {"last_id": last_id, "upper_id": upper_id},
+        )
+        last_id = upper_id
+
+
+def upgrade() -> None:
+    for table_name in INVENTORY_TABLES:
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.add_column(sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True))
+        _backfill(table_name)
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.alter_column("expires_at", existing_type=sa.DateTime(timezone=True), nullable=False)
+        op.create_index(f"ix_{table_name}_expires_at", table_name, ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    for table_name in reversed(INVENTORY_TABLES):
+        op.drop_index(f"ix_{table_name}_expires_at", table_name=table_name)
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column("expires_at")
@@ -0,0 +1,31 @@
+"""index inventory tables for newest-first pagination
+
+Revision ID: 20261017_0026
+Revises: 20261017_0025
+Create Date: 2026-10-17 12:00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0026"
+down_revision: str | None = "20261017_0025"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_inventory_items_entry_date_id", "inventory_items", ["entry_date", "id"], unique=False)
+    op.create_index(
+        "ix_fresh_produce_inventory_entry_date_id",
+        "fresh_produce_inventory",
+        ["entry_date", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_fresh_produce_inventory_entry_date_id", table_name="fresh_produce_inventory")
+    op.drop_index("ix_inventory_items_entry_date_id", table_name="inventory_items")
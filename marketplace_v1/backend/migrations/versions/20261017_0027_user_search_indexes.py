@@ -0,0 +1,43 @@
+"""index users for role filtering and prefix search
+
+Revision ID: 20261017_0027
+Revises: 20261017_0026
+Create Date: 2026-10-17 13:00:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0027"
+down_revision: str | None = "20261017_0026"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _lower_prefix(column: str) -> sa.TextClause:
+    if op.get_bind().dialect.name == "postgresql":
+        return sa.text(f"lower({column}) varchar_pattern_ops")
+    return sa.text(f"lower({column})")
+
+
+def upgrade() -> None:
+    op.create_index("ix_user_roles_role_id_user_id", "user_roles", ["role_id", "user_id"], unique=False)
+    op.create_index(
+        "ix_users_email_prefix",
+        "users",
+        ["email"],
+        unique=False,
+        postgresql_ops={"email": "varchar_pattern_ops"},
+    )
+    op.create_index("ix_users_first_name_prefix", "users", [_lower_prefix("first_name")], unique=False)
+    op.create_index("ix_users_last_name_prefix", "users", [_lower_prefix("last_name")], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_last_name_prefix", table_name="users")
+    op.drop_index("ix_users_first_name_prefix", table_name="users")
+    op.drop_index("ix_users_email_prefix", table_name="users")
+    op.drop_index("ix_user_roles_role_id_user_id", table_name="user_roles")
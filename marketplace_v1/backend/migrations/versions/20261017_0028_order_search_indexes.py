@@ -0,0 +1,43 @@
+"""index orders and order items for order search
+
+Revision ID: 20261017_0028
+Revises: 20261017_0027
+Create Date: 2026-10-17 14:00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0028"
+down_revision: str | None = "20261017_0027"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+ORDER_INDEXES = {
+    "ix_orders_buyer_id_created_at_id": ["buyer_id", "created_at", "id"],
+    "ix_orders_seller_id_created_at_id": ["seller_id", "created_at", "id"],
+    "ix_orders_supplier_id_created_at_id": ["supplier_id", "created_at", "id"],
+    "ix_orders_status_created_at_id": ["status", "created_at", "id"],
+    "ix_orders_created_at_id": ["created_at", "id"],
+}
+ORDER_ITEM_INDEXES = {
+    "ix_order_items_order_id": ["order_id"],
+    "ix_order_items_product_id_order_id": ["product_id", "order_id"],
+    "ix_order_items_sku_order_id": ["sku", "order_id"],
+}
+
+
+def upgrade() -> None:
+    for name, columns in ORDER_INDEXES.items():
+        op.create_index(name, "orders", columns, unique=False)
+    for name, columns in ORDER_ITEM_INDEXES.items():
+        op.create_index(name, "order_items", columns, unique=False)
+
+
+def downgrade() -> None:
+    for name in ORDER_ITEM_INDEXES:
+        op.drop_index(name, table_name="order_items")
+    for name in ORDER_INDEXES:
+        op.drop_index(name, table_name="orders")
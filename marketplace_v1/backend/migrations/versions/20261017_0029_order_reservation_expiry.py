@@ -0,0 +1,48 @@
+"""add a reservation deadline to orders
+
+Revision ID: 20261017_0029
+Revises: 20261017_0028
+Create Date: 2026-10-17 15:00:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0029"
+down_revision: str | None = "20261017_0028"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+INDEX_NAME = "ix_orders_created_reservation_expires_at"
+# Orders already waiting in "created" get the default one-day hold, counted
+# from their last update.
+BACKFILL_HOLD_DAYS = 1
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("orders") as batch_op:
+        batch_op.add_column(sa.Column("reservation_expires_at", sa.DateTime(timezone=True), nullable=True))
+
+    if op.get_bind().dialect.name == "sqlite":
+        deadline = f"datetime(updated_at, '+{BACKFILL_HOLD_DAYS} days')"
+    else:
+        deadline = f"(updated_at + INTERVAL '{BACKFILL_HOLD_DAYS} day')"
+    op.execute(f"UPDATE orders SET reservation_expires_at = {deadline} WHERE status = 'created'")
+
+    op.create_index(
+        INDEX_NAME,
+        "orders",
+        ["reservation_expires_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'created'"),
+        sqlite_where=sa.text("status = 'created'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="orders")
+    with op.batch_alter_table("orders") as batch_op:
+        batch_op.drop_column("reservation_expires_at")
@@ -0,0 +1,93 @@
+"""add the inventory movement ledger and stock snapshots
+
+Revision ID: 20261017_0030
+Revises: 20261017_0029
+Create Date: 2026-10-17 16:00:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0030"
+down_revision: str | None = "20261017_0029"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# inventory kind -> (table, stock column)
+INVENTORY_TABLES = {
+    "regular": ("inventory_items", "quantity"),
+    "fresh_produce": ("fresh_produce_inventory", "estimated_quantity"),
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "inventory_movements",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("inventory_kind", sa.String(length=20), nullable=False),
+        sa.Column("inventory_item_id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("movement_type", sa.String(length=32), nullable=False),
+        sa.Column("quantity_delta", sa.Integer(), nullable=False),
+        sa.Column("reserved_delta", sa.Integer(), nullable=False),
+        sa.Column("occurred_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_inventory_movements_occurred_at_id", "inventory_movements", ["occurred_at", "id"])
+    op.create_index(
+        "ix_inventory_movements_lot_occurred_at",
+        "inventory_movements",
+        ["inventory_kind", "inventory_item_id", "occurred_at"],
+    )
+    op.create_index(
+        "ix_inventory_movements_product_id_occurred_at", "inventory_movements", ["product_id", "occurred_at"]
+    )
+
+    op.create_table(
+        "inventory_snapshots",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("as_of", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("as_of"),
+    )
+    op.create_table(
+        "inventory_snapshot_lots",
+        sa.Column("snapshot_id", sa.Integer(), nullable=False),
+        sa.Column("inventory_kind", sa.String(length=20), nullable=False),
+        sa.Column("inventory_item_id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("reserved_quantity", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["snapshot_id"], ["inventory_snapshots.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("snapshot_id", "inventory_kind", "inventory_item_id"),
+    )
+    op.create_index(
+        "ix_inventory_snapshot_lots_snapshot_id_product_id",
+        "inventory_snapshot_lots",
+        ["snapshot_id", "product_id"],
+    )
+
+    # Opening balances, so the ledger sums to the stock already on hand.
+    for inventory_kind, (table_name, stock_column) in INVENTORY_TABLES.items():
+        op.execute(
+            "INSERT INTO inventory_movements "
+            "(inventory_kind, inventory_item_id, product_id, movement_type, "
+            "quantity_delta, reserved_delta, occurred_at) "
+            f"SELECT '{inventory_kind}', id, product_id, 'opening', "
+            f"{stock_column}, reserved_quantity, CURRENT_TIMESTAMP "
+            f"FROM {table_name} WHERE {stock_column} <> 0 OR reserved_quantity <> 0"
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_inventory_snapshot_lots_snapshot_id_product_id", table_name="inventory_snapshot_lots")
+    op.drop_table("inventory_snapshot_lots")
+    op.drop_table("inventory_snapshots")
+    op.drop_index("ix_inventory_movements_product_id_occurred_at", table_name="inventory_movements")
+    op.drop_index("ix_inventory_movements_lot_occurred_at", table_name="inventory_movements")
+    op.drop_index("ix_inventory_movements_occurred_at_id", table_name="inventory_movements")
+    op.drop_table("inventory_movements")
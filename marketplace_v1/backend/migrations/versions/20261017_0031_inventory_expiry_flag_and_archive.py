@@ -0,0 +1,60 @@
+"""flag expired inventory lots and add archive tables
+
+Revision ID: 20261017_0031
+Revises: 20261017_0030
+Create Date: 2026-10-17 17:00:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0031"
+down_revision: str | None = "20261017_0030"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# live table -> stock column
+INVENTORY_TABLES = {
+    "inventory_items": "quantity",
+    "fresh_produce_inventory": "estimated_quantity",
+}
+
+
+def upgrade() -> None:
+    for table_name, stock_column in INVENTORY_TABLES.items():
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.add_column(sa.Column("is_expired", sa.Boolean(), nullable=False, server_default=sa.false()))
+        op.execute(f"UPDATE {table_name} SET is_expired = true WHERE expires_at <= CURRENT_TIMESTAMP")
+
+        archive_name = f"{table_name}_archive"
+        op.create_table(
+            archive_name,
+            sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column("product_id", sa.Integer(), nullable=False),
+            sa.Column("seller_id", sa.Integer(), nullable=True),
+            sa.Column("supplier_id", sa.Integer(), nullable=True),
+            sa.Column("origin_type", sa.String(length=20), nullable=False),
+            sa.Column("origin", sa.String(length=20), nullable=True),
+            sa.Column("entry_date", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("created_by_admin_user_id", sa.Integer(), nullable=False),
+            sa.Column(stock_column, sa.Integer(), nullable=False),
+            sa.Column("reserved_quantity", sa.Integer(), nullable=False),
+            sa.Column("price_per_unit", sa.Numeric(12, 2), nullable=False),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("archived_at", sa.DateTime(timezone=True), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(f"ix_{archive_name}_product_id", archive_name, ["product_id"])
+
+
+def downgrade() -> None:
+    for table_name in INVENTORY_TABLES:
+        archive_name = f"{table_name}_archive"
+        op.drop_index(f"ix_{archive_name}_product_id", table_name=archive_name)
+        op.drop_table(archive_name)
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column("is_expired")
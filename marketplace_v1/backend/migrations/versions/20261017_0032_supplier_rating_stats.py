@@ -0,0 +1,44 @@
+"""add incrementally maintained supplier rating stats
+
+Revision ID: 20261017_0032
+Revises: 20261017_0031
+Create Date: 2026-10-17 18:00:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0032"
+down_revision: str | None = "20261017_0031"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+RATING_VALUES = range(1, 11)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "supplier_rating_stats",
+        sa.Column("supplier_id", sa.Integer(), nullable=False),
+        sa.Column("rating_sum", sa.Integer(), nullable=False),
+        sa.Column("rating_count", sa.Integer(), nullable=False),
+        *(sa.Column(f"rating_{rating}_count", sa.Integer(), nullable=False) for rating in RATING_VALUES),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["supplier_id"], ["suppliers.supplier_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("supplier_id"),
+    )
+
+    histogram_columns = ", ".join(f"rating_{rating}_count" for rating in RATING_VALUES)
+    histogram_values = ", ".join(f"SUM(CASE WHEN rating = {rating} THEN 1 ELSE 0 END)" for rating in RATING_VALUES)
+    op.execute(
+        f"INSERT INTO supplier_rating_stats (supplier_id, rating_sum, rating_count, {histogram_columns}, updated_at) "
+        f"SELECT supplier_id, SUM(rating), COUNT(*), {histogram_values}, CURRENT_TIMESTAMP "
+        "FROM procurement_order_reviews GROUP BY supplier_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("supplier_rating_stats")
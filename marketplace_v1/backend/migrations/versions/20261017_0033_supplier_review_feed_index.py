@@ -0,0 +1,31 @@
+"""index procurement reviews for the paginated supplier review feed
+
+Revision ID: 20261017_0033
+Revises: 20261017_0032
+Create Date: 2026-10-17 19:00:00
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0033"
+down_revision: str | None = "20261017_0032"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+INDEX_NAME = "ix_procurement_order_reviews_supplier_rating_created_at"
+
+
+def upgrade() -> None:
+    op.create_index(
+        INDEX_NAME,
+        "procurement_order_reviews",
+        ["supplier_id", "rating", "created_at", "review_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="procurement_order_reviews")
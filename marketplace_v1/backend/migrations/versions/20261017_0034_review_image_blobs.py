@@ -0,0 +1,53 @@
+"""store procurement review images by content digest
+
+Revision ID: 20261017_0034
+Revises: 20261017_0033
+Create Date: 2026-10-17 20:00:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0034"
+down_revision: str | None = "20261017_0033"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Existing files keep their per-review paths (content_sha256 stays null)
+# until `flask maintenance dedupe-review-images` moves them into the blob
+# store; the schema change alone touches no files.
+
+
+def upgrade() -> None:
+    op.create_table(
+        "procurement_review_image_blobs",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("file_path", sa.String(length=500), nullable=False),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("sha256"),
+    )
+    with op.batch_alter_table("procurement_order_review_images") as batch_op:
+        batch_op.add_column(sa.Column("content_sha256", sa.String(length=64), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_procurement_order_review_images_content_sha256",
+            "procurement_review_image_blobs",
+            ["content_sha256"],
+            ["sha256"],
+            ondelete="RESTRICT",
+        )
+        batch_op.create_index(
+            "ix_procurement_order_review_images_content_sha256", ["content_sha256"], unique=False
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("procurement_order_review_images") as batch_op:
+        batch_op.drop_index("ix_procurement_order_review_images_content_sha256")
+        batch_op.drop_constraint("fk_procurement_order_review_images_content_sha256", type_="foreignkey")
+        batch_op.drop_column("content_sha256")
+    op.drop_table("procurement_review_image_blobs")
@@ -0,0 +1,36 @@
+"""track thumbnail and webp derivatives of review image blobs
+
+Revision ID: 20261017_0035
+Revises: 20261017_0034
+Create Date: 2026-10-17 21:00:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0035"
+down_revision: str | None = "20261017_0034"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Existing blobs start out pending, so the next
+# `flask maintenance generate-review-image-derivatives` run renders them.
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("procurement_review_image_blobs") as batch_op:
+        batch_op.add_column(
+            sa.Column("derivatives_status", sa.String(length=16), nullable=False, server_default="pending")
+        )
+        batch_op.create_index(
+            "ix_procurement_review_image_blobs_derivatives_status", ["derivatives_status"], unique=False
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("procurement_review_image_blobs") as batch_op:
+        batch_op.drop_index("ix_procurement_review_image_blobs_derivatives_status")
+        batch_op.drop_column("derivatives_status")
@@ -0,0 +1,33 @@
+"""lease snowflake worker ids per process
+
+Revision ID: 20261017_0036
+Revises: 20261017_0035
+Create Date: 2026-10-17 22:00:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0036"
+down_revision: str | None = "20261017_0035"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "id_worker_leases",
+        sa.Column("worker_id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("holder", sa.String(length=64), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("worker_id"),
+    )
+    op.create_index("ix_id_worker_leases_expires_at", "id_worker_leases", ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_id_worker_leases_expires_at", table_name="id_worker_leases")
+    op.drop_table("id_worker_leases")
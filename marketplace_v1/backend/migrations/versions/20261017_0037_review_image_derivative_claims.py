@@ -0,0 +1,35 @@
+"""claim review image derivative work without holding row locks
+
+Revision ID: 20261017_0037
+Revises: 20261017_0036
+Create Date: 2026-10-17 23:00:00
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_0037"
+down_revision: str | None = "20261017_0036"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("procurement_review_image_blobs") as batch_op:
+        batch_op.add_column(sa.Column("derivatives_claimed_at", sa.DateTime(timezone=True), nullable=True))
+        batch_op.add_column(
+            sa.Column("derivatives_attempts", sa.Integer(), nullable=False, server_default=sa.text("0"))
+        )
+
+
+def downgrade() -> None:
+    op.execute(
+        "UPDATE procurement_review_image_blobs SET derivatives_status = 'pending' "
+        "WHERE derivatives_status = 'rendering'"
+    )
+    with op.batch_alter_table("procurement_review_image_blobs") as batch_op:
+        batch_op.drop_column("derivatives_attempts")
+        batch_op.drop_column("derivatives_claimed_at")
@@ -60,6 +60,12 @@ def seed_roles_permissions() -> None:
         "seller.validate",
         "product.read",
         "product.manage",
+        "procurement.read",
+        "procurement.manage",
+        "supplier.read",
+        "supplier.manage",
+        "supplier.rating.read",
+        "supplier.rating.manage",
     ]
 
     permissions = {code: Permission(code=code) for code in permission_codes}
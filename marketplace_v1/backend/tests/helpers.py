@@ -0,0 +1,78 @@
+"""Shared helpers for the API tests."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import InventoryItem, Product, Role, User
+from app.security.password import hash_password
+from app.services.auth_service import build_auth_claims, find_user_by_id
+
+
+def create_user(email: str, role_names: list[str], **fields) -> User:
+    user = User(email=email, password_hash=hash_password("Secret123!"), is_active=True, **fields)
+    user.roles.extend(db.session.query(Role).filter(Role.name.in_(role_names)).all())
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def auth_headers(user_id: int) -> dict[str, str]:
+    user = find_user_by_id(user_id)
+    token = create_access_token(identity=str(user.id), additional_claims=build_auth_claims(user))
+    return {"Authorization": f"Bearer {token}"}
+
+
+def seed_inventory(quantity: int = 5) -> tuple[int, int, int, int]:
+    admin = create_user("admin@example.com", ["admin"])
+    seller = create_user("seller@example.com", ["seller"], seller_status="valid")
+    buyer = create_user("buyer@example.com", ["buyer"])
+    product = Product(product_name="Rice", product_type="grain", product_unit="kg", validity_days=30)
+    db.session.add(product)
+    db.session.flush()
+    item = InventoryItem(
+        product_id=product.id,
+        seller_id=seller.id,
+        created_by_admin_user_id=admin.id,
+        quantity=quantity,
+        price_per_unit=Decimal("2.50"),
+    )
+    db.session.add(item)
+    db.session.commit()
+    return buyer.id, seller.id, product.id, item.id
+
+
+def order_payload(seller_id: int, product_id: int, item_id: int, qty: int) -> dict[str, object]:
+    return {
+        "seller_id": seller_id,
+        "items": [
+            {
+                "sku": "RICE-1",
+                "name": "Rice",
+                "product_id": product_id,
+                "inventory_kind": "regular",
+                "source_inventory_item_id": item_id,
+                "qty": qty,
+                "unit_price": "2.50",
+            }
+        ],
+    }
+
+
+def count_statements(client, url: str, headers: dict[str, str]) -> tuple[int, object]:
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        response = client.get(url, headers=headers)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+    assert response.status_code == 200
+    return len(statements), response.get_json()
@@ -136,3 +136,30 @@ def test_admin_users_success_with_admin_token(client):
     data = response.get_json()
     assert isinstance(data["items"], list)
     assert any(item["email"] == "admin1@example.com" for item in data["items"])
+
+
+def test_admin_users_filters_roles_and_prefix_in_sql_with_cursor(client):
+    _bootstrap_admin(client)
+    buyer_role = db.session.query(Role).filter_by(name="buyer").one()
+    for idx in range(5):
+        user = User(email=f"buyer{idx}@example.com", password_hash="x", first_name="Bea" if idx < 3 else "Carl")
+        user.roles.append(buyer_role)
+        db.session.add(user)
+    db.session.commit()
+    login = client.post("/api/v1/auth/login", json={"email": "admin1@example.com", "password": "Admin123!"})
+    headers = {"Authorization": f"Bearer {login.get_json()['access_token']}"}
+
+    first = client.get("/api/v1/admin/users?role=buyer&page_size=2", headers=headers).get_json()
+    assert [item["email"] for item in first["items"]] == ["buyer0@example.com", "buyer1@example.com"]
+    assert first["pagination"]["total"] == 5
+    assert first["pagination"]["total_is_exact"] is True
+
+    cursor = first["pagination"]["next_cursor"]
+    second = client.get(f"/api/v1/admin/users?role=buyer&page_size=2&cursor={cursor}", headers=headers).get_json()
+    assert [item["email"] for item in second["items"]] == ["buyer2@example.com", "buyer3@example.com"]
+
+    named = client.get("/api/v1/admin/users?q=be", headers=headers).get_json()
+    assert len(named["items"]) == 3
+
+    admins = client.get("/api/v1/admin/users?role=admin,super_admin", headers=headers).get_json()
+    assert [item["email"] for item in admins["items"]] == ["admin1@example.com"]
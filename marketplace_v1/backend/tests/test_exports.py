@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+
+from app.extensions import db
+from app.models import FreshProduceInventoryItem, User
+from tests.helpers import auth_headers, order_payload, seed_inventory
+
+
+def test_order_export_streams_ndjson_and_csv_and_resumes(app, client):
+    buyer_id, seller_id, product_id, item_id = seed_inventory(quantity=10)
+    buyer_headers = auth_headers(buyer_id)
+    for qty in (1, 2, 3):
+        payload = order_payload(seller_id, product_id, item_id, qty)
+        client.post("/api/v1/orders", json=payload, headers=buyer_headers)
+    admin_id = db.session.query(User.id).filter_by(email="admin@example.com").scalar()
+    admin_headers = auth_headers(admin_id)
+
+    response = client.get("/api/v1/orders/export", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    orders = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [order["items"][0]["qty"] for order in orders] == [1, 2, 3]
+    assert orders[0]["items"][0]["unit_price"] == "2.50"
+
+    resumed = client.get(f"/api/v1/orders/export?after={orders[0]['id']}", headers=admin_headers)
+    assert [json.loads(line)["id"] for line in resumed.get_data(as_text=True).splitlines()] == [
+        order["id"] for order in orders[1:]
+    ]
+
+    response = client.get("/api/v1/orders/export?format=csv&sku=RICE-1", headers=buyer_headers)
+    assert response.mimetype == "text/csv"
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [row["qty"] for row in rows] == ["1", "2", "3"]
+    assert rows[0]["sku"] == "RICE-1"
+
+    assert client.get("/api/v1/orders/export?format=xml", headers=admin_headers).status_code == 400
+    assert client.get("/api/v1/orders/export?status=lost", headers=admin_headers).status_code == 400
+
+
+def test_inventory_export_walks_both_tables_and_resumes(app, client):
+    _, seller_id, product_id, item_id = seed_inventory(quantity=5)
+    admin_id = db.session.query(User.id).filter_by(email="admin@example.com").scalar()
+    fresh = FreshProduceInventoryItem(
+        product_id=product_id,
+        seller_id=seller_id,
+        created_by_admin_user_id=admin_id,
+        estimated_quantity=7,
+    )
+    db.session.add(fresh)
+    db.session.commit()
+    headers = auth_headers(admin_id)
+
+    response = client.get("/api/v1/admin/inventory/export?format=csv", headers=headers)
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [(row["inventory_kind"], row["quantity"]) for row in rows] == [("regular", "5"), ("fresh_produce", "7")]
+
+    resumed = client.get(f"/api/v1/admin/inventory/export?after=regular:{item_id}", headers=headers)
+    assert [json.loads(line)["id"] for line in resumed.get_data(as_text=True).splitlines()] == [fresh.id]
+
+    empty = client.get("/api/v1/admin/inventory/export?format=csv&expired=true", headers=headers)
+    header = next(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    assert empty.get_data(as_text=True).strip() == ",".join(header)
+    assert client.get("/api/v1/admin/inventory/export?after=bogus", headers=headers).status_code == 400
+
+
+def test_exports_reject_malformed_id_filters(app, client):
+    seed_inventory(quantity=5)
+    admin_id = db.session.query(User.id).filter_by(email="admin@example.com").scalar()
+    headers = auth_headers(admin_id)
+
+    for path in (
+        "/api/v1/admin/inventory/export?product_id=abc",
+        "/api/v1/admin/inventory?seller_id=1x",
+        "/api/v1/admin/procurement-orders/export?supplier_id=abc",
+        "/api/v1/admin/procurement-orders?product_id=abc",
+    ):
+        response = client.get(path, headers=headers)
+        assert response.status_code == 400, path
+        assert response.get_json()["message"].endswith("must be integer")
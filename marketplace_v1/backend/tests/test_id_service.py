@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+
+from app.extensions import db
+from app.models import IdWorkerLease
+from app.services.id_service import (
+    SnowflakeIdGenerator,
+    lease_worker_id,
+    next_group_number,
+    next_order_number,
+    renew_worker_lease,
+)
+
+
+def test_generator_ids_are_unique_and_increasing():
+    generator = SnowflakeIdGenerator(worker_id=4242)
+    ids = [generator.next_id() for _ in range(5000)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_generator_is_thread_safe():
+    generator = SnowflakeIdGenerator(worker_id=1)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        ids = list(pool.map(lambda _: generator.next_id(), range(4000)))
+    assert len(set(ids)) == len(ids)
+
+
+def test_generators_on_different_workers_do_not_collide():
+    first = SnowflakeIdGenerator(worker_id=10)
+    second = SnowflakeIdGenerator(worker_id=11)
+    first_ids = {first.next_id() for _ in range(1000)}
+    second_ids = {second.next_id() for _ in range(1000)}
+    assert not first_ids & second_ids
+
+
+def test_concurrent_processes_lease_distinct_worker_ids(app):
+    first_lease = lease_worker_id("first:7")
+    second_lease = lease_worker_id("second:1031")
+    assert first_lease.worker_id != second_lease.worker_id
+    first = SnowflakeIdGenerator(first_lease.worker_id)
+    second = SnowflakeIdGenerator(second_lease.worker_id)
+    first_ids = {first.next_id() for _ in range(1000)}
+    second_ids = {second.next_id() for _ in range(1000)}
+    assert not first_ids & second_ids
+
+
+def test_expired_worker_lease_is_taken_over_and_lost_by_its_holder(app):
+    stale = lease_worker_id("stale:1")
+    db.session.execute(
+        update(IdWorkerLease).values(expires_at=datetime.now(timezone.utc) - timedelta(hours=1))
+    )
+    db.session.commit()
+
+    successor = lease_worker_id("successor:1")
+    assert successor.worker_id == stale.worker_id
+    assert not renew_worker_lease(stale)
+    assert renew_worker_lease(successor)
+
+
+def test_order_and_group_numbers_use_prefixes(app):
+    assert next_order_number().startswith("ORD-")
+    assert next_group_number().startswith("GRP-")
+    assert len({next_order_number() for _ in range(100)}) == 100
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+from app.extensions import db
+from app.models import (
+    FreshProduceInventoryItem,
+    InventoryItem,
+    InventoryItemArchive,
+    InventoryMovement,
+    InventorySnapshotLot,
+    Order,
+    Product,
+    ProductType,
+    User,
+)
+from app.services.inventory_expiry_service import sweep_expired_inventory
+from app.services.inventory_ledger_service import take_inventory_snapshot
+from app.services.inventory_service import backfill_inventory_expiry
+from tests.helpers import auth_headers, create_user, order_payload, seed_inventory
+
+
+def _as_utc(value):
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def test_expires_at_follows_updated_at_and_validity_days(app, client):
+    _, _, product_id, item_id = seed_inventory(quantity=5)
+    item = db.session.get(InventoryItem, item_id)
+    assert _as_utc(item.expires_at) == _as_utc(item.updated_at) + timedelta(days=30)
+
+    item.price_per_unit = item.price_per_unit + 1
+    db.session.commit()
+    assert _as_utc(item.expires_at) == _as_utc(item.updated_at) + timedelta(days=30)
+
+    # Three days old: shortening validity to two days expires it.
+    three_days_ago = datetime.now(timezone.utc) - timedelta(days=3)
+    db.session.execute(InventoryItem.__table__.update().values(updated_at=three_days_ago))
+    db.session.add(ProductType(product_type="grain"))
+    db.session.commit()
+    admin_id = db.session.query(User.id).filter_by(email="admin@example.com").scalar()
+    response = client.put(
+        f"/api/v1/admin/products/{product_id}",
+        json={"product_name": "Rice", "product_type": "grain", "product_unit": "kg", "validity_days": 2},
+        headers=auth_headers(admin_id),
+    )
+    assert response.status_code == 200
+    db.session.expire_all()
+    item = db.session.get(InventoryItem, item_id)
+    assert _as_utc(item.expires_at) == three_days_ago.replace(microsecond=0) + timedelta(days=2)
+    assert item.is_expired
+
+
+def test_backfill_inventory_expiry_repairs_stale_rows(app):
+    _, _, _, item_id = seed_inventory(quantity=5)
+    db.session.execute(
+        InventoryItem.__table__.update().values(expires_at=InventoryItem.__table__.c.updated_at)
+    )
+    db.session.commit()
+
+    assert backfill_inventory_expiry(batch_size=1) == 1
+    db.session.expire_all()
+    item = db.session.get(InventoryItem, item_id)
+    assert _as_utc(item.expires_at) == _as_utc(item.updated_at).replace(microsecond=0) + timedelta(days=30)
+
+
+def test_admin_inventory_pages_newest_first_with_cursor(app, client):
+    _, seller_id, product_id, first_id = seed_inventory(quantity=5)
+    admin_id = db.session.query(User.id).filter_by(email="admin@example.com").scalar()
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    db.session.get(InventoryItem, first_id).entry_date = base
+    for offset in range(1, 4):
+        model_cls = InventoryItem if offset % 2 else FreshProduceInventoryItem
+        stock = {"quantity": 1} if model_cls is InventoryItem else {"estimated_quantity": 1}
+        db.session.add(
+            model_cls(
+                product_id=product_id,
+                seller_id=seller_id,
+                created_by_admin_user_id=admin_id,
+                entry_date=base + timedelta(days=offset),
+                **stock,
+            )
+        )
+    db.session.commit()
+    headers = auth_headers(admin_id)
+
+    first = client.get("/api/v1/admin/inventory?page_size=3", headers=headers).get_json()
+    assert first["pagination"]["total"] == 4
+    dates = [row["entry_date"][:10] for row in first["items"]]
+    assert dates == ["2026-01-04", "2026-01-03", "2026-01-02"]
+    assert [row["inventory_kind"] for row in first["items"]] == ["regular", "fresh_produce", "regular"]
+
+    cursor = first["pagination"]["next_cursor"]
+    second = client.get(f"/api/v1/admin/inventory?page_size=3&cursor={cursor}", headers=headers).get_json()
+    assert [row["id"] for row in second["items"]] == [first_id]
+    assert second["pagination"]["next_cursor"] is None
+
+    offset_page = client.get("/api/v1/admin/inventory?page_size=3&page=2", headers=headers).get_json()
+    assert [row["id"] for row in offset_page["items"]] == [first_id]
+
+    response = client.get("/api/v1/admin/inventory?cursor=not-a-cursor", headers=headers)
+    assert response.status_code == 400
+
+
+def test_inventory_ledger_answers_stock_as_of_from_snapshot_and_delta(app, client):
+    buyer_id, seller_id, product_id, item_id = seed_inventory(quantity=10)
+    admin_id = db.session.query(User.id).filter_by(email="admin@example.com").scalar()
+    admin_headers = auth_headers(admin_id)
+    order_id = client.post(
+        "/api/v1/orders",
+        json=order_payload(seller_id, product_id, item_id, 4),
+        headers=auth_headers(buyer_id),
+    ).get_json()["orders"][0]["id"]
+    client.patch(f"/api/v1/orders/{order_id}/status", json={"status": "delivered"}, headers=auth_headers(seller_id))
+
+    snapshot = take_inventory_snapshot(as_of=datetime.now(timezone.utc))
+    assert db.session.query(InventorySnapshotLot).filter_by(snapshot_id=snapshot.id).one().quantity == 6
+    before_edit = datetime.now(timezone.utc)
+
+    client.put(
+        f"/api/v1/admin/inventory/{item_id}",
+        json={"quantity": 15, "price_per_unit": "2.50"},
+        headers=admin_headers,
+    )
+    assert [m.movement_type for m in db.session.query(InventoryMovement).order_by(InventoryMovement.id)] == [
+        "receipt",
+        "reserve",
+        "delivery",
+        "adjustment",
+    ]
+
+    def stock_at(at):
+        response = client.get(
+            "/api/v1/admin/inventory/stock-as-of",
+            query_string={"at": at.isoformat(), "product_id": product_id},
+            headers=admin_headers,
+        )
+        assert response.status_code == 200
+        return [(row["quantity"], row["reserved_quantity"]) for row in response.get_json()["items"]]
+
+    assert stock_at(before_edit) == [(6, 0)]
+    assert stock_at(datetime.now(timezone.utc)) == [(15, 0)]
+
+    totals = client.get(
+        "/api/v1/admin/inventory/movement-totals",
+        query_string={"from": before_edit.isoformat(), "to": datetime.now(timezone.utc).isoformat()},
+        headers=admin_headers,
+    ).get_json()["items"]
+    assert totals == [{"movement_type": "adjustment", "movements": 1, "quantity_delta": 9, "reserved_delta": 0}]
+
+    movements = client.get("/api/v1/admin/inventory/movements?page_size=3", headers=admin_headers).get_json()
+    assert [m["movement_type"] for m in movements["items"]] == ["adjustment", "delivery", "reserve"]
+    assert movements["pagination"]["next_cursor"] is not None
+
+
+def test_bulk_import_routes_rows_by_product_type_and_reports_errors(app, client):
+    _, seller_id, product_id, _ = seed_inventory(quantity=5)
+    fresh = Product(product_name="Kale", product_type="fresh_produce", product_unit="kg", validity_days=3)
+    db.session.add(fresh)
+    db.session.commit()
+
+    upload = (
+        "product_id,quantity,price_per_unit\n"
+        f"{product_id},10,1.25\n"
+        f"{fresh.id},4,0.80\n"
+        "999,1,1.00\n"
+        f"{product_id},-1,1.00\n"
+    )
+    response = client.post(
+        "/api/v1/admin/inventory/import",
+        data={"file": (io.BytesIO(upload.encode()), "lots.csv")},
+        headers=auth_headers(seller_id),
+    )
+    assert response.status_code == 200
+    report = response.get_json()
+    assert report["imported"] == {"regular": 1, "fresh_produce": 1}
+    assert report["errors"] == [
+        {"row": 3, "message": "product not found"},
+        {"row": 4, "message": "quantity must be a non-negative integer"},
+    ]
+    kale = db.session.query(FreshProduceInventoryItem).one()
+    assert (kale.seller_id, kale.estimated_quantity) == (seller_id, 4)
+    assert _as_utc(kale.expires_at) == _as_utc(kale.updated_at) + timedelta(days=3)
+    assert db.session.query(InventoryMovement).filter_by(inventory_kind="fresh_produce").one().quantity_delta == 4
+
+    super_admin = create_user("root@example.com", ["super_admin"])
+    lines = [
+        json.dumps({"product_id": product_id, "seller_id": seller_id, "quantity": 2, "price_per_unit": "3"}),
+        json.dumps({"product_id": product_id, "seller_id": super_admin.id, "quantity": 2, "price_per_unit": "3"}),
+        "not json",
+    ]
+    response = client.post(
+        "/api/v1/admin/inventory/import?format=ndjson&dry_run=true",
+        data="\n".join(lines),
+        headers=auth_headers(super_admin.id),
+    )
+    report = response.get_json()
+    assert report["imported"] == {"regular": 1, "fresh_produce": 0}
+    assert [error["row"] for error in report["errors"]] == [2, 3]
+    assert db.session.query(InventoryItem).count() == 2
+
+
+def test_batch_update_sets_lots_in_one_request_all_or_nothing(app, client):
+    _, seller_id, product_id, item_id = seed_inventory(quantity=5)
+    admin_id = db.session.query(User.id).filter_by(email="admin@example.com").scalar()
+    fresh = FreshProduceInventoryItem(
+        product_id=product_id, seller_id=seller_id, created_by_admin_user_id=admin_id, estimated_quantity=7
+    )
+    other_admin = create_user("other@example.com", ["admin"])
+    foreign = InventoryItem(
+        product_id=product_id, seller_id=seller_id, created_by_admin_user_id=other_admin.id, quantity=1
+    )
+    db.session.add_all([fresh, foreign])
+    db.session.commit()
+    headers = auth_headers(admin_id)
+
+    response = client.patch(
+        "/api/v1/admin/inventory:batch",
+        json={"items": [{"id": item_id, "quantity": 9}, {"id": foreign.id, "quantity": 2}]},
+        headers=headers,
+    )
+    assert response.status_code == 403
+    assert response.get_json()["items"] == [{"inventory_kind": "regular", "id": foreign.id}]
+    assert db.session.get(InventoryItem, item_id).quantity == 5
+
+    response = client.patch(
+        "/api/v1/admin/inventory:batch",
+        json={
+            "items": [
+                {"inventory_kind": "regular", "id": item_id, "quantity": 9},
+                {"inventory_kind": "fresh_produce", "id": fresh.id, "price_per_unit": "1.75"},
+            ]
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200
+    db.session.expire_all()
+    item = db.session.get(InventoryItem, item_id)
+    assert (item.quantity, str(item.price_per_unit)) == (9, "2.50")
+    fresh = db.session.get(FreshProduceInventoryItem, fresh.id)
+    assert (fresh.estimated_quantity, str(fresh.price_per_unit)) == (7, "1.75")
+    # SQLite's datetime() drops the fraction of a second.
+    assert abs(_as_utc(item.expires_at) - _as_utc(item.updated_at) - timedelta(days=30)) < timedelta(seconds=1)
+    adjustment = db.session.query(InventoryMovement).filter_by(movement_type="adjustment").one()
+    assert (adjustment.inventory_item_id, adjustment.quantity_delta) == (item_id, 4)
+
+    response = client.patch(
+        "/api/v1/admin/inventory:batch", json={"items": [{"id": 999, "quantity": 1}]}, headers=headers
+    )
+    assert response.status_code == 404
+
+
+def test_expiry_sweeper_flags_releases_and_archives_expired_lots(app, client):
+    buyer_id, seller_id, product_id, item_id = seed_inventory(quantity=5)
+    response = client.post(
+        "/api/v1/orders", json=order_payload(seller_id, product_id, item_id, 2), headers=auth_headers(buyer_id)
+    )
+    order_id = response.get_json()["orders"][0]["id"]
+    past = datetime.now(timezone.utc) - timedelta(days=40)
+    db.session.execute(
+        InventoryItem.__table__.update().values(updated_at=past, expires_at=past + timedelta(days=30))
+    )
+    db.session.commit()
+
+    sweep = sweep_expired_inventory()
+    assert (sweep.flagged, sweep.cancelled_orders, sweep.archived) == (1, 1, 0)
+    db.session.expire_all()
+    item = db.session.get(InventoryItem, item_id)
+    assert (item.is_expired, item.reserved_quantity) == (True, 0)
+    assert _as_utc(item.updated_at) == past
+    assert db.session.get(Order, order_id).status == "cancelled"
+
+    sweep = sweep_expired_inventory(archive_after=5)
+    assert (sweep.flagged, sweep.archived) == (0, 1)
+    assert db.session.get(InventoryItem, item_id) is None
+    archived = db.session.get(InventoryItemArchive, item_id)
+    assert (archived.quantity, archived.seller_id) == (5, seller_id)
+    assert db.session.query(InventoryMovement).filter_by(movement_type="archive").one().quantity_delta == -5
@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+
+from app.extensions import db
+from app.models import IdempotencyKey, InventoryItem, Order, OrderGroup, Product, User
+from app.services.auth_service import find_user_by_email
+from app.services.idempotency_service import clear_replay_cache, purge_expired_idempotency_keys
+from app.services.order_service import expire_stale_orders, reconcile_reserved_quantities
+from tests.helpers import auth_headers, count_statements, order_payload, seed_inventory
+
+
+def test_create_order_reserves_inventory(app, client):
+    buyer_id, seller_id, product_id, item_id = seed_inventory(quantity=5)
+
+    response = client.post(
+        "/api/v1/orders",
+        json=order_payload(seller_id, product_id, item_id, 3),
+        headers=auth_headers(buyer_id),
+    )
+    assert response.status_code == 201
+
+    db.session.expire_all()
+    item = db.session.get(InventoryItem, item_id)
+    assert item.reserved_quantity == 3
+    assert item.quantity == 5
+
+
+def test_create_order_rejects_quantity_over_available_stock_with_409(app, client):
+    buyer_id, seller_id, product_id, item_id = seed_inventory(quantity=5)
+    response = client.post(
+        "/api/v1/orders",
+        json=order_payload(seller_id, product_id, item_id, 6),
+        headers=auth_headers(buyer_id),
+    )
+    assert response.status_code == 409
+    assert response.get_json()["message"] == "item at index 0 quantity exceeds available inventory"
+
+
+def test_create_order_rejects_lines_that_oversell_one_lot(app, client):
+    buyer_id, seller_id, product_id, item_id = seed_inventory(quantity=5)
+    payload = order_payload(seller_id, product_id, item_id, 3)
+    payload["items"].append(dict(payload["items"][0]))
+
+    response = client.post("/api/v1/orders", json=payload, headers=auth_headers(buyer_id))
+    assert response.status_code == 409
+    assert response.get_json()["message"] == "item at index 0 quantity exceeds available inventory"
+
+    db.session.expire_all()
+    assert db.session.get(InventoryItem, item_id).reserved_quantity == 0
+    assert db.session.query(Order).count() == 0
+
+
+def test_delivered_status_consumes_reservation(app, client):
+    buyer_id, seller_id, product_id, item_id = seed_inventory(quantity=5)
+    created = client.post(
+        "/api/v1/orders",
+        json=order_payload(seller_id, product_id, item_id, 2),
+        headers=auth_headers(buyer_id),
+    )
+    order_id = created.get_json()["orders"][0]["id"]
+
+    response = client.patch(
+        f"/api/v1/orders/{order_id}/status",
+        json={"status": "delivered"},
+        headers=auth_headers(seller_id),
+    )
+    assert response.status_code == 200
+
+    db.session.expire_all()
+    item = db.session.get(InventoryItem, item_id)
+    assert item.reserved_quantity == 0
+    assert item.quantity == 3
+
+
+@pytest.fixture()
+def empty_replay_cache():
+    clear_replay_cache()
+    yield
+    clear_replay_cache()
+
+
+def test_create_order_replays_response_for_same_idempotency_key(app, client, empty_replay_cache):
+    buyer_id, seller_id, product_id, item_id = seed_inventory(quantity=5)
+    headers = {**auth_headers(buyer_id), "Idempotency-Key": "checkout-1"}
+    payload = order_payload(seller_id, product_id, item_id, 2)
+
+    first = client.post("/api/v1/orders", json=payload, headers=headers)
+    clear_replay_cache()
+    second = client.post("/api/v1/orders", json=payload, headers=headers)
+    third = client.post("/api/v1/orders", json=payload, headers=headers)
+
+    assert first.status_code == second.status_code == third.status_code == 201
+    assert first.get_json() == second.get_json() == third.get_json()
+    db.session.expire_all()
+    assert db.session.query(OrderGroup).count() == 1
+    assert db.session.get(InventoryItem, item_id).reserved_quantity == 2
+
+
+def test_create_order_rejects_reused_idempotency_key_with_new_payload(app, client, empty_replay_cache):
+    buyer_id, seller_id, product_id, item_id = seed_inventory(quantity=5)
+    headers = {**auth_headers(buyer_id), "Idempotency-Key": "checkout-2"}
+
+    client.post("/api/v1/orders", json=order_payload(seller_id, product_id, item_id, 1), headers=headers)
+    response = client.post("/api/v1/orders", json=order_payload(seller_id, product_id, item_id, 2), headers=headers)
+
+    assert response.status_code == 422
+
+
+def test_purge_expired_idempotency_keys(app, client, empty_replay_cache):
+    buyer_id, seller_id, product_id, item_id = seed_inventory(quantity=5)
+    headers = {**auth_headers(buyer_id), "Idempotency-Key": "checkout-3"}
+    client.post("/api/v1/orders", json=order_payload(seller_id, product_id, item_id, 1), headers=headers)
+
+    row = db.session.query(IdempotencyKey).one()
+    row.expires_at = row.created_at
+    db.session.commit()
+
+    assert purge_expired_idempotency_keys(batch_size=1) == 1
+    assert db.session.query(IdempotencyKey).count() == 0
+
+
+def test_catalog_skips_expired_and_sold_out_lots_in_sql(app, client):
+    buyer_id, seller_id, product_id, item_id = seed_inventory(quantity=5)
+    admin_id = db.session.query(User.id).filter_by(email="admin@example.com").scalar()
+    db.session.add_all(
+        [
+            InventoryItem(
+                product_id=product_id,
+                seller_id=seller_id,
+                created_by_admin_user_id=admin_id,
+                quantity=4,
+                reserved_quantity=4,
+                price_per_unit=Decimal("2.00"),
+            ),
+            InventoryItem(
+                product_id=product_id,
+                seller_id=seller_id,
+                created_by_admin_user_id=admin_id,
+                quantity=9,
+                price_per_unit=Decimal("2.00"),
+                updated_at=datetime.now(timezone.utc) - timedelta(days=31),
+            ),
+        ]
+    )
+    db.session.commit()
+
+    response = client.get("/api/v1/orders/catalog?limit=1", headers=auth_headers(buyer_id))
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [row["inventory_item_id"] for row in data["items"]] == [item_id]
+    assert data["items"][0]["available_quantity"] == 5
+    assert data["items"][0]["can_order"] is True
+    assert data["pagination"]["has_more"] is False
+
+
+def test_catalog_product_name_search_ranks_matches(app, client):
+    buyer_id, seller_id, product_id, item_id = seed_inventory(quantity=5)
+    admin_id = db.session.query(User.id).filter_by(email="admin@example.com").scalar()
+    other = Product(product_name="Wheat Flour", product_type="grain", product_unit="kg", validity_days=30)
+    db.session.add(other)
+    db.session.flush()
+    db.session.add(
+        InventoryItem(
+            product_id=other.id,
+            seller_id=seller_id,
+            created_by_admin_user_id=admin_id,
+            quantity=3,
+            price_per_unit=Decimal("1.00"),
+        )
+    )
+    db.session.commit()
+
+    response = client.get("/api/v1/orders/catalog?product_name=flour", headers=auth_headers(buyer_id))
+    assert response.status_code == 200
+    assert [row["product_name"] for row in response.get_json()["items"]] == ["Wheat Flour"]
+
+    response = client.get("/api/v1/orders/catalog?seller_name=seller@", headers=auth_headers(buyer_id))
+    assert len(response.get_json()["items"]) == 2
+
+    response = client.get("/api/v1/admin/products?q=ric", headers=auth_headers(admin_id))
+    assert response.status_code == 200
+    assert [p["product_name"] for p in response.get_json()["items"]] == ["Rice"]
+
+
+def test_user_lookup_does_not_load_order_history(app, client):
+    buyer_id, seller_id, product_id, item_id = seed_inventory(quantity=5)
+    headers = auth_headers(buyer_id)
+    payload = order_payload(seller_id, product_id, item_id, 1)
+    client.post("/api/v1/orders", json=payload, headers=headers)
+    db.session.expunge_all()
+
+    buyer = find_user_by_email("buyer@example.com")
+    with pytest.raises(InvalidRequestError):
+        buyer.buyer_orders
+
+    one_group_queries, _ = count_statements(client, "/api/v1/orders/groups", headers)
+    for _ in range(3):
+        client.post("/api/v1/orders", json=payload, headers=headers)
+    db.session.expunge_all()
+    four_group_queries, data = count_statements(client, "/api/v1/orders/groups", headers)
+
+    assert len(data["items"]) == 4
+    assert four_group_queries == one_group_queries
+
+
+def test_order_search_filters_and_unions_buyer_and_seller_views(app, client):
+    buyer_id, seller_id, product_id, item_id = seed_inventory(quantity=10)
+    buyer_headers = auth_headers(buyer_id)
+    created = [
+        client.post(
+            "/api/v1/orders",
+            json=order_payload(seller_id, product_id, item_id, 1),
+            headers=buyer_headers,
+        ).get_json()
+        for _ in range(3)
+    ]
+    first_order = created[0]["orders"][0]
+    client.patch(
+        f"/api/v1/orders/{first_order['id']}/status",
+        json={"status": "confirmed"},
+        headers=auth_headers(seller_id),
+    )
+
+    seller_view = client.get("/api/v1/orders", headers=auth_headers(seller_id)).get_json()
+    assert len(seller_view["items"]) == 3
+
+    confirmed = client.get("/api/v1/orders?status=confirmed", headers=buyer_headers).get_json()
+    assert [order["id"] for order in confirmed["items"]] == [first_order["id"]]
+
+    by_group = client.get(
+        f"/api/v1/orders?group_number={created[1]['group_number']}&sku=RICE-1&product_id={product_id}",
+        headers=buyer_headers,
+    ).get_json()
+    assert [order["order_group_id"] for order in by_group["items"]] == [created[1]["order_group_id"]]
+
+    assert client.get("/api/v1/orders?sku=OTHER", headers=buyer_headers).get_json()["items"] == []
+    assert client.get("/api/v1/orders?created_to=2000-01-01", headers=buyer_headers).get_json()["items"] == []
+    assert client.get("/api/v1/orders?created_from=nope", headers=buyer_headers).status_code == 400
+    for name in ("seller_id", "supplier_id", "product_id"):
+        response = client.get(f"/api/v1/orders?{name}=abc", headers=buyer_headers)
+        assert response.status_code == 400
+        assert response.get_json()["message"] == f"{name} must be integer"
+    assert client.get("/api/v1/orders/export?seller_id=1x", headers=buyer_headers).status_code == 400
+
+    page = client.get("/api/v1/orders?page_size=2", headers=buyer_headers).get_json()
+    rest = client.get(
+        f"/api/v1/orders?page_size=2&cursor={page['pagination']['next_cursor']}", headers=buyer_headers
+    ).get_json()
+    assert len(page["items"]) == 2 and len(rest["items"]) == 1
+    assert rest["pagination"]["next_cursor"] is None
+
+
+def test_batch_status_update_settles_inventory_per_table(app, client):
+    buyer_id, seller_id, product_id, item_id = seed_inventory(quantity=10)
+    buyer_headers = auth_headers(buyer_id)
+    order_ids = [
+        client.post(
+            "/api/v1/orders",
+            json=order_payload(seller_id, product_id, item_id, qty),
+            headers=buyer_headers,
+        ).get_json()["orders"][0]["id"]
+        for qty in (1, 2, 3)
+    ]
+    seller_headers = auth_headers(seller_id)
+
+    response = client.patch(
+        "/api/v1/orders/status:batch",
+        json={"order_ids": order_ids[:2], "status": "delivered"},
+        headers=seller_headers,
+    )
+    assert response.status_code == 200
+    assert [order["status"] for order in response.get_json()["items"]] == ["delivered", "delivered"]
+    db.session.expire_all()
+    item = db.session.get(InventoryItem, item_id)
+    assert (item.quantity, item.reserved_quantity) == (7, 3)
+
+    response = client.patch(
+        "/api/v1/orders/status:batch",
+        json={"order_ids": order_ids, "status": "cancelled"},
+        headers=seller_headers,
+    )
+    assert response.status_code == 409
+    assert response.get_json()["order_ids"] == order_ids[:2]
+
+    response = client.patch(
+        "/api/v1/orders/status:batch",
+        json={"order_ids": [order_ids[2], 999_999], "status": "cancelled"},
+        headers=seller_headers,
+    )
+    assert response.status_code == 404
+    assert response.get_json()["order_ids"] == [999_999]
+
+    client.patch(
+        "/api/v1/orders/status:batch",
+        json={"order_ids": [order_ids[2]], "status": "cancelled"},
+        headers=seller_headers,
+    )
+    db.session.expire_all()
+    item = db.session.get(InventoryItem, item_id)
+    assert (item.quantity, item.reserved_quantity) == (7, 0)
+
+
+def test_expire_stale_orders_cancels_lapsed_holds_and_frees_stock(app, client):
+    buyer_id, seller_id, product_id, item_id = seed_inventory(quantity=5)
+    headers = auth_headers(buyer_id)
+    created = [
+        client.post(
+            "/api/v1/orders",
+            json=order_payload(seller_id, product_id, item_id, qty),
+            headers=headers,
+        ).get_json()["orders"][0]
+        for qty in (2, 3)
+    ]
+    assert created[0]["reservation_expires_at"] is not None
+    client.patch(
+        f"/api/v1/orders/{created[1]['id']}/status",
+        json={"status": "confirmed"},
+        headers=auth_headers(seller_id),
+    )
+    lapsed = datetime.now(timezone.utc) - timedelta(minutes=1)
+    db.session.query(Order).update({Order.reservation_expires_at: lapsed})
+    db.session.commit()
+
+    assert expire_stale_orders(batch_size=1) == 1
+    db.session.expire_all()
+    assert [db.session.get(Order, order["id"]).status for order in created] == ["cancelled", "confirmed"]
+    assert db.session.get(InventoryItem, item_id).reserved_quantity == 3
+
+    catalog = client.get("/api/v1/orders/catalog", headers=headers).get_json()
+    assert catalog["items"][0]["available_quantity"] == 2
+    assert expire_stale_orders() == 0
+
+
+def test_reconcile_reserved_quantities_repairs_drift(app, client):
+    buyer_id, seller_id, product_id, item_id = seed_inventory(quantity=10)
+    headers = auth_headers(buyer_id)
+    for qty in (2, 3):
+        client.post("/api/v1/orders", json=order_payload(seller_id, product_id, item_id, qty), headers=headers)
+    db.session.query(InventoryItem).update({InventoryItem.reserved_quantity: 9})
+    db.session.commit()
+
+    drifts, corrected = reconcile_reserved_quantities(dry_run=True)
+    assert [(d.inventory_kind, d.inventory_item_id, d.stored, d.expected) for d in drifts] == [
+        ("regular", item_id, 9, 5)
+    ]
+    assert corrected == 0
+
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=["maintenance", "reconcile-reservations"])
+    assert "found 1 drifted inventory lots, corrected 1" in result.output
+    db.session.expire_all()
+    assert db.session.get(InventoryItem, item_id).reserved_quantity == 5
+    assert reconcile_reserved_quantities() == ([], 0)
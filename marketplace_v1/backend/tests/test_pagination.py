@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from tests.helpers import auth_headers, create_user, order_payload, seed_inventory
+
+
+def test_cursor_round_trips_and_rejects_tampering(app):
+    created_at = datetime(2026, 10, 17, 9, 30, tzinfo=timezone.utc)
+    cursor = encode_cursor("orders", (created_at, 42))
+    assert decode_cursor("orders", cursor, arity=2) == (created_at, 42)
+
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("order_groups", cursor, arity=2)
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("orders", cursor[:-2] + "xx", arity=2)
+
+
+def test_order_listing_walks_pages_with_cursor(app, client):
+    buyer_id, seller_id, product_id, item_id = seed_inventory(quantity=5)
+    headers = auth_headers(buyer_id)
+    for _ in range(3):
+        client.post("/api/v1/orders", json=order_payload(seller_id, product_id, item_id, 1), headers=headers)
+
+    seen: list[int] = []
+    cursor = None
+    while True:
+        url = "/api/v1/orders?page_size=2" + (f"&cursor={cursor}" if cursor else "")
+        data = client.get(url, headers=headers).get_json()
+        seen.extend(order["id"] for order in data["items"])
+        cursor = data["pagination"]["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 3
+    assert seen == sorted(seen, reverse=True)
+    assert client.get("/api/v1/orders?cursor=bogus", headers=headers).status_code == 400
+
+
+def test_admin_buyer_group_options_are_paged_and_searchable(app, client):
+    admin = create_user("admin@example.com", ["admin"])
+    headers = auth_headers(admin.id)
+    create_user("amb@example.com", ["ambassador"])
+    buyers = [create_user(email, ["buyer"]) for email in ("anna@example.com", "bob@example.com", "bea@example.com")]
+
+    first = client.get("/api/v1/admin/buyer-groups/options?page_size=2", headers=headers).get_json()
+    assert [row["email"] for row in first["ambassadors"]] == ["amb@example.com"]
+    assert first["ambassadors_pagination"]["next_cursor"] is None
+    assert [row["id"] for row in first["buyers"]] == [buyers[0].id, buyers[1].id]
+    cursor = first["buyers_pagination"]["next_cursor"]
+    rest = client.get(f"/api/v1/admin/buyer-groups/options?page_size=2&buyer_cursor={cursor}", headers=headers)
+    assert [row["id"] for row in rest.get_json()["buyers"]] == [buyers[2].id]
+
+    searched = client.get("/api/v1/admin/buyer-groups/options?buyer_q=B", headers=headers).get_json()
+    assert [row["email"] for row in searched["buyers"]] == ["bob@example.com", "bea@example.com"]
+    bogus = client.get("/api/v1/admin/buyer-groups/options?buyer_cursor=bogus", headers=headers)
+    assert bogus.status_code == 400
@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import hashlib
+import io
+from decimal import Decimal
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from app.extensions import db
+from app.models import (
+    ProcurementOrder,
+    ProcurementOrderReview,
+    ProcurementOrderReviewImage,
+    ProcurementReviewImageBlob,
+    Product,
+    Supplier,
+    SupplierRatingStats,
+)
+from app.services.review_image_derivative_service import (
+    MAX_DERIVATIVE_ATTEMPTS,
+    generate_review_image_derivatives,
+    requeue_failed_review_image_derivatives,
+)
+from app.services.review_image_service import (
+    dedupe_legacy_review_images,
+    prune_review_image_blobs,
+    store_review_image,
+)
+from app.services.supplier_rating_service import rebuild_supplier_rating_stats
+from tests.helpers import auth_headers, count_statements, create_user
+
+
+def _seed_procurement(admin_id: int, count: int) -> list[ProcurementOrder]:
+    orders = []
+    for index in range(count):
+        supplier = Supplier(supplier_name=f"Supplier {index}")
+        product = Product(product_name=f"Grain {index}", product_type="grain", product_unit="kg", validity_days=30)
+        db.session.add_all([supplier, product])
+        db.session.flush()
+        orders.append(
+            ProcurementOrder(
+                supplier_id=supplier.supplier_id,
+                product_id=product.id,
+                quantity=10,
+                price_per_unit=Decimal("1.50"),
+                status="received",
+                created_by_admin_user_id=admin_id,
+            )
+        )
+    db.session.add_all(orders)
+    db.session.commit()
+    return orders
+
+
+def test_procurement_order_list_query_count_does_not_grow_with_rows(app, client):
+    admin = create_user("admin@example.com", ["admin"])
+    headers = auth_headers(admin.id)
+    _seed_procurement(admin.id, 1)
+    one_row_queries, _ = count_statements(client, "/api/v1/admin/procurement-orders", headers)
+    _seed_procurement(admin.id, 4)
+    db.session.expunge_all()
+    five_row_queries, data = count_statements(client, "/api/v1/admin/procurement-orders", headers)
+
+    assert sorted(item["product_name"] for item in data["items"]) == [f"Grain {index}" for index in (0, 0, 1, 2, 3)]
+    assert data["items"][0]["total_value"] == "15.00"
+    assert five_row_queries == one_row_queries
+
+
+def test_procurement_review_responses_are_built_from_preloaded_rows(app, client):
+    admin = create_user("admin@example.com", ["admin"])
+    (order,) = _seed_procurement(admin.id, 1)
+    review = ProcurementOrderReview(
+        procurement_id=order.procurement_id,
+        supplier_id=order.supplier_id,
+        product_id=order.product_id,
+        rating=4,
+        reviewed_by_user_id=admin.id,
+    )
+    db.session.add(review)
+    db.session.commit()
+
+    _, data = count_statements(
+        client, f"/api/v1/admin/procurement-orders/{order.procurement_id}/reviews", auth_headers(admin.id)
+    )
+    (item,) = data["items"]
+    assert (item["supplier_name"], item["rated_by_email"], item["procurement_status"]) == (
+        "Supplier 0",
+        "admin@example.com",
+        "received",
+    )
+    assert item["image_urls"] == []
+
+
+def test_review_writes_keep_supplier_rating_stats_current(app, client):
+    admin = create_user("admin@example.com", ["admin"])
+    headers = auth_headers(admin.id)
+    first, second = _seed_procurement(admin.id, 2)
+    second.supplier_id = first.supplier_id
+    db.session.commit()
+
+    for order, rating in ((first, 8), (second, 4), (first, 6)):
+        response = client.post(
+            f"/api/v1/admin/procurement-orders/{order.procurement_id}/reviews", json={"rating": rating}, headers=headers
+        )
+        assert response.status_code in (200, 201)
+
+    stats = db.session.get(SupplierRatingStats, first.supplier_id)
+    assert (stats.rating_sum, stats.rating_count, stats.rating_8_count, stats.rating_6_count) == (10, 2, 0, 1)
+
+    detail = client.get(f"/api/v1/admin/suppliers/{first.supplier_id}", headers=headers).get_json()
+    assert (detail["overall_rating"], detail["rating_count"]) == (5.0, 2)
+    assert detail["rating_breakdown"] == [{"rating": 6, "orders": 1}, {"rating": 4, "orders": 1}]
+    listed = client.get("/api/v1/admin/suppliers", headers=headers).get_json()["items"]
+    rated = next(item for item in listed if item["supplier_id"] == first.supplier_id)
+    assert (rated["overall_rating"], rated["rating_count"]) == (5.0, 2)
+
+    assert rebuild_supplier_rating_stats() == 1
+    db.session.expire_all()
+    assert db.session.get(SupplierRatingStats, first.supplier_id).rating_4_count == 1
+
+
+def test_supplier_reviews_page_by_rating_then_newest_with_filters(app, client):
+    admin = create_user("admin@example.com", ["admin"])
+    headers = auth_headers(admin.id)
+    orders = _seed_procurement(admin.id, 5)
+    supplier_id = orders[0].supplier_id
+    for order, rating in zip(orders, (7, 9, 7, 3, 9)):
+        order.supplier_id = supplier_id
+        db.session.add(
+            ProcurementOrderReview(
+                procurement_id=order.procurement_id,
+                supplier_id=supplier_id,
+                product_id=order.product_id,
+                rating=rating,
+                reviewed_by_user_id=admin.id,
+            )
+        )
+    db.session.commit()
+    reviews = db.session.query(ProcurementOrderReview).order_by(ProcurementOrderReview.review_id).all()
+
+    detail = client.get(f"/api/v1/admin/suppliers/{supplier_id}", headers=headers).get_json()
+    assert [review["rating"] for review in detail["reviews"]] == [9, 9, 7, 7, 3]
+    assert detail["reviews_pagination"]["next_cursor"] is None
+
+    url = f"/api/v1/admin/suppliers/{supplier_id}/reviews?page_size=2&min_rating=5"
+    first = client.get(url, headers=headers).get_json()
+    second = client.get(f"{url}&cursor={first['pagination']['next_cursor']}", headers=headers).get_json()
+    assert [review["review_id"] for review in first["items"] + second["items"]] == [
+        reviews[4].review_id,
+        reviews[1].review_id,
+        reviews[2].review_id,
+        reviews[0].review_id,
+    ]
+    assert second["pagination"]["next_cursor"] is None
+
+    by_product = client.get(
+        f"/api/v1/admin/suppliers/{supplier_id}/reviews?product_id={orders[3].product_id}", headers=headers
+    ).get_json()
+    assert [review["rating"] for review in by_product["items"]] == [3]
+    assert client.get(f"{url}&cursor=bogus", headers=headers).status_code == 400
+
+
+def test_review_images_are_stored_once_per_content(app, client, tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "instance_path", str(tmp_path))
+    admin = create_user("admin@example.com", ["admin"])
+    headers = auth_headers(admin.id)
+    orders = _seed_procurement(admin.id, 3)
+    photo = b"\x89PNG\r\n\x1a\n" + b"same photo" * 1000
+
+    paths = []
+    for order in orders[:2]:
+        response = client.post(
+            f"/api/v1/admin/procurement-orders/{order.procurement_id}/reviews",
+            data={"rating": "7", "images": [(io.BytesIO(photo), "crate.png")]},
+            headers=headers,
+        )
+        assert response.status_code == 201
+        paths.extend(response.get_json()["image_paths"])
+    digest = hashlib.sha256(photo).hexdigest()
+    assert paths == [f"blobs/{digest[:2]}/{digest[2:4]}/{digest}.png"] * 2
+    assert db.session.get(ProcurementReviewImageBlob, digest).ref_count == 2
+    blob_root = tmp_path / "uploads" / "procurement_reviews" / "blobs"
+    assert len([path for path in blob_root.rglob("*") if path.is_file()]) == 1
+    image = client.get(f"/api/v1/admin/procurement-review-images/{paths[0]}", headers=headers)
+    assert image.data == photo
+
+    # An upload from before content addressing, in its per-review directory.
+    legacy_review = ProcurementOrderReview(
+        procurement_id=orders[2].procurement_id,
+        supplier_id=orders[2].supplier_id,
+        product_id=orders[2].product_id,
+        rating=5,
+        reviewed_by_user_id=admin.id,
+    )
+    db.session.add(legacy_review)
+    db.session.flush()
+    legacy_file = tmp_path / "uploads" / "procurement_reviews" / str(legacy_review.review_id) / "old.png"
+    legacy_file.parent.mkdir(parents=True)
+    legacy_file.write_bytes(photo)
+    legacy_path = f"{legacy_review.review_id}/old.png"
+    db.session.add(ProcurementOrderReviewImage(review_id=legacy_review.review_id, file_path=legacy_path))
+    db.session.commit()
+
+    assert dedupe_legacy_review_images() == (1, 1, 0)
+    assert not legacy_file.parent.exists()
+    assert db.session.get(ProcurementReviewImageBlob, digest).ref_count == 3
+
+    db.session.query(ProcurementOrderReviewImage).delete()
+    db.session.commit()
+    assert prune_review_image_blobs(min_age_seconds=0) == 1
+    assert db.session.get(ProcurementReviewImageBlob, digest) is None
+
+
+def test_review_image_files_follow_the_transaction(app, client, tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "instance_path", str(tmp_path))
+    admin = create_user("admin@example.com", ["admin"])
+    headers = auth_headers(admin.id)
+    root = tmp_path / "uploads" / "procurement_reviews"
+
+    stored, error = store_review_image(FileStorage(io.BytesIO(b"rolled back"), "crate.png"))
+    assert error is None
+    assert not (root / stored.file_path).exists()
+    db.session.rollback()
+    assert not [path for path in root.rglob("*") if path.is_file()]
+
+    stored, _ = store_review_image(FileStorage(io.BytesIO(b"committed"), "crate.png"))
+    assert not (root / stored.file_path).exists()
+    db.session.commit()
+    assert (root / stored.file_path).read_bytes() == b"committed"
+
+    (root / "tmp" / "upload-in-flight").write_bytes(b"partial")
+    served = client.get("/api/v1/admin/procurement-review-images/tmp/upload-in-flight", headers=headers)
+    assert served.status_code == 404
+    served = client.get(f"/api/v1/admin/procurement-review-images/{stored.file_path}", headers=headers)
+    assert served.data == b"committed"
+
+
+def test_review_thumbnails_fall_back_to_the_original_until_rendered(app, client, tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "instance_path", str(tmp_path))
+    admin = create_user("admin@example.com", ["admin"])
+    headers = auth_headers(admin.id)
+    order = _seed_procurement(admin.id, 1)[0]
+    photo = b"\x89PNG\r\n\x1a\n" + b"crate photo" * 100
+
+    response = client.post(
+        f"/api/v1/admin/procurement-orders/{order.procurement_id}/reviews",
+        data={"rating": "8", "images": [(io.BytesIO(photo), "crate.png")]},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    body = response.get_json()
+    digest = hashlib.sha256(photo).hexdigest()
+    blob = db.session.get(ProcurementReviewImageBlob, digest)
+    assert blob.derivatives_status == "pending"
+    assert body["thumbnail_urls"] == body["display_urls"] == body["image_urls"]
+
+    blob.derivatives_status = "ready"
+    db.session.commit()
+    review = client.get(f"/api/v1/admin/procurement-orders/{order.procurement_id}/reviews", headers=headers)
+    row = review.get_json()["items"][0]
+    prefix = f"/api/v1/admin/procurement-review-images/blobs/{digest[:2]}/{digest[2:4]}/{digest}"
+    assert row["thumbnail_urls"] == [f"{prefix}.thumb.webp"]
+    assert row["display_urls"] == [f"{prefix}.display.webp"]
+
+
+def test_review_image_derivatives_are_rendered_next_to_the_blob(app, client, tmp_path, monkeypatch):
+    image_module = pytest.importorskip("PIL.Image")
+    monkeypatch.setattr(app, "instance_path", str(tmp_path))
+    admin = create_user("admin@example.com", ["admin"])
+    headers = auth_headers(admin.id)
+    order = _seed_procurement(admin.id, 1)[0]
+    photo = io.BytesIO()
+    image_module.new("RGB", (2000, 1000), "green").save(photo, "PNG")
+
+    response = client.post(
+        f"/api/v1/admin/procurement-orders/{order.procurement_id}/reviews",
+        data={"rating": "8", "images": [(io.BytesIO(photo.getvalue()), "crate.png")]},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    image_path = response.get_json()["image_paths"][0]
+
+    run = generate_review_image_derivatives(workers=1)
+    assert (run.ready, run.failed) == (1, [])
+    blob_dir = (tmp_path / "uploads" / "procurement_reviews" / image_path).parent
+    with image_module.open(blob_dir / image_path.rsplit("/", 1)[1].replace(".png", ".thumb.webp")) as thumb:
+        assert thumb.size == (320, 320)
+    with image_module.open(blob_dir / image_path.rsplit("/", 1)[1].replace(".png", ".display.webp")) as display:
+        assert display.size == (1280, 640)
+    blob = db.session.execute(db.select(ProcurementReviewImageBlob)).scalar_one()
+    assert blob.derivatives_status == "ready"
+
+
+def test_review_image_derivatives_of_a_missing_file_are_retried_then_requeued(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "instance_path", str(tmp_path))
+    digest = hashlib.sha256(b"not moved into place yet").hexdigest()
+    db.session.add(
+        ProcurementReviewImageBlob(
+            sha256=digest, file_path=f"blobs/{digest[:2]}/{digest[2:4]}/{digest}.png", size_bytes=24, ref_count=1
+        )
+    )
+    db.session.commit()
+
+    run = generate_review_image_derivatives(workers=1)
+    assert (run.ready, run.deferred, run.failed) == (0, 1, [])
+    blob = db.session.get(ProcurementReviewImageBlob, digest)
+    assert (blob.derivatives_status, blob.derivatives_attempts) == ("pending", 1)
+    assert blob.derivatives_claimed_at is not None
+
+    blob.derivatives_attempts = MAX_DERIVATIVE_ATTEMPTS - 1
+    blob.derivatives_claimed_at = None
+    db.session.commit()
+    run = generate_review_image_derivatives(workers=1)
+    assert (run.deferred, run.failed) == (0, [digest])
+    db.session.refresh(blob)
+    assert blob.derivatives_status == "failed"
+
+    assert requeue_failed_review_image_derivatives() == 1
+    db.session.refresh(blob)
+    assert (blob.derivatives_status, blob.derivatives_attempts) == ("pending", 0)
@@ -13,37 +13,41 @@ import type {
 
 export function listUsers(
   token: string,
-  filters?: { role?: string; page?: number; page_size?: number }
+  filters?: { role?: string; q?: string; page?: number; page_size?: number; cursor?: string }
 ) {
   const params = new URLSearchParams();
   if (filters?.role) params.set("role", filters.role);
+  if (filters?.q) params.set("q", filters.q);
   if (filters?.page) params.set("page", String(filters.page));
   if (filters?.page_size) params.set("page_size", String(filters.page_size));
+  if (filters?.cursor) params.set("cursor", filters.cursor);
   const query = params.toString();
   const path = query ? `/admin/users?${query}` : "/admin/users";
 
   return apiRequest<{ items: UserRow[]; pagination: Pagination }>(path, { method: "GET" }, token);
 }
 
+// Walks the keyset cursor, so each request costs one page regardless of depth.
+// Pass `role` (comma-separated) so only the users a screen needs are fetched,
+// and keep to staff roles: buyer pickers search and page instead.
 export async function listAllUsers(
   token: string,
-  filters?: { role?: string }
+  filters?: { role?: string; q?: string }
 ): Promise<{ items: UserRow[] }> {
   const pageSize = 100;
-  let page = 1;
-  let totalPages = 1;
+  let cursor: string | undefined;
   const items: UserRow[] = [];
 
-  while (page <= totalPages) {
+  do {
     const response = await listUsers(token, {
       role: filters?.role,
-      page,
-      page_size: pageSize
+      q: filters?.q,
+      page_size: pageSize,
+      cursor
     });
     items.push(...response.items);
-    totalPages = response.pagination.total_pages || 1;
-    page += 1;
-  }
+    cursor = response.pagination.next_cursor ?? undefined;
+  } while (cursor);
 
   return { items };
 }
@@ -97,6 +101,28 @@ export function createInventoryItem(
   );
 }
 
+export type InventoryImportReport = {
+  imported: { regular: number; fresh_produce: number };
+  rejected: number;
+  errors: Array<{ row: number; message: string }>;
+  errors_truncated: boolean;
+  dry_run: boolean;
+};
+
+export function importInventory(token: string, file: File, options?: { dryRun?: boolean }) {
+  const form = new FormData();
+  form.append("file", file);
+  const query = options?.dryRun ? "?dry_run=true" : "";
+  return apiRequest<InventoryImportReport>(
+    `/admin/inventory/import${query}`,
+    {
+      method: "POST",
+      body: form
+    },
+    token
+  );
+}
+
 export function updateInventoryItem(
   token: string,
   itemId: number,
@@ -117,6 +143,24 @@ export function updateInventoryItem(
   );
 }
 
+export type InventoryLotUpdate = {
+  inventory_kind: "regular" | "fresh_produce";
+  id: number;
+  quantity?: number;
+  price_per_unit?: string;
+};
+
+export function updateInventoryItems(token: string, items: InventoryLotUpdate[]) {
+  return apiRequest<{ updated: number }>(
+    "/admin/inventory:batch",
+    {
+      method: "PATCH",
+      body: JSON.stringify({ items })
+    },
+    token
+  );
+}
+
 export function deleteInventoryItem(token: string, itemId: number, inventoryKind?: "regular" | "fresh_produce") {
   const path = inventoryKind
     ? `/admin/inventory/${itemId}?inventory_kind=${encodeURIComponent(inventoryKind)}`
@@ -172,9 +216,26 @@ export function listAmbassadorBuyers(token: string, ambassadorUserId: number) {
   );
 }
 
-export function listBuyerGroupOptions(token: string, regionId?: number) {
+// Admins get one page of each role; narrow it with the `*_q` prefix searches
+// and continue it with the `*_cursor` values from the pagination blocks.
+export function listBuyerGroupOptions(
+  token: string,
+  regionId?: number,
+  filters?: {
+    ambassador_q?: string;
+    buyer_q?: string;
+    ambassador_cursor?: string;
+    buyer_cursor?: string;
+    page_size?: number;
+  }
+) {
   const params = new URLSearchParams();
   if (regionId) params.set("region_id", String(regionId));
+  if (filters?.ambassador_q) params.set("ambassador_q", filters.ambassador_q);
+  if (filters?.buyer_q) params.set("buyer_q", filters.buyer_q);
+  if (filters?.ambassador_cursor) params.set("ambassador_cursor", filters.ambassador_cursor);
+  if (filters?.buyer_cursor) params.set("buyer_cursor", filters.buyer_cursor);
+  if (filters?.page_size) params.set("page_size", String(filters.page_size));
   const query = params.toString();
   const path = query ? `/admin/buyer-groups/options?${query}` : "/admin/buyer-groups/options";
 
@@ -188,6 +249,8 @@ export function listBuyerGroupOptions(token: string, regionId?: number) {
     selected_region_id: number | null;
     ambassadors: UserRow[];
     buyers: UserRow[];
+    ambassadors_pagination?: Pagination;
+    buyers_pagination?: Pagination;
   }>(path, { method: "GET" }, token);
 }
 
@@ -354,6 +417,16 @@ export function deleteSupplier(token: string, supplierId: number) {
   return apiRequest<{ message: string }>(`/admin/suppliers/${supplierId}`, { method: "DELETE" }, token);
 }
 
+export type SupplierReview = {
+  review_id: number;
+  procurement_id: number;
+  procurement_status?: string | null;
+  product_id: number;
+  rating: number;
+  review_text?: string | null;
+  created_at?: string | null;
+};
+
 export function getSupplierDetail(token: string, supplierId: number) {
   return apiRequest<{
     supplier_id: number;
@@ -367,17 +440,34 @@ export function getSupplierDetail(token: string, supplierId: number) {
     overall_rating?: number | null;
     rating_count?: number;
     rating_breakdown: Array<{ rating: number; orders: number }>;
-    reviews: Array<{
-      review_id: number;
-      procurement_id: number;
-      procurement_status?: string | null;
-      rating: number;
-      review_text?: string | null;
-      created_at?: string | null;
-    }>;
+    reviews: SupplierReview[];
+    reviews_pagination: Pagination;
   }>(`/admin/suppliers/${supplierId}`, { method: "GET" }, token);
 }
 
+export function listSupplierReviews(
+  token: string,
+  supplierId: number,
+  filters?: {
+    page_size?: number;
+    cursor?: string;
+    product_id?: number;
+    min_rating?: number;
+    max_rating?: number;
+  }
+) {
+  const params = new URLSearchParams();
+  if (filters?.page_size) params.set("page_size", String(filters.page_size));
+  if (filters?.cursor) params.set("cursor", filters.cursor);
+  if (filters?.product_id) params.set("product_id", String(filters.product_id));
+  if (filters?.min_rating) params.set("min_rating", String(filters.min_rating));
+  if (filters?.max_rating) params.set("max_rating", String(filters.max_rating));
+  const query = params.toString();
+  const path = query ? `/admin/suppliers/${supplierId}/reviews?${query}` : `/admin/suppliers/${supplierId}/reviews`;
+
+  return apiRequest<{ items: SupplierReview[]; pagination: Pagination }>(path, { method: "GET" }, token);
+}
+
 export function listProcurementOrders(
   token: string,
   filters?: {
@@ -63,3 +63,14 @@ export function updateOrderStatus(token: string, orderId: number, status: string
     token
   );
 }
+
+export function updateOrderStatuses(token: string, orderIds: number[], status: string) {
+  return apiRequest<{ items: Array<{ id: number; order_number: string; status: string }> }>(
+    "/orders/status:batch",
+    {
+      method: "PATCH",
+      body: JSON.stringify({ order_ids: orderIds, status })
+    },
+    token
+  );
+}
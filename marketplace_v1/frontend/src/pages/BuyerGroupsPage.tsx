@@ -13,7 +13,12 @@ import type { UserRow } from "../types/models";
 
 export function BuyerGroupsPage() {
   const { accessToken, hasRole, user } = useAuth();
-  const [users, setUsers] = useState<UserRow[]>([]);
+  const [ambassadors, setAmbassadors] = useState<UserRow[]>([]);
+  const [buyers, setBuyers] = useState<UserRow[]>([]);
+  const [ambassadorQuery, setAmbassadorQuery] = useState("");
+  const [buyerQuery, setBuyerQuery] = useState("");
+  const [ambassadorCursor, setAmbassadorCursor] = useState<string | null>(null);
+  const [buyerCursor, setBuyerCursor] = useState<string | null>(null);
   const [ownedRegions, setOwnedRegions] = useState<
     Array<{
       region_id: number;
@@ -33,15 +38,6 @@ export function BuyerGroupsPage() {
   const isAdminLike = hasRole("admin") || hasRole("super_admin");
   const isAmbassadorOnly = hasRole("ambassador") && !isAdminLike;
 
-  const ambassadors = useMemo(
-    () => users.filter((u) => u.roles.includes("ambassador")),
-    [users]
-  );
-
-  const buyers = useMemo(
-    () => users.filter((u) => u.roles.includes("buyer")),
-    [users]
-  );
   const selectedOwnedRegion = useMemo(
     () => ownedRegions.find((r) => String(r.region_id) === selectedOwnedRegionId) ?? null,
     [ownedRegions, selectedOwnedRegionId]
@@ -69,9 +65,15 @@ export function BuyerGroupsPage() {
     }
     try {
       const regionId = selectedOwnedRegionId ? Number(selectedOwnedRegionId) : undefined;
-      const response = await listBuyerGroupOptions(accessToken, regionId);
-      const merged = [...response.ambassadors, ...response.buyers];
-      setUsers(merged);
+      const response = await listBuyerGroupOptions(
+        accessToken,
+        regionId,
+        isAdminLike ? { ambassador_q: ambassadorQuery.trim(), buyer_q: buyerQuery.trim() } : undefined
+      );
+      setAmbassadors(response.ambassadors);
+      setBuyers(response.buyers);
+      setAmbassadorCursor(response.ambassadors_pagination?.next_cursor ?? null);
+      setBuyerCursor(response.buyers_pagination?.next_cursor ?? null);
       setOwnedRegions(response.owned_regions ?? []);
       if (response.selected_region_id) {
         setSelectedOwnedRegionId(String(response.selected_region_id));
@@ -91,6 +93,32 @@ export function BuyerGroupsPage() {
     }
   };
 
+  const loadMore = async (role: "ambassador" | "buyer") => {
+    const cursor = role === "ambassador" ? ambassadorCursor : buyerCursor;
+    if (!accessToken || !cursor) {
+      return;
+    }
+    try {
+      const response = await listBuyerGroupOptions(
+        accessToken,
+        undefined,
+        role === "ambassador"
+          ? { ambassador_q: ambassadorQuery.trim(), ambassador_cursor: cursor }
+          : { buyer_q: buyerQuery.trim(), buyer_cursor: cursor }
+      );
+      if (role === "ambassador") {
+        setAmbassadors((rows) => [...rows, ...response.ambassadors]);
+        setAmbassadorCursor(response.ambassadors_pagination?.next_cursor ?? null);
+      } else {
+        setBuyers((rows) => [...rows, ...response.buyers]);
+        setBuyerCursor(response.buyers_pagination?.next_cursor ?? null);
+      }
+      setError(null);
+    } catch (err) {
+      setError(err instanceof ApiError ? err.message : "Failed to load users");
+    }
+  };
+
   const loadGroup = async (ambassadorId: number) => {
     if (!accessToken) {
       return;
@@ -105,8 +133,12 @@ export function BuyerGroupsPage() {
   };
 
   useEffect(() => {
-    loadUsers();
-  }, [accessToken, canManage, selectedOwnedRegionId, user?.id]);
+    // Debounced so typing in a search box sends one request, not one per key.
+    const timer = window.setTimeout(() => {
+      loadUsers();
+    }, 250);
+    return () => window.clearTimeout(timer);
+  }, [accessToken, canManage, selectedOwnedRegionId, user?.id, ambassadorQuery, buyerQuery]);
 
   useEffect(() => {
     if (!selectedAmbassadorId) {
@@ -184,6 +216,13 @@ export function BuyerGroupsPage() {
                 </select>
               </label>
             ) : null}
+            {isAdminLike ? (
+              <input
+                value={ambassadorQuery}
+                onChange={(e) => setAmbassadorQuery(e.target.value)}
+                placeholder="Search ambassadors by email or name"
+              />
+            ) : null}
             <label>
               Ambassador
               <select
@@ -202,6 +241,17 @@ export function BuyerGroupsPage() {
                 ))}
               </select>
             </label>
+            {ambassadorCursor ? (
+              <button onClick={() => loadMore("ambassador")}>Load more ambassadors</button>
+            ) : null}
+
+            {isAdminLike ? (
+              <input
+                value={buyerQuery}
+                onChange={(e) => setBuyerQuery(e.target.value)}
+                placeholder="Search buyers by email or name"
+              />
+            ) : null}
 
             <label>
               Buyer
@@ -221,6 +271,7 @@ export function BuyerGroupsPage() {
                 ))}
               </select>
             </label>
+            {buyerCursor ? <button onClick={() => loadMore("buyer")}>Load more buyers</button> : null}
 
             <div style={{ display: "flex", gap: 8, flexWrap: "wrap" }}>
               <button onClick={assignBuyer} disabled={!selectedAmbassadorId || !selectedBuyerId}>
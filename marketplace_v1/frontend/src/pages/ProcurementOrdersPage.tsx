@@ -393,7 +393,7 @@ export function ProcurementOrdersPage() {
                                     {(review.image_urls ?? []).map((url, idx) => (
                                       <a key={`${review.review_id}-${idx}`} href={url} target="_blank" rel="noreferrer">
                                         <img
-                                          src={url}
+                                          src={review.thumbnail_urls?.[idx] ?? url}
                                           alt={`Review ${review.review_id} image ${idx + 1}`}
                                           style={{
                                             width: 56,
@@ -86,7 +86,7 @@ export function RegionsPage() {
     try {
       const response = await listRegions(accessToken);
       setRegions(response.items);
-      const usersResponse = await listAllUsers(accessToken);
+      const usersResponse = await listAllUsers(accessToken, { role: "admin,super_admin,ambassador" });
       setUsers(usersResponse.items);
       setError(null);
     } catch (err) {
@@ -36,7 +36,7 @@ export function SellerValidationPage() {
       const response = await listSellerValidationQueue(accessToken);
       setUsers(response.items);
       if (isSuperAdmin) {
-        const usersResponse = await listAllUsers(accessToken);
+        const usersResponse = await listAllUsers(accessToken, { role: "admin,super_admin" });
         setAllUsers(usersResponse.items);
       }
       setError(null);
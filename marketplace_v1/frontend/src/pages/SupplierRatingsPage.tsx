@@ -184,7 +184,7 @@ export function SupplierRatingsPage() {
                             style={{ display: "inline-block" }}
                           >
                             <img
-                              src={imageUrl(url)}
+                              src={imageUrl(row.thumbnail_urls?.[idx] ?? url)}
                               alt={`Review ${row.review_id} image ${idx + 1}`}
                               style={{
                                 width: 64,
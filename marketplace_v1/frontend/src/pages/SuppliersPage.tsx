@@ -5,8 +5,10 @@ import {
   deleteSupplier,
   getSupplierDetail,
   listProducts,
+  listSupplierReviews,
   listSuppliers,
-  updateSupplier
+  updateSupplier,
+  type SupplierReview
 } from "../api/admin";
 import { ApiError } from "../api/client";
 import { useAuth } from "../app/auth";
@@ -34,14 +36,8 @@ export function SuppliersPage() {
   const [supplierDetail, setSupplierDetail] = useState<{
     supplier_id: number;
     rating_breakdown: Array<{ rating: number; orders: number }>;
-    reviews: Array<{
-      review_id: number;
-      procurement_id: number;
-      procurement_status?: string | null;
-      rating: number;
-      review_text?: string | null;
-      created_at?: string | null;
-    }>;
+    reviews: SupplierReview[];
+    next_review_cursor?: string | null;
     overall_rating?: number | null;
     rating_count?: number;
   } | null>(null);
@@ -187,6 +183,7 @@ export function SuppliersPage() {
         supplier_id: detail.supplier_id,
         rating_breakdown: detail.rating_breakdown,
         reviews: detail.reviews ?? [],
+        next_review_cursor: detail.reviews_pagination?.next_cursor,
         overall_rating: detail.overall_rating,
         rating_count: detail.rating_count
       });
@@ -196,6 +193,22 @@ export function SuppliersPage() {
     }
   };
 
+  const loadMoreReviews = async () => {
+    if (!accessToken || !supplierDetail?.next_review_cursor) return;
+    try {
+      const page = await listSupplierReviews(accessToken, supplierDetail.supplier_id, {
+        cursor: supplierDetail.next_review_cursor
+      });
+      setSupplierDetail((prev) =>
+        prev && prev.supplier_id === supplierDetail.supplier_id
+          ? { ...prev, reviews: [...prev.reviews, ...page.items], next_review_cursor: page.pagination.next_cursor }
+          : prev
+      );
+    } catch (err) {
+      setError(err instanceof ApiError ? err.message : "Failed to load reviews");
+    }
+  };
+
   const updateLinkRow = (index: number, patch: Partial<LinkRow>) => {
     setProductLinks((prev) => prev.map((row, i) => (i === index ? { ...row, ...patch } : row)));
   };
@@ -365,6 +378,11 @@ export function SuppliersPage() {
                                     </tbody>
                                   </table>
                                 )}
+                                {supplierDetail.next_review_cursor ? (
+                                  <button type="button" onClick={loadMoreReviews} style={{ marginTop: 8 }}>
+                                    Load more reviews
+                                  </button>
+                                ) : null}
                               </div>
                             </td>
                           </tr>
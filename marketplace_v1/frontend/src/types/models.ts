@@ -47,6 +47,7 @@ export type Order = {
   status: string;
   total_amount: string;
   currency: string;
+  reservation_expires_at?: string | null;
   items: OrderItem[];
 };
 
@@ -111,6 +112,8 @@ export type Pagination = {
   page_size: number;
   total: number;
   total_pages: number;
+  total_is_exact?: boolean;
+  next_cursor?: string | null;
 };
 
 export type Product = {
@@ -172,6 +175,8 @@ export type SupplierRating = {
   reviewed_by_user_id: number;
   rated_by_email?: string | null;
   image_urls?: string[];
+  thumbnail_urls?: string[];
+  display_urls?: string[];
   image_paths?: string[];
   created_at: string;
 };